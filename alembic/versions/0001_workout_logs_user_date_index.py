@@ -0,0 +1,38 @@
+"""Composite (user_id, workout_date, id) index on workout_logs
+
+Serves GET /v1/workout_logs/: a user's logs newest first, workout_date range
+filters and keyset pagination all read one contiguous index range.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-11-02 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_workout_logs_user_date_id'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY (PostgreSQL) keeps the table writable while the index builds;
+    # it cannot run inside a transaction. New databases already have the index.
+    with op.get_context().autocommit_block():
+        op.create_index(INDEX_NAME, 'workout_logs', ['user_id', 'workout_date', 'id'],
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name='workout_logs', if_exists=True,
+                      postgresql_concurrently=True)
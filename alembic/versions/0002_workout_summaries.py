@@ -0,0 +1,51 @@
+"""workout_summaries table: per-user weekly and monthly totals by workout_type
+
+Kept up to date by WorkoutLogService on every log write. Fill it for the
+existing history after upgrading with `python -m scripts.rebuild_workout_summaries`.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-11-09 10:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # New databases already have the table (created at startup)
+    op.create_table(
+        'workout_summaries',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'),
+                  nullable=False),
+        sa.Column('period', sa.String(length=5), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('workout_type', sa.String(length=50), nullable=False),
+        sa.Column('sessions', sa.Integer(), nullable=False),
+        sa.Column('total_duration_min', sa.Integer(), nullable=False),
+        sa.Column('total_calories', sa.Float(), nullable=False),
+        sa.UniqueConstraint('user_id', 'period', 'period_start', 'workout_type',
+                            name='uq_workout_summaries_bucket'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_workout_summaries_id', 'workout_summaries', ['id'],
+                    if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_workout_summaries_id', table_name='workout_summaries', if_exists=True)
+    op.drop_table('workout_summaries', if_exists=True)
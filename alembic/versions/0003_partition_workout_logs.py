@@ -0,0 +1,132 @@
+"""Range-partition workout_logs by month of workout_date (PostgreSQL)
+
+Turns workout_logs into a table partitioned by RANGE (workout_date): one
+partition per month from the oldest log to WORKOUT_LOGS_PARTITIONS_AHEAD
+months ahead, plus a default partition (logs dated beyond those months;
+the maintenance script moves them out when their month is created). The
+primary key becomes (id, workout_date), as PostgreSQL requires the partition
+key in it; ids keep coming from the same sequence. The rows are copied once, so run this in a
+maintenance window. Afterwards scripts/maintain_workout_log_partitions.py
+creates upcoming partitions and archives expired ones.
+
+Also adds workout_log_archives (all databases). Other databases than
+PostgreSQL keep an unpartitioned workout_logs.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-11-16 10:00:00
+
+"""
+import datetime
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_workout_logs_id': '(id)',
+    'ix_workout_logs_user_date_id': '(user_id, workout_date, id)',
+}
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def is_partitioned(bind) -> bool:
+    return bool(bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table"
+        " WHERE partrelid = 'workout_logs'::regclass)"
+    )).scalar())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'workout_log_archives',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('archive_table', sa.String(length=127), nullable=False, unique=True),
+        sa.Column('range_start', sa.Date(), nullable=False),
+        sa.Column('range_end', sa.Date(), nullable=False),
+        sa.Column('archived_rows', sa.Integer(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index('ix_workout_log_archives_id', 'workout_log_archives', ['id'],
+                    if_not_exists=True)
+
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or is_partitioned(bind):
+        return
+
+    # Keep the old table aside; its index names are needed for the new one
+    op.execute("ALTER TABLE workout_logs RENAME TO workout_logs_heap")
+    op.execute("ALTER TABLE workout_logs_heap RENAME CONSTRAINT workout_logs_pkey"
+               " TO workout_logs_heap_pkey")
+    for index in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+    # Dropping the old table must not drop the id sequence
+    op.execute("ALTER SEQUENCE workout_logs_id_seq OWNED BY NONE")
+
+    op.execute(
+        "CREATE TABLE workout_logs (LIKE workout_logs_heap INCLUDING DEFAULTS,"
+        " CONSTRAINT workout_logs_pkey PRIMARY KEY (id, workout_date),"
+        " CONSTRAINT workout_logs_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id))"
+        " PARTITION BY RANGE (workout_date)"
+    )
+    op.execute("ALTER SEQUENCE workout_logs_id_seq OWNED BY workout_logs.id")
+
+    oldest = bind.execute(sa.text("SELECT min(workout_date) FROM workout_logs_heap")).scalar()
+    this_month = datetime.date.today().replace(day=1)
+    month = min(oldest.replace(day=1), this_month) if oldest else this_month
+    last = add_months(this_month, settings.WORKOUT_LOGS_PARTITIONS_AHEAD)
+    while month <= last:
+        op.execute(f"CREATE TABLE workout_logs_{month:%Y_%m} PARTITION OF workout_logs"
+                   f" FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')")
+        month = add_months(month, 1)
+    op.execute("CREATE TABLE workout_logs_default PARTITION OF workout_logs DEFAULT")
+
+    op.execute("INSERT INTO workout_logs SELECT * FROM workout_logs_heap")
+    op.execute("DROP TABLE workout_logs_heap")
+
+    # Created on the parent after the copy: one local index per partition
+    for index, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {index} ON workout_logs {columns}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql' and is_partitioned(bind):
+        # Archived (detached) months are not brought back
+        op.execute("ALTER TABLE workout_logs RENAME TO workout_logs_partitioned")
+        op.execute("ALTER TABLE workout_logs_partitioned RENAME CONSTRAINT workout_logs_pkey"
+                   " TO workout_logs_partitioned_pkey")
+        for index in INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {index}")
+        op.execute("ALTER SEQUENCE workout_logs_id_seq OWNED BY NONE")
+        op.execute(
+            "CREATE TABLE workout_logs (LIKE workout_logs_partitioned INCLUDING DEFAULTS,"
+            " CONSTRAINT workout_logs_pkey PRIMARY KEY (id),"
+            " CONSTRAINT workout_logs_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id))"
+        )
+        op.execute("ALTER SEQUENCE workout_logs_id_seq OWNED BY workout_logs.id")
+        op.execute("INSERT INTO workout_logs SELECT * FROM workout_logs_partitioned")
+        op.execute("DROP TABLE workout_logs_partitioned")
+        for index, columns in INDEXES.items():
+            op.execute(f"CREATE INDEX {index} ON workout_logs {columns}")
+
+    op.drop_index('ix_workout_log_archives_id', table_name='workout_log_archives',
+                  if_exists=True)
+    op.drop_table('workout_log_archives', if_exists=True)
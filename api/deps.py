@@ -5,12 +5,13 @@ from typing import Optional
 
 # Local imports
 from infrastructure.db import get_db_session
+from infrastructure.db_routing import reads_from_primary
 
 from infrastructure.workout_log_repository import WorkoutLogRepository
 from domain.workout_log_service import WorkoutLogService
 from infrastructure.user_repository import UserRepository
 from domain.schemas import TokenData, UserOut
-from domain.auth_service import decode_access_token
+from domain.auth_service import cache_principal, decode_access_token, get_cached_principal
 from infrastructure.models import User as UserModel
 
 # OAuth2PasswordBearer handles token extraction from the header.
@@ -34,7 +35,13 @@ async def get_current_user(
     """
     Decodes the JWT token, verifies the user, and returns the UserOut object.
     Used as a dependency in all protected API endpoints.
+    Tokens already verified by this worker are answered from the principal cache,
+    without decoding the token or querying the database.
     """
+    cached_user = get_cached_principal(token)
+    if cached_user is not None:
+        return cached_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -47,8 +54,11 @@ async def get_current_user(
     if token_data is None:
         raise credentials_exception
 
-    # 2. Look up the user in the database
-    db_user: UserModel | None = await repo.get_by_id(user_id=token_data.user_id)
+    # 2. Look up the user in the database. On the primary: a lagging replica
+    # may still show a just-deactivated user as active, and the answer is cached.
+    # Only this lookup: the endpoint's reads on the same session still use the replica
+    with reads_from_primary(repo.db):
+        db_user: UserModel | None = await repo.get_by_id(user_id=token_data.user_id)
 
     # 3. Validation checks
     if db_user is None:
@@ -58,7 +68,9 @@ async def get_current_user(
         raise HTTPException(status_code=400, detail="Inactive user")
 
     # 4. Return the validated Pydantic model for use in the endpoint function
-    return UserOut.model_validate(db_user)
+    user_out = UserOut.model_validate(db_user)
+    cache_principal(token, user_out, token_data.exp)
+    return user_out
 
 def get_workout_log_repository(
         session: AsyncSession = Depends(get_db_session)) -> WorkoutLogRepository:
@@ -1,4 +1,10 @@
-from fastapi import FastAPI, Form, Request
+import asyncio
+import time
+
+# Start timing before the heavier imports below
+_imports_started = time.perf_counter()
+
+from fastapi import FastAPI, Form, Request, Response, status
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -6,10 +12,18 @@ from contextlib import asynccontextmanager
 
 # Local imports
 from core.config import settings
-from infrastructure.db import create_db_and_tables
+from core.startup import startup_report
+from domain.auth_service import PASSWORD_POOL, get_password_pool_stats, \
+    get_principal_cache_stats
+from infrastructure.db import create_db_and_tables, dispose_engine, get_pool_stats, \
+    get_query_stats, get_replica_status
 # 1. Import the new routers from the endpoints directory
-from api.v1.endpoints import users, auth, workout_logs
-from infrastructure.ml_adapter import load_model, predict_goal
+from api.v1.endpoints import users, auth, workout_logs, recommendations
+from infrastructure.ml_adapter import load_model, predict_goal_async, watch_model_registry, \
+    INFERENCE_SCHEDULER
+
+startup_report.record("imports", time.perf_counter() - _imports_started)
+
 # Define valid workout types (based on your limited training data)
 VALID_WORKOUT_TYPES = ["deadlift", "running", "bench_press", "yoga", "cycling"]
 
@@ -18,19 +32,54 @@ async def lifespan(_: FastAPI):
     """
     Handles startup and shutdown events for the FastAPI application.
     Ensures the database tables are created on startup.
+    The model warms up in a worker thread concurrently with the schema check, and
+    serving starts as soon as the database is ready (see /ready and /ready/model).
     """
     # --- On Application Startup ---
+    model_warmup = asyncio.create_task(warm_up_model())
+
     print("Application startup: Creating database tables...")
-    await create_db_and_tables()
+    with startup_report.phase("database"):
+        await create_db_and_tables()
+    startup_report.crud_ready = True
     print("Application startup: Database tables created successfully.")
 
-    load_model()
+    await INFERENCE_SCHEDULER.start()
+    await PASSWORD_POOL.start()
+
+    # Hot-reload model versions when the registry manifest changes
+    registry_watcher = None
+    if settings.MODEL_REGISTRY_POLL_SECONDS > 0:
+        registry_watcher = asyncio.create_task(
+            watch_model_registry(settings.MODEL_REGISTRY_POLL_SECONDS))
+
+    print(f"Application startup: serving CRUD, phase timings {startup_report.phases}")
     yield  # The application runs here
 
     # --- On Application Shutdown ---
+    model_warmup.cancel()
+    if registry_watcher is not None:
+        registry_watcher.cancel()
+    await INFERENCE_SCHEDULER.stop()
+    await PASSWORD_POOL.stop()
+    await dispose_engine()
     print("Application shutdown complete.")
 
 
+async def warm_up_model():
+    """Loads the registered model versions (compiled arrays when available)."""
+    try:
+        with startup_report.phase("model"):
+            registry = await asyncio.to_thread(load_model)
+        startup_report.model_ready = registry is not None
+        print(f"Application startup: model warm, phase timings {startup_report.phases}")
+    except Exception as e:
+        # Predictions will retry loading on demand
+        print(f"Application startup: model warm-up failed: {e}")
+
+
+_routers_started = time.perf_counter()
+
 # Initialize the main FastAPI application instance
 app = FastAPI(
     title=settings.APP_NAME,
@@ -43,6 +92,9 @@ app = FastAPI(
 app.include_router(users.router, prefix="/v1")
 app.include_router(auth.router, prefix="/v1")
 app.include_router(workout_logs.router, prefix="/v1")
+app.include_router(recommendations.router, prefix="/v1")
+
+startup_report.record("routers", time.perf_counter() - _routers_started)
 
 # Root endpoint for basic verification
 @app.get("/info")
@@ -50,6 +102,53 @@ async def root():
     return {"message": f"Welcome to {settings.APP_NAME}."}
 
 
+# Readiness probes: CRUD traffic can be routed here before the model is warm
+@app.get("/ready")
+async def readiness(response: Response):
+    """Ready once the database schema is checked; reports model warm-up separately."""
+    if not startup_report.crud_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return startup_report.summary()
+
+
+@app.get("/ready/model")
+async def model_readiness(response: Response):
+    """Ready once the model versions are loaded and /recommend answers immediately."""
+    if not startup_report.model_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return startup_report.summary()
+
+
+@app.get("/health/db/pool")
+async def database_pool_health():
+    """Live connection pool statistics of this worker, for monitoring."""
+    return get_pool_stats()
+
+
+@app.get("/health/db/replica")
+async def database_replica_health():
+    """Whether this worker reads from the replica, and the replica's last measured lag."""
+    return get_replica_status()
+
+
+@app.get("/health/auth/cache")
+async def principal_cache_health():
+    """Hit/miss counters of this worker's authenticated-principal cache."""
+    return get_principal_cache_stats()
+
+
+@app.get("/health/auth/password-pool")
+async def password_pool_health():
+    """Busy and queued password hashing workers of this app worker, and rejections."""
+    return get_password_pool_stats()
+
+
+@app.get("/health/db/queries")
+async def database_query_stats():
+    """Statement latency histograms by repository method and by SQL, and slow queries."""
+    return get_query_stats()
+
+
 # --- Configure Templates and Static Files ---
 # Mount the static directory to serve CSS/JS
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -107,8 +206,9 @@ async def post_recommendation(
     # 2. Call your ML Service (Adapt this to call your Hexagonal ML domain/service)
 
     try:
-        predicted_goal = predict_goal(workout_type, equipment, intensity, duration_min,
-                                      calories_burned)
+        # Queued on the inference scheduler so the event loop is never blocked
+        predicted_goal = await predict_goal_async(workout_type, equipment, intensity,
+                                                  duration_min, calories_burned)
         result = f"Input: {workout_type}, {equipment} -> Predicted Goal: {predicted_goal}"
     except Exception as e:
         # Catch exception if model failed to load
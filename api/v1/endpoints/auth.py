@@ -44,7 +44,7 @@ async def login_for_access_token(
         )
 
     # 2. Verify password hash
-    if not auth_service.verify_password(form_data.password, user.hashed_password):
+    if not await auth_service.verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
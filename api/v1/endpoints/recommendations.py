@@ -0,0 +1,74 @@
+from fastapi import APIRouter, HTTPException, status
+
+# Local imports
+from core.config import settings
+from domain.schemas import RecommendationBatchRequest, RecommendationBatchOut
+from infrastructure.ml_adapter import predict_goal_batch, get_prediction_cache_stats, \
+    get_model_registry_stats, INFERENCE_SCHEDULER
+
+router = APIRouter(
+    prefix="/recommend",
+    tags=["Recommendations"],
+)
+
+
+@router.post(
+    "/batch",
+    response_model=RecommendationBatchOut,
+    summary="Predict the goal for a batch of workouts",
+    description="Scores every workout in the payload with a single model call."
+)
+def post_recommendation_batch(payload: RecommendationBatchRequest):
+    """
+    Runs the whole payload through one vectorized preprocessing pass and one
+    pipeline.predict call. Declared with a plain 'def' so FastAPI runs it in the
+    threadpool instead of blocking the event loop.
+    """
+    if len(payload.workouts) > settings.RECOMMEND_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch size exceeds the limit of {settings.RECOMMEND_BATCH_MAX_SIZE} workouts."
+        )
+
+    workouts = [workout.model_dump() for workout in payload.workouts]
+
+    try:
+        predictions = predict_goal_batch(workouts)
+    except Exception as e:
+        # Catch exception if model failed to load
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Prediction Error: {e}"
+        )
+
+    return RecommendationBatchOut(count=len(predictions), predictions=predictions)
+
+
+@router.get(
+    "/cache/stats",
+    summary="Prediction cache counters",
+    description="Hit/miss/eviction counters of the single-prediction cache."
+)
+async def get_cache_stats():
+    """Returns the current prediction cache counters for monitoring."""
+    return get_prediction_cache_stats()
+
+
+@router.get(
+    "/scheduler/stats",
+    summary="Inference scheduler counters",
+    description="Queue depth and micro-batch sizes of the /recommend inference scheduler."
+)
+async def get_scheduler_stats():
+    """Returns the current inference scheduler counters for monitoring."""
+    return INFERENCE_SCHEDULER.stats()
+
+
+@router.get(
+    "/models",
+    summary="Served model versions",
+    description="Routing weights plus per-version latency, volume and accuracy."
+)
+async def get_model_versions():
+    """Returns the registry state for comparing model versions side by side."""
+    return get_model_registry_stats()
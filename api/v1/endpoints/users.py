@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status, Body
+from fastapi import APIRouter, Depends, Response, status, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Local imports
@@ -6,6 +6,7 @@ from infrastructure.db import get_db_session
 from domain.schemas import UserCreate, UserOut
 from domain.user_service import UserService
 from infrastructure.models import User  # For return type hint
+from api.deps import get_current_user
 
 router = APIRouter(
     prefix="/users",
@@ -42,4 +43,18 @@ async def register_user(
     # into the Pydantic schema for the response.
     return UserOut.model_validate(db_user)
 
+
+@router.delete(
+    "/me",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Deactivate the current user's account"
+)
+async def deactivate_current_user(
+        current_user: UserOut = Depends(get_current_user),
+        user_service: UserService = Depends(get_user_service)
+):
+    """Deactivates the authenticated user's account; its tokens stop working."""
+    await user_service.deactivate_user(user_id=current_user.id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
 # NOTE: Endpoints for GET /users/{id} and GET /users will be added later.
@@ -1,23 +1,20 @@
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+import datetime
+from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
 
-from infrastructure.db import get_db_session
-from domain.schemas import WorkoutLogCreate, WorkoutLogOut, WorkoutLogUpdate, UserOut
-from domain.workout_log_service import WorkoutLogService
+from core.config import settings
+from domain.schemas import WorkoutLogBulkCreate, WorkoutLogBulkOut, WorkoutLogCreate, \
+    WorkoutLogOut, WorkoutLogPage, WorkoutLogUpdate, WorkoutSummaryOut, UserOut
+from domain.workout_log_service import EXPORT_FORMATS, WorkoutLogService
 from infrastructure.models import WorkoutLog  # For internal type hints
-from api.deps import get_current_user
+from api.deps import get_current_user, get_workout_log_service
 
 router = APIRouter(
     prefix="/workout_logs",
     tags=["Workout Logs"],
 )
 
-# Dependency injection for the WorkoutLog Service
-def get_workout_log_service(session: AsyncSession = Depends(get_db_session)) -> WorkoutLogService:
-    """Provides a WorkoutLogService instance initialized with a database session."""
-    return WorkoutLogService(session=session)
-
 # 1. CREATE (POST)
 @router.post(
     "/",
@@ -39,23 +36,131 @@ async def create_log(
     return WorkoutLogOut.model_validate(db_log)
 
 
+# 1b. BULK CREATE (POST)
+@router.post(
+    "/bulk",
+    response_model=WorkoutLogBulkOut,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many workout logs in one request"
+)
+async def create_logs_bulk(
+        payload: WorkoutLogBulkCreate,
+        current_user: UserOut = Depends(get_current_user),
+        service: WorkoutLogService = Depends(get_workout_log_service)
+):
+    """
+    Saves a batch of workout logs (e.g. a wearable sync) for the authenticated user
+    with one INSERT and one commit. Invalid items are skipped and reported by their
+    index in `errors`; the valid ones are created. 422 if no item is valid.
+    """
+    if len(payload.logs) > settings.WORKOUT_LOGS_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch size exceeds the limit of {settings.WORKOUT_LOGS_BULK_MAX_ITEMS} logs."
+        )
+
+    db_logs, errors = await service.create_logs_bulk(
+        items=payload.logs,
+        user_id=current_user.id
+    )
+    if not db_logs:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors]
+        )
+
+    return WorkoutLogBulkOut(
+        created=[WorkoutLogOut.model_validate(log) for log in db_logs],
+        errors=errors
+    )
+
+
 # 2. READ ALL (GET)
 @router.get(
     "/",
-    response_model=List[WorkoutLogOut],
-    summary="Retrieve all workout logs for the current user"
+    response_model=WorkoutLogPage,
+    summary="Retrieve the current user's workout logs, a page at a time"
 )
 async def get_all_logs(
+        limit: int = Query(settings.WORKOUT_LOGS_PAGE_SIZE, ge=1,
+                           le=settings.WORKOUT_LOGS_MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+        date_from: Optional[datetime.date] = Query(None, description="First workout_date (inclusive)"),
+        date_to: Optional[datetime.date] = Query(None, description="Last workout_date (inclusive)"),
+        workout_type: Optional[str] = Query(None, max_length=50),
+        intensity: Optional[str] = Query(None, max_length=50),
         current_user: UserOut = Depends(get_current_user),
         service: WorkoutLogService = Depends(get_workout_log_service)
 ):
-    """Fetches a list of all workout logs created by the authenticated user."""
+    """
+    Fetches the authenticated user's workout logs, newest workout_date first.
+    Follow next_cursor until it is null to read the whole history.
+    """
 
-    db_logs: List[WorkoutLog] = await service.get_all_logs_by_user(
-        user_id=current_user.id
+    db_logs, next_cursor = await service.get_logs_page(
+        user_id=current_user.id, limit=limit, cursor=cursor, date_from=date_from,
+        date_to=date_to, workout_type=workout_type, intensity=intensity
     )
     # Validate each ORM model into the Pydantic output schema
-    return [WorkoutLogOut.model_validate(log) for log in db_logs]
+    return WorkoutLogPage(
+        items=[WorkoutLogOut.model_validate(log) for log in db_logs],
+        next_cursor=next_cursor
+    )
+
+
+# 2b. STATS (GET) - declared before /{log_id} so "stats" is not read as an ID
+@router.get(
+    "/stats",
+    response_model=WorkoutSummaryOut,
+    summary="Weekly or monthly workout totals of the current user"
+)
+async def get_stats(
+        period: Literal["week", "month"] = Query("week"),
+        date_from: Optional[datetime.date] = Query(None, description="Include the period containing this day and later ones"),
+        date_to: Optional[datetime.date] = Query(None, description="Include the period containing this day and earlier ones"),
+        workout_type: Optional[str] = Query(None, max_length=50),
+        current_user: UserOut = Depends(get_current_user),
+        service: WorkoutLogService = Depends(get_workout_log_service)
+):
+    """
+    Sessions, minutes and calories per week (starting Monday) or month, overall and
+    by workout type. Served from totals kept up to date on every log write, so the
+    cost does not grow with the history.
+    """
+    return await service.get_summary(
+        user_id=current_user.id, period=period, date_from=date_from, date_to=date_to,
+        workout_type=workout_type
+    )
+
+
+# 2c. EXPORT (GET) - declared before /{log_id} so "export" is not read as an ID
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Download the current user's full workout history"
+)
+async def export_logs(
+        format: Literal["ndjson", "csv"] = Query("ndjson"),
+        gzip: bool = Query(False, description="Compress the download with gzip"),
+        current_user: UserOut = Depends(get_current_user),
+        service: WorkoutLogService = Depends(get_workout_log_service)
+):
+    """
+    Streams every workout log of the authenticated user, oldest first, as NDJSON
+    or CSV. Rows are read from a server-side cursor and sent batch by batch, so
+    memory stays bounded and the download starts immediately.
+    """
+    media_type, extension = EXPORT_FORMATS[format]
+    file_name = f"workout_logs.{extension}"
+    if gzip:
+        media_type, file_name = "application/gzip", f"{file_name}.gz"
+
+    return StreamingResponse(
+        service.export_logs(user_id=current_user.id, export_format=format, compress=gzip,
+                            batch_size=settings.WORKOUT_LOGS_EXPORT_BATCH_SIZE),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'}
+    )
 
 
 # 3. READ ONE (GET)
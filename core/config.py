@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,11 +20,67 @@ class Settings(BaseSettings):
     # CRITICAL: Use the PostgreSQL driver (postgresql+asyncpg) and the credentials
     # defined in the docker run command.
     DATABASE_URL: str
+    # Connection pool (Postgres; SQLite and DB_POOL_SIZE=0 open a connection per checkout)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds a request waits for a free connection before failing
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Replace connections older than this (server or proxy idle timeouts)
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # Test each connection with a cheap round trip on checkout
+    DB_POOL_PRE_PING: bool = True
+    # Print every statement (noisy and slow; statement timings are always recorded)
+    DB_ECHO: bool = False
+    # Statements slower than this are written to the slow-query log
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    # Optional read replica: plain reads go there, writes and the rest of a
+    # request after its first write stay on DATABASE_URL
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # Reads fall back to the primary while the replica is further behind than this
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    # Seconds between replica lag checks (per worker)
+    REPLICA_CHECK_INTERVAL_SECONDS: float = 1.0
 
     # JWT Settings
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Verified tokens cached per worker with their user, until the token expires
+    # but at most this long: the staleness bound for other workers after a user
+    # changes, as invalidation is per process (0 disables the cache)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    # Password hashing/verification (deliberately slow) runs in this many worker
+    # processes per app worker; beyond PASSWORD_HASH_MAX_QUEUED waiting calls,
+    # sign-ins and registrations are answered 503 instead of queueing further
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUED: int = 32
+
+    # Workout log listing (keyset pagination)
+    WORKOUT_LOGS_PAGE_SIZE: int = 50
+    WORKOUT_LOGS_MAX_PAGE_SIZE: int = 500
+    # Rows fetched per round trip by the streaming export
+    WORKOUT_LOGS_EXPORT_BATCH_SIZE: int = 1000
+    # Items accepted by one bulk upload; each is one row of a single multi-row
+    # INSERT (8 parameters per row, PostgreSQL allows 32767 per statement)
+    WORKOUT_LOGS_BULK_MAX_ITEMS: int = 1000
+    # Monthly workout_logs partitions (PostgreSQL): months of raw logs kept
+    # online, partitions created in advance, and where expired ones are moved
+    WORKOUT_LOGS_RETENTION_MONTHS: int = 24
+    WORKOUT_LOGS_PARTITIONS_AHEAD: int = 3
+    WORKOUT_LOGS_ARCHIVE_SCHEMA: str = "archive"
+
+    # ML Recommendation Settings
+    RECOMMEND_BATCH_MAX_SIZE: int = 10000
+    PREDICTION_CACHE_MAX_SIZE: int = 4096
+    PREDICTION_CACHE_TTL_SECONDS: float = 3600.0
+    INFERENCE_MAX_BATCH_SIZE: int = 256
+    INFERENCE_MAX_DELAY_MS: float = 2.0
+    INFERENCE_WORKERS: int = 1
+    # Seconds between checks of models/registry.json for new versions (0 disables)
+    MODEL_REGISTRY_POLL_SECONDS: float = 30.0
+    # Map compiled model arrays read-only so forked workers share one copy
+    MODEL_MEMORY_MAP: bool = True
 
 
 settings = Settings()
@@ -0,0 +1,44 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupReport:
+    """
+    Records how long each startup phase took and which parts of the
+    application are ready to serve traffic.
+    """
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        # Database schema checked: CRUD endpoints can serve
+        self.crud_ready = False
+        # Model versions loaded: /recommend answers without loading on demand
+        self.model_ready = False
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = round(seconds, 4)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times the enclosed block as one startup phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.errors[name] = str(e)
+            raise
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def summary(self) -> dict:
+        return {
+            "crud_ready": self.crud_ready,
+            "model_ready": self.model_ready,
+            "phases_seconds": dict(self.phases),
+            "errors": dict(self.errors),
+        }
+
+
+# Shared instance filled in by api/main.py while the app starts
+startup_report = StartupReport()
@@ -1,15 +1,22 @@
+import time
 from datetime import timedelta, datetime, timezone
 from typing import Optional
+from fastapi import HTTPException, status
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 # Local imports
 from core.config import settings
-from domain.schemas import TokenData, Token
+from domain.schemas import TokenData, Token, UserOut
+from infrastructure.cpu_pool import BoundedProcessPool, PoolSaturated
+from infrastructure.lru_cache import LRUCache
 
 # Password Hashing Context
 pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
 
+# Verified access token -> authenticated user (UserOut), see get_cached_principal
+PRINCIPAL_CACHE = LRUCache(max_size=settings.PRINCIPAL_CACHE_MAX_SIZE)
+
 
 # Password Hashing and Verification
 def hash_password(password: str) -> str:
@@ -22,6 +29,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+# Worker processes for the two functions above: sha256_crypt takes hundreds of
+# milliseconds and holds the GIL, so neither the event loop nor a thread may run it.
+# Started and stopped with the application (until then calls run inline).
+PASSWORD_POOL = BoundedProcessPool(max_workers=settings.PASSWORD_HASH_WORKERS,
+                                   max_queued=settings.PASSWORD_HASH_MAX_QUEUED,
+                                   preload=(__name__,))
+
+
+async def _run_in_password_pool(fn, *args):
+    try:
+        return await PASSWORD_POOL.run(fn, *args)
+    except PoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ins in progress, please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password in the password worker pool (503 when its queue is full)."""
+    return await _run_in_password_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password in the password worker pool (503 when its queue is full)."""
+    return await _run_in_password_pool(verify_password, plain_password, hashed_password)
+
+
+def get_password_pool_stats() -> dict:
+    """Busy/queued workers and rejections of the password worker pool."""
+    return PASSWORD_POOL.stats()
+
+
 # JWT Token Generation and Decoding (Remains the same)
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -52,6 +93,39 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         user_id: int = payload.get("user_id")
         if user_id is None:
             return None
-        return TokenData(user_id=user_id)
+        return TokenData(user_id=user_id, exp=payload.get("exp"))
     except JWTError:
         return None
+
+
+# Authenticated principal cache
+def get_cached_principal(token: str) -> Optional[UserOut]:
+    """The active user a token was verified for, if still cached (no decoding, no DB)."""
+    return PRINCIPAL_CACHE.get(token)
+
+
+def cache_principal(token: str, principal: UserOut, exp: Optional[int]) -> None:
+    """
+    Caches a verified token's user until the token expires, but at most
+    PRINCIPAL_CACHE_TTL_SECONDS. Tokens without an expiry are not cached.
+    """
+    if exp is None or settings.PRINCIPAL_CACHE_TTL_SECONDS <= 0:
+        return
+    remaining = min(exp - time.time(), settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    if remaining > 0:
+        # LRUCache deadlines are on the monotonic clock
+        PRINCIPAL_CACHE.put(token, principal, expires_at=time.monotonic() + remaining)
+
+
+def invalidate_principal(user_id: int) -> int:
+    """
+    Drops every cached token of a user; call after deactivating or changing the
+    user. Only affects this process: other workers expire their entries within
+    PRINCIPAL_CACHE_TTL_SECONDS.
+    """
+    return PRINCIPAL_CACHE.pop_matching(lambda principal: principal.id == user_id)
+
+
+def get_principal_cache_stats() -> dict:
+    """Returns hit/miss counters of the principal cache."""
+    return PRINCIPAL_CACHE.stats()
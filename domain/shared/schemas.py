@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, Optional, List, Literal
 from datetime import datetime, date
 from pydantic import BaseModel, ConfigDict, Field, EmailStr
 
@@ -87,6 +87,78 @@ class WorkoutLog(WorkoutLogBase):
     model_config = {'from_attributes': True}
 
 
+class WorkoutLogBulkCreate(BaseModel):
+    """
+    Schema for uploading many workout logs at once. Items are validated one by
+    one against WorkoutLogCreate, so one bad item does not reject the others.
+    """
+    logs: List[Dict[str, Any]] = Field(..., min_length=1)
+
+
+class WorkoutLogBulkError(BaseModel):
+    """Why the item at `index` of the upload was rejected."""
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class WorkoutLogBulkOut(BaseModel):
+    """Schema for returning the created logs (in upload order) and the rejected items."""
+    created: List[WorkoutLogOut]
+    errors: List[WorkoutLogBulkError]
+
+
+class WorkoutLogPage(BaseModel):
+    """One page of a user's workout logs, newest workout_date first."""
+    items: List[WorkoutLogOut]
+    # Pass as ?cursor= to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class WorkoutTypeTotals(BaseModel):
+    """Totals of one workout type within a period."""
+    workout_type: str
+    sessions: int
+    total_duration_min: int
+    total_calories: float
+
+
+class WorkoutPeriodTotals(BaseModel):
+    """Totals of one week (starting Monday) or month, overall and per workout type."""
+    period_start: date
+    sessions: int
+    total_duration_min: int
+    total_calories: float
+    by_workout_type: List[WorkoutTypeTotals]
+
+
+class WorkoutSummaryOut(BaseModel):
+    """A user's weekly or monthly workout totals, oldest period first."""
+    period: Literal["week", "month"]
+    periods: List[WorkoutPeriodTotals]
+
+
+#  Recommendation Schemas
+
+class WorkoutFeatures(BaseModel):
+    """Schema for one workout scored by the goal prediction model."""
+    workout_type: str = Field(..., max_length=50, description="e.g., Deadlift, Yoga Flow")
+    equipment: str = Field(..., max_length=100, description="e.g., full_gym, yoga_mat")
+    intensity: Literal["very_low", "low", "moderate", "high"]
+    duration_min: int = Field(..., gt=0)
+    calories_burned: float = Field(..., gt=0)
+
+
+class RecommendationBatchRequest(BaseModel):
+    """Schema for scoring many workouts in a single request."""
+    workouts: List[WorkoutFeatures] = Field(..., min_length=1)
+
+
+class RecommendationBatchOut(BaseModel):
+    """Schema for returning the predicted goals, in the same order as the request."""
+    count: int
+    predictions: List[str]
+
+
 class Token(BaseModel):
     """Schema for the JWT response body sent to the client."""
     access_token: str
@@ -97,3 +169,5 @@ class TokenData(BaseModel):
     """Schema for the payload data inside the JWT."""
     # This ID links the token back to the User in the database
     user_id: int
+    # Expiry (seconds since the epoch), already checked when decoding
+    exp: Optional[int] = None
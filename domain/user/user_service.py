@@ -2,7 +2,7 @@ from typing import Optional, List
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from domain.auth_service import verify_password
+from domain.auth_service import verify_password_async
 
 from domain.schemas import UserCreate
 from domain import auth_service
@@ -24,25 +24,42 @@ class UserService:
     async def create_new_user(self, user_in: UserCreate) -> User:
         """
         Creates a new user, hashes the password, and checks for email conflicts.
+        The conflict check is part of the INSERT itself (ON CONFLICT), so there is
+        one statement and no window between the check and the insert.
         """
-        # 1. Check for existing user (Domain Rule)
-        existing_user = await self.repository.get_by_email(user_in.email)
-        if existing_user:
+        # 1. Hash the password (Domain Rule via Auth Service)
+        hashed_password = await auth_service.hash_password_async(user_in.password)
+
+        # 2. Save to database unless the email is taken (Infrastructure/Repository)
+        db_user = await self.repository.create(
+            user_in=user_in,
+            hashed_password=hashed_password
+        )
+        if db_user is None:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Account with this email already exists."
             )
 
-        # 2. Hash the password (Domain Rule via Auth Service)
-        hashed_password = auth_service.hash_password(user_in.password)
+        await self.repository.db.commit()
 
-        # 3. Save to database (Infrastructure/Repository)
-        db_user = await self.repository.create(
-            user_in=user_in,
-            hashed_password=hashed_password
-        )
+        return db_user
+
+    async def deactivate_user(self, user_id: int) -> User:
+        """
+        Deactivates a user and commits. Their tokens stop working immediately in
+        this worker: the cached principals are dropped after the commit, and
+        get_current_user reads uncached users from the primary, not the replica.
+        """
+        db_user = await self.repository.set_active(user_id=user_id, is_active=False)
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found."
+            )
 
         await self.repository.db.commit()
+        auth_service.invalidate_principal(user_id)
 
         return db_user
 
@@ -67,8 +84,8 @@ class UserService:
             return None
 
         # 2. Check if password is valid using the Auth Service
-        if not verify_password(plain_password=password,
-                               hashed_password=db_user.hashed_password):
+        if not await verify_password_async(plain_password=password,
+                                           hashed_password=db_user.hashed_password):
             return None
 
         # 3. If credentials are valid, return the user model
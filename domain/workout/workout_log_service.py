@@ -1,11 +1,71 @@
-from typing import List
+import base64
+import csv
+import datetime
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 
 # Domain Layer Imports
-from domain.schemas import WorkoutLogCreate, WorkoutLogUpdate, \
-    WorkoutLog as WorkoutLogOut
+from domain.schemas import WorkoutLogCreate, WorkoutLogUpdate, WorkoutLogBulkError, \
+    WorkoutPeriodTotals, WorkoutSummaryOut, WorkoutTypeTotals, WorkoutLog as WorkoutLogOut
 from infrastructure.models import WorkoutLog
-from infrastructure.workout_log_repository import WorkoutLogRepository
+from infrastructure.workout_log_repository import EXPORT_COLUMNS, SUMMARY_COLUMNS, \
+    WorkoutLogRepository, WorkoutSummaryRepository
+
+# Export formats: media type and file extension
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+}
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+# An update touching any of these moves the log between summary totals
+SUMMARY_FIELDS = {column.key for column in SUMMARY_COLUMNS}
+
+
+def encode_cursor(log: WorkoutLog) -> str:
+    """Opaque page cursor holding the sort key (workout_date, id) of the last log."""
+    key = f"{log.workout_date.isoformat()}:{log.id}"
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime.date, int]:
+    """Sort key of a cursor made by encode_cursor; 400 for anything else."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        workout_date, log_id = base64.urlsafe_b64decode(padded).decode().split(":")
+        return datetime.date.fromisoformat(workout_date), int(log_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor."
+        )
+
+
+def _export_value(value):
+    """Dates and timestamps as ISO 8601 strings, everything else unchanged."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(rows) -> str:
+    """One JSON object per log and line."""
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_export_value, row)))) + "\n" for row in rows
+    )
+
+
+def encode_csv(rows, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows([_export_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
 
 
 class WorkoutLogService:
@@ -14,21 +74,55 @@ class WorkoutLogService:
     Ensures data consistency and user ownership.
     """
 
-    def __init__(self, repository: WorkoutLogRepository):
+    def __init__(self, repository: WorkoutLogRepository,
+                 summary_repository: Optional[WorkoutSummaryRepository] = None):
         # Store the repository instance passed to the constructor
         self.repository = repository
+        # The summaries are written in the same session, so in the same transaction
+        self.summary_repository = summary_repository or \
+            WorkoutSummaryRepository(db_session=repository.db)
 
     async def create_log(self, log_in: WorkoutLogCreate, user_id: int) -> WorkoutLog:
         """Creates a new workout log and commits the transaction."""
 
         # Persistence call
         db_log = await self.repository.create(log_in=log_in, user_id=user_id)
+        await self.summary_repository.apply_log_changes(user_id=user_id, added=[db_log])
 
         # Commit the transaction after successful creation
         await self.repository.db.commit()
 
         return db_log
 
+    async def create_logs_bulk(self, items: List[Dict[str, Any]],
+                               user_id: int) -> tuple[List[WorkoutLog],
+                                                      List[WorkoutLogBulkError]]:
+        """
+        Validates every item and creates the valid ones in a single INSERT and
+        transaction. Returns (created logs, errors of the rejected items).
+        """
+        logs_in, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                logs_in.append(WorkoutLogCreate.model_validate(item))
+            except ValidationError as e:
+                errors.append(WorkoutLogBulkError(
+                    index=index,
+                    errors=e.errors(include_url=False, include_context=False,
+                                    include_input=False)
+                ))
+
+        if not logs_in:
+            return [], errors
+
+        db_logs = await self.repository.create_many(logs_in=logs_in, user_id=user_id)
+        await self.summary_repository.apply_log_changes(user_id=user_id, added=db_logs)
+
+        # One commit for the whole upload
+        await self.repository.db.commit()
+
+        return db_logs, errors
+
     async def get_log_by_id(self, log_id: int, user_id: int) -> WorkoutLog:
         """Fetches a single log, ensuring it belongs to the user."""
         db_log = await self.repository.get_by_id(log_id=log_id, user_id=user_id)
@@ -44,10 +138,106 @@ class WorkoutLogService:
         """Fetches all logs for a user."""
         return await self.repository.get_all_by_user(user_id=user_id)
 
+    async def get_logs_page(self, user_id: int, limit: int, cursor: Optional[str] = None,
+                            date_from: Optional[datetime.date] = None,
+                            date_to: Optional[datetime.date] = None,
+                            workout_type: Optional[str] = None,
+                            intensity: Optional[str] = None) -> tuple[List[WorkoutLog],
+                                                                      Optional[str]]:
+        """
+        Fetches one page of a user's logs matching the filters.
+        Returns (logs, next_cursor); next_cursor is None on the last page.
+        """
+        after = decode_cursor(cursor) if cursor else None
+
+        # One extra row tells whether another page follows
+        db_logs = await self.repository.get_page_by_user(
+            user_id=user_id, limit=limit + 1, after=after, date_from=date_from,
+            date_to=date_to, workout_type=workout_type, intensity=intensity
+        )
+        if len(db_logs) <= limit:
+            return db_logs, None
+        return db_logs[:limit], encode_cursor(db_logs[limit - 1])
+
+    async def get_summary(self, user_id: int, period: str,
+                          date_from: Optional[datetime.date] = None,
+                          date_to: Optional[datetime.date] = None,
+                          workout_type: Optional[str] = None) -> WorkoutSummaryOut:
+        """
+        A user's weekly or monthly totals, read from the precomputed summaries.
+        date_from and date_to select the periods containing those days.
+        """
+        rows = await self.summary_repository.get_by_user(
+            user_id=user_id, period=period, date_from=date_from, date_to=date_to,
+            workout_type=workout_type
+        )
+
+        # Rows come ordered by period_start, so each period's rows are adjacent
+        periods: List[WorkoutPeriodTotals] = []
+        for row in rows:
+            if not periods or periods[-1].period_start != row.period_start:
+                periods.append(WorkoutPeriodTotals(period_start=row.period_start, sessions=0,
+                                                   total_duration_min=0, total_calories=0.0,
+                                                   by_workout_type=[]))
+            totals = periods[-1]
+            # Rounded: incremental float sums drift in the last digits
+            calories = round(row.total_calories, 2)
+            totals.by_workout_type.append(WorkoutTypeTotals(
+                workout_type=row.workout_type, sessions=row.sessions,
+                total_duration_min=row.total_duration_min, total_calories=calories
+            ))
+            totals.sessions += row.sessions
+            totals.total_duration_min += row.total_duration_min
+            totals.total_calories = round(totals.total_calories + calories, 2)
+
+        return WorkoutSummaryOut(period=period, periods=periods)
+
+    async def export_logs(self, user_id: int, export_format: str, compress: bool,
+                          batch_size: int) -> AsyncIterator[bytes]:
+        """
+        Yields a user's whole history (oldest first) encoded as NDJSON or CSV,
+        one chunk per fetched batch, gzip-compressed on the fly if requested.
+        Each chunk is flushed through the compressor, so the client receives
+        data while the export is still being read from the database.
+        """
+        # wbits=31: gzip container, readable by gunzip and any HTTP client
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        header = True
+
+        async for rows in self.repository.stream_by_user(user_id=user_id,
+                                                         batch_size=batch_size):
+            if export_format == 'csv':
+                chunk = encode_csv(rows, header=header).encode()
+            else:
+                chunk = encode_ndjson(rows).encode()
+            header = False
+
+            if compressor is not None:
+                chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield chunk
+
+        # An empty CSV export still names its columns
+        chunk = encode_csv([], header=True).encode() if export_format == 'csv' and header \
+            else b""
+        if compressor is not None:
+            chunk = compressor.compress(chunk) + compressor.flush()
+        if chunk:
+            yield chunk
+
     async def update_log(self, log_id: int, user_id: int,
                          log_update: WorkoutLogUpdate) -> WorkoutLog:
         """Updates an existing log for a specific user and commits."""
 
+        # Only updates that move the log between summary totals need its old values
+        previous = None
+        if SUMMARY_FIELDS & log_update.model_dump(exclude_unset=True).keys():
+            previous = await self.repository.get_summary_fields(log_id=log_id, user_id=user_id)
+            if previous is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Workout log not found or access denied."
+                )
+
         # Persistence call
         db_log = await self.repository.update(
             log_id=log_id,
@@ -61,6 +251,10 @@ class WorkoutLogService:
                 detail="Workout log not found or access denied."
             )
 
+        if previous is not None:
+            await self.summary_repository.apply_log_changes(user_id=user_id, added=[db_log],
+                                                            removed=[previous])
+
         # Commit the transaction
         await self.repository.db.commit()
 
@@ -79,5 +273,7 @@ class WorkoutLogService:
                 detail="Workout log not found or access denied."
             )
 
+        await self.summary_repository.apply_log_changes(user_id=user_id, removed=[deleted])
+
         # Commit the transaction after successful deletion
         await self.repository.db.commit()
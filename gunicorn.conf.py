@@ -0,0 +1,50 @@
+"""
+Production launch configuration: gunicorn managing uvicorn workers.
+
+    gunicorn api.main:app -c gunicorn.conf.py
+
+The app and the model are loaded once in the master process and the workers
+are forked from it, so imported modules and the memory-mapped model arrays
+are shared copy-on-write instead of being loaded again by every worker.
+See scripts/measure_worker_memory.py for the per-worker memory numbers.
+"""
+import gc
+import multiprocessing
+import os
+
+# Server socket
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Worker processes
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# Import the app in the master before forking (required for page sharing)
+preload_app = True
+
+
+def when_ready(server):
+    """Runs in the master once, right before the first workers are forked."""
+    from infrastructure.ml_adapter import load_model
+
+    # Map the model in the master so every worker inherits the same pages
+    load_model()
+
+    # Move everything allocated so far out of the GC's reach: collections in
+    # the workers would otherwise write to these objects and un-share their pages
+    gc.freeze()
+    server.log.info("Model preloaded and GC frozen before forking workers.")
+
+
+def post_fork(server, worker):
+    """Runs in each worker right after it is forked from the master."""
+    from infrastructure.db import engine, replica_engine
+
+    # Pooled connections must never be shared across processes; drop any the
+    # master opened without closing them (the master still owns the sockets)
+    engine.sync_engine.dispose(close=False)
+    if replica_engine is not None:
+        replica_engine.sync_engine.dispose(close=False)
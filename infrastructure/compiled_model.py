@@ -0,0 +1,209 @@
+import os
+from bisect import bisect_left
+
+import numpy as np
+
+# Must match COMPILED_FORMAT_VERSION in src/model_compiler.py
+SUPPORTED_FORMAT_VERSION = 1
+
+# scikit-learn marks leaf nodes with this child index
+TREE_LEAF = -1
+
+
+class CompiledGoalModel:
+    """
+    Pandas-free evaluator for a Goal Prediction pipeline compiled into flat
+    NumPy arrays by src/model_compiler.py. Reproduces StandardScaler,
+    OneHotEncoder(handle_unknown='ignore') and DecisionTreeClassifier.predict.
+    """
+
+    def __init__(self, arrays, memory_mapped: bool = False):
+        if int(arrays['format_version']) != SUPPORTED_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported compiled model format {int(arrays['format_version'])}.")
+
+        self.intensity_map = dict(zip(arrays['intensity_levels'].tolist(),
+                                      arrays['intensity_values'].tolist()))
+
+        # Preprocessing constants
+        self.numerical_features = arrays['numerical_features'].tolist()
+        self.numerical_offset = int(arrays['numerical_offset'])
+        self.scaler_mean = arrays['scaler_mean']
+        self.scaler_scale = arrays['scaler_scale']
+        self.categorical_features = arrays['categorical_features'].tolist()
+        self.n_columns = int(arrays['n_columns'])
+
+        # Maps each category to the output column of its one-hot indicator
+        self.category_columns = []
+        column = int(arrays['categorical_offset'])
+        for position in range(len(self.categorical_features)):
+            categories = arrays[f'categories_{position}'].tolist()
+            self.category_columns.append(
+                {category: column + index for index, category in enumerate(categories)})
+            column += len(categories)
+
+        # Tree arrays
+        self.classes = arrays['classes'].tolist()
+        self.children_left = arrays['children_left']
+        self.children_right = arrays['children_right']
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.node_class = arrays['node_class']
+
+        # Plain list copies: indexing lists is faster than NumPy for one row.
+        # Memory-mapped models use memoryviews instead, which index just as fast
+        # without private copies in every worker that would defeat the sharing.
+        self.memory_mapped = memory_mapped
+        if memory_mapped:
+            self._left = memoryview(np.asarray(self.children_left))
+            self._right = memoryview(np.asarray(self.children_right))
+            self._feature = memoryview(np.asarray(self.feature))
+            self._threshold = memoryview(np.asarray(self.threshold))
+        else:
+            self._left = self.children_left.tolist()
+            self._right = self.children_right.tolist()
+            self._feature = self.feature.tolist()
+            self._threshold = self.threshold.tolist()
+        self._mean = self.scaler_mean.tolist()
+        self._scale = self.scaler_scale.tolist()
+
+        # Sorted split thresholds per numeric feature. Inputs that fall between the
+        # same pair of thresholds take the same path through the tree.
+        self._numeric_thresholds = []
+        for index in range(len(self.numerical_features)):
+            splits = self.threshold[self.feature == self.numerical_offset + index]
+            self._numeric_thresholds.append(np.unique(splits).tolist())
+
+    @classmethod
+    def load(cls, file_path):
+        """Loads a compiled model from a .npz file."""
+        with np.load(file_path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        return cls(arrays)
+
+    @classmethod
+    def load_memory_mapped(cls, directory):
+        """
+        Maps a directory of .npy files (src/model_compiler.save_compiled_arrays)
+        read-only. The pages live in the OS page cache and are shared by every
+        process that maps the same files, including forked workers.
+        """
+        arrays = {}
+        for file_name in os.listdir(directory):
+            if file_name.endswith('.npy'):
+                arrays[file_name[:-len('.npy')]] = np.load(
+                    os.path.join(directory, file_name), mmap_mode='r', allow_pickle=False)
+        return cls(arrays, memory_mapped=True)
+
+    def _intensity_numeric(self, intensity):
+        try:
+            return self.intensity_map[intensity]
+        except KeyError:
+            raise ValueError(
+                f"Unknown intensity value. Expected one of {list(self.intensity_map)}.")
+
+    def _scaled(self, index, value):
+        """Scales one numeric value in float64, rounded to the float32 the tree compares."""
+        return float(np.float32((value - self._mean[index]) / self._scale[index]))
+
+    def bucket_key(self, workout_type, equipment, intensity, duration_min, calories_burned):
+        """
+        Returns a hashable key that is equal for any two inputs the tree cannot tell
+        apart: numeric values are replaced by their threshold bucket and categories
+        by their one-hot column (unknown categories all share None).
+        """
+        raw_numeric = {
+            'duration_min': duration_min,
+            'calories_burned': calories_burned,
+            'intensity_numeric': self._intensity_numeric(intensity),
+        }
+        key = []
+        for index, name in enumerate(self.numerical_features):
+            # Number of thresholds strictly below the value; the split test is value <= t
+            key.append(bisect_left(self._numeric_thresholds[index],
+                                   self._scaled(index, raw_numeric[name])))
+
+        categorical = {'workout_type': workout_type, 'equipment': equipment}
+        for name, columns in zip(self.categorical_features, self.category_columns):
+            key.append(columns.get(categorical[name]))
+
+        return tuple(key)
+
+    def transform_batch(self, workouts):
+        """
+        Builds the float32 feature matrix the tree was fitted on.
+        `workouts` is a sequence of mappings, as for ml_adapter.predict_goal_batch.
+        """
+        matrix = np.zeros((len(workouts), self.n_columns), dtype=np.float32)
+
+        raw_numeric = {
+            'duration_min': [workout['duration_min'] for workout in workouts],
+            'calories_burned': [workout['calories_burned'] for workout in workouts],
+            'intensity_numeric': [self._intensity_numeric(workout['intensity'])
+                                  for workout in workouts],
+        }
+        numeric = np.column_stack(
+            [np.asarray(raw_numeric[name], dtype=np.float64)
+             for name in self.numerical_features])
+
+        # Scale in float64 like StandardScaler; the tree then compares in float32
+        end = self.numerical_offset + len(self.numerical_features)
+        matrix[:, self.numerical_offset:end] = (numeric - self.scaler_mean) / self.scaler_scale
+
+        rows = np.arange(len(workouts))
+        for name, columns in zip(self.categorical_features, self.category_columns):
+            # Unknown categories get no indicator (handle_unknown='ignore')
+            indicator = np.array([columns.get(workout[name], -1) for workout in workouts],
+                                 dtype=np.int64)
+            known = indicator >= 0
+            matrix[rows[known], indicator[known]] = 1.0
+
+        return matrix
+
+    def predict_batch(self, workouts):
+        """Predicts the goal for every workout, walking all rows down the tree at once."""
+        if len(workouts) == 0:
+            return []
+
+        matrix = self.transform_batch(workouts)
+        node = np.zeros(len(workouts), dtype=np.int32)
+        active = np.flatnonzero(self.children_left[node] != TREE_LEAF)
+
+        while active.size:
+            current = node[active]
+            go_left = matrix[active, self.feature[current]] <= self.threshold[current]
+            following = np.where(go_left, self.children_left[current],
+                                 self.children_right[current])
+            node[active] = following
+            active = active[self.children_left[following] != TREE_LEAF]
+
+        return [self.classes[index] for index in self.node_class[node]]
+
+    def predict_one(self, workout_type, equipment, intensity, duration_min, calories_burned):
+        """Predicts the goal for a single workout without allocating NumPy arrays."""
+        row = [0.0] * self.n_columns
+
+        raw_numeric = {
+            'duration_min': duration_min,
+            'calories_burned': calories_burned,
+            'intensity_numeric': self._intensity_numeric(intensity),
+        }
+        for index, name in enumerate(self.numerical_features):
+            row[self.numerical_offset + index] = self._scaled(index, raw_numeric[name])
+
+        categorical = {'workout_type': workout_type, 'equipment': equipment}
+        for name, columns in zip(self.categorical_features, self.category_columns):
+            column = columns.get(categorical[name])
+            if column is not None:
+                row[column] = 1.0
+
+        left, right = self._left, self._right
+        feature, threshold = self._feature, self._threshold
+        node = 0
+        while left[node] != TREE_LEAF:
+            if row[feature[node]] <= threshold[node]:
+                node = left[node]
+            else:
+                node = right[node]
+
+        return self.classes[self.node_class[node]]
@@ -0,0 +1,146 @@
+import asyncio
+import importlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class PoolSaturated(Exception):
+    """Raised instead of queueing when a BoundedProcessPool's queue is full."""
+
+
+def _preload(modules):
+    # Worker initializer: pay the imports once, not on the first call
+    for module in modules:
+        importlib.import_module(module)
+
+
+class BoundedProcessPool:
+    """
+    Runs CPU-bound functions in worker processes, so they neither block the
+    event loop nor contend for its GIL. At most `max_workers` calls run at once
+    and at most `max_queued` more wait; further calls are rejected with
+    PoolSaturated right away (backpressure) instead of piling up.
+
+    If a worker process dies (e.g. OOM-killed), the executor is broken for
+    good: it is replaced and the interrupted call retried once on the new one.
+
+    Until start() is called (e.g. in scripts and unit tests) calls run inline.
+    Functions and arguments must be picklable (module-level functions).
+    """
+
+    def __init__(self, max_workers: int, max_queued: int, preload: tuple = ()):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        if max_queued < 0:
+            raise ValueError("max_queued must not be negative.")
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.preload = tuple(preload)
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self.queued = 0
+        self.running = 0
+
+        self.completed = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    async def start(self) -> None:
+        """Starts the worker processes and waits until they are ready."""
+        if self.is_running:
+            return
+        self._executor = self._new_executor()
+        self._slots = asyncio.Semaphore(self.max_workers)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self._executor, os.getpid)
+                               for _ in range(self.max_workers)])
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that already runs threads (event loop
+        # helpers, DB drivers) can deadlock the child
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_preload, initargs=(self.preload,)
+        )
+
+    def _replace_broken(self, broken: ProcessPoolExecutor) -> None:
+        # Concurrent calls all see the same broken executor; only the first replaces it.
+        # The slots stay: calls still running on the old executor release theirs.
+        if self._executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+        self.restarts += 1
+        print(f"Process pool worker died; replaced the pool (restart {self.restarts}).")
+
+    async def stop(self) -> None:
+        """Stops the workers; calls afterwards run inline again."""
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def run(self, fn, *args):
+        """Runs fn(*args) in a worker process and returns its result."""
+        if self._executor is None:
+            return fn(*args)
+
+        if self.running >= self.max_workers and self.queued >= self.max_queued:
+            self.rejected += 1
+            raise PoolSaturated(f"{self.queued} calls already waiting.")
+
+        queued_at = time.perf_counter()
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        waited = time.perf_counter() - queued_at
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        self.running += 1
+        loop = asyncio.get_running_loop()
+        try:
+            for retry in (False, True):
+                executor = self._executor
+                try:
+                    return await loop.run_in_executor(executor, fn, *args)
+                except BrokenProcessPool:
+                    if self._executor is None:  # stopped meanwhile
+                        raise
+                    self._replace_broken(executor)
+                    if retry:
+                        # Caller answers 503 and may retry; the next call gets the new pool
+                        raise PoolSaturated("Worker process died twice during the call.")
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.is_running,
+            "max_workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "busy": self.running,
+            "queued": self.queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            # A dead worker is only noticed (and the pool replaced) by the next call
+            "broken": bool(getattr(self._executor, "_broken", False)),
+            "mean_wait_ms": round(self.total_wait_seconds / self.completed * 1000, 3)
+            if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
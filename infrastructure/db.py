@@ -2,10 +2,13 @@ import datetime
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import text, DateTime, pool
+from sqlalchemy import text, DateTime
 
 # Import application settings from the core layer
 from core.config import settings
+from infrastructure.db_pool import pool_options, pool_stats
+from infrastructure.db_routing import ReplicaMonitor, RoutingSession
+from infrastructure.query_metrics import QueryMetrics, instrument_engine
 
 
 # 1. Base Class for ORM Models
@@ -35,17 +38,39 @@ class Base(DeclarativeBase):
 # 2. Database Engine and Session Factory (The Persistence Adapter)
 
 # Create the asynchronous engine using the configured URL.
-# The poolclass is set to NullPool for better performance with async drivers.
+# Connections are pooled (see DB_POOL_* in core/config.py), so requests reuse
+# open connections instead of paying a connect and authentication per session.
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    poolclass=pool.NullPool,
+    echo=settings.DB_ECHO,
+    **pool_options(settings.DATABASE_URL, settings),
 )
 
-# Configure the session maker for local, async sessions
+# Per-statement and per-repository-method latency histograms, plus the slow-query log
+QUERY_METRICS = instrument_engine(engine.sync_engine,
+                                  QueryMetrics(settings.SLOW_QUERY_THRESHOLD_MS))
+
+# Optional read replica (see DATABASE_REPLICA_URL): same pooling and metrics
+replica_engine = create_async_engine(
+    settings.DATABASE_REPLICA_URL,
+    echo=settings.DB_ECHO,
+    **pool_options(settings.DATABASE_REPLICA_URL, settings),
+) if settings.DATABASE_REPLICA_URL else None
+
+REPLICA_MONITOR = None
+if replica_engine is not None:
+    instrument_engine(replica_engine.sync_engine, QUERY_METRICS)
+    REPLICA_MONITOR = ReplicaMonitor(replica_engine, settings.REPLICA_MAX_LAG_SECONDS,
+                                     settings.REPLICA_CHECK_INTERVAL_SECONDS)
+
+# Configure the session maker for local, async sessions. Sessions route plain
+# reads to the replica when one is configured (see RoutingSession).
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    replica=replica_engine,
+    replica_monitor=REPLICA_MONITOR,
     expire_on_commit=False,
     autoflush=False
 )
@@ -58,6 +83,10 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     FastAPI dependency that yields a database session and ensures it is closed
     regardless of success or failure.
     """
+    if REPLICA_MONITOR is not None:
+        # Cheap when fresh: the lag is measured at most once per check interval
+        await REPLICA_MONITOR.refresh()
+
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -81,4 +110,28 @@ async def create_db_and_tables():
 
         # This command tells SQLAlchemy to create all tables
         # that inherit from our 'Base' class.
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def get_pool_stats() -> dict:
+    """Checked-out and idle connections, waits and wait time of the engine's pool."""
+    return pool_stats(engine)
+
+
+def get_replica_status() -> dict:
+    """Whether reads currently go to the read replica, and its last measured lag."""
+    if REPLICA_MONITOR is None:
+        return {'configured': False}
+    return {'configured': True, **REPLICA_MONITOR.status()}
+
+
+def get_query_stats() -> dict:
+    """Statement latency histograms and recent slow queries of this worker."""
+    return QUERY_METRICS.stats()
+
+
+async def dispose_engine():
+    """Closes every pooled connection; called on application shutdown."""
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
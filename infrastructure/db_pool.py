@@ -0,0 +1,121 @@
+import threading
+import time
+
+from sqlalchemy import exc, pool
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters for connection checkouts. A checkout "waits" when every
+    pooled and overflow connection is in use, so the caller blocks until one is
+    checked back in (or until pool_timeout expires).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.connects = 0
+            self.waits = 0
+            self.wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+            self.timeouts = 0
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_checkout(self, waited, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'waits': self.waits,
+                'wait_seconds_total': round(self.wait_seconds, 6),
+                'mean_wait_ms': round(self.wait_seconds / self.waits * 1000, 3)
+                if self.waits else 0.0,
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 3),
+                'timeouts': self.timeouts,
+            }
+
+
+class InstrumentedAsyncQueuePool(pool.AsyncAdaptedQueuePool):
+    """
+    The async engine's default queue pool, counting checkouts that had to wait
+    for a connection and how long they waited.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        recreated = super().recreate()
+        recreated.metrics = self.metrics
+        return recreated
+
+    def _create_connection(self):
+        self.metrics.record_connect()
+        return super()._create_connection()
+
+    def _do_get(self):
+        # Same test QueuePool._do_get uses to decide whether to block on the queue
+        waited = (self._max_overflow > -1 and self._overflow >= self._max_overflow
+                  and self.checkedin() == 0)
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_checkout(waited, time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_checkout(waited, time.perf_counter() - started)
+        return connection
+
+
+def pool_options(database_url, settings):
+    """
+    create_async_engine() keyword arguments for the configured pool. SQLite
+    (tests, local runs) and DB_POOL_SIZE=0 open a connection per checkout.
+    """
+    if database_url.startswith('sqlite') or settings.DB_POOL_SIZE <= 0:
+        return {'poolclass': pool.NullPool}
+    return {
+        'poolclass': InstrumentedAsyncQueuePool,
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT_SECONDS,
+        'pool_recycle': settings.DB_POOL_RECYCLE_SECONDS,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+
+
+def pool_stats(engine):
+    """Live state of the engine's pool plus the checkout counters, for monitoring."""
+    engine_pool = engine.sync_engine.pool
+    stats = {'pool': type(engine_pool).__name__}
+    if isinstance(engine_pool, pool.QueuePool):
+        stats.update({
+            'size': engine_pool.size(),
+            'max_overflow': engine_pool._max_overflow,
+            'checked_out': engine_pool.checkedout(),
+            'idle': engine_pool.checkedin(),
+            'overflow': max(engine_pool.overflow(), 0),
+        })
+    if isinstance(engine_pool, InstrumentedAsyncQueuePool):
+        stats.update(engine_pool.metrics.snapshot())
+    return stats
@@ -0,0 +1,148 @@
+import contextlib
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import GenerativeSelect
+
+# session.info key: every further statement of the session goes to the primary
+PRIMARY_ONLY = 'primary_only'
+# session.info key: reads go to the primary while set (see reads_from_primary)
+READS_FROM_PRIMARY = 'reads_from_primary'
+
+# Seconds a PostgreSQL standby is behind its primary (0 when fully replayed or
+# when the server is not a standby)
+POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def is_write(clause) -> bool:
+    """
+    Anything but a plain SELECT: INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE,
+    raw SQL (which may write) and connections requested without a statement.
+    """
+    if isinstance(clause, GenerativeSelect):
+        return clause._for_update_arg is not None
+    return True
+
+
+def use_primary(session) -> None:
+    """Pins a session (sync or async) to the primary, e.g. before a read-then-write."""
+    session.info[PRIMARY_ONLY] = True
+
+
+@contextlib.contextmanager
+def reads_from_primary(session):
+    """
+    Sends the reads inside the block to the primary, e.g. a lookup whose result
+    is cached. Unlike use_primary, the session's later reads are routed as
+    usual again; a write inside the block still pins the session.
+    """
+    previous = session.info.get(READS_FROM_PRIMARY)
+    session.info[READS_FROM_PRIMARY] = True
+    try:
+        yield session
+    finally:
+        if previous:
+            session.info[READS_FROM_PRIMARY] = previous
+        else:
+            session.info.pop(READS_FROM_PRIMARY, None)
+
+
+class ReplicaMonitor:
+    """
+    Whether the read replica may serve reads: reachable and at most
+    max_lag_seconds behind the primary. The lag is measured at most once per
+    check_interval_seconds; until the first successful check the replica is
+    not used.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_lag_seconds: float,
+                 check_interval_seconds: float):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.usable = False
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+
+    async def measure_lag(self) -> float:
+        """Replication lag in seconds (other dialects than PostgreSQL have none)."""
+        if self.engine.dialect.name != 'postgresql':
+            return 0.0
+        async with self.engine.connect() as connection:
+            lag = await connection.scalar(POSTGRES_LAG_SQL)
+        return float(lag or 0.0)
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Re-measures the lag if the last check is older than the interval."""
+        now = time.monotonic()
+        if not force and self.checked_at is not None and \
+                now - self.checked_at < self.check_interval_seconds:
+            return self.usable
+
+        # Claimed before awaiting: concurrent requests keep the previous answer
+        # instead of all measuring at once
+        self.checked_at = now
+        try:
+            self.lag_seconds = await self.measure_lag()
+            self.error = None
+            usable = self.lag_seconds <= self.max_lag_seconds
+        except Exception as e:
+            self.lag_seconds, self.error, usable = None, repr(e), False
+
+        if usable != self.usable:
+            print(f"Read replica {'in use' if usable else 'bypassed'}: "
+                  f"lag={self.lag_seconds}s error={self.error}")
+        self.usable = usable
+        return usable
+
+    def status(self) -> dict:
+        return {
+            'usable': self.usable,
+            'lag_seconds': self.lag_seconds,
+            'max_lag_seconds': self.max_lag_seconds,
+            'error': self.error,
+            'checked_seconds_ago': None if self.checked_at is None
+            else round(time.monotonic() - self.checked_at, 3),
+        }
+
+
+class RoutingSession(Session):
+    """
+    Session sending reads to the read replica and everything else to the
+    primary (the session's bind). After its first write a session stays on the
+    primary, so a request reads its own writes. Reads also go to the primary
+    while the replica monitor reports the replica lagging or unreachable.
+
+    Used as the sync_session_class of the application's AsyncSession factory;
+    `replica` and `replica_monitor` are passed through the session maker.
+    """
+
+    def __init__(self, *args, replica: Optional[AsyncEngine] = None,
+                 replica_monitor: Optional[ReplicaMonitor] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica.sync_engine if replica is not None else None
+        self.replica_monitor = replica_monitor
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if self.replica is None or self.info.get(PRIMARY_ONLY):
+            return primary
+
+        if self._flushing or is_write(clause):
+            # Read-your-writes: later reads of this session see this write
+            self.info[PRIMARY_ONLY] = True
+            return primary
+
+        if self.info.get(READS_FROM_PRIMARY):
+            return primary
+        if self.replica_monitor is not None and not self.replica_monitor.usable:
+            return primary
+        return self.replica
@@ -0,0 +1,58 @@
+import numpy as np
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+# Same input columns as the Goal Prediction pipeline (see ml_adapter.FEATURE_COLUMNS)
+NUMERICAL_FEATURES = ['duration_min', 'calories_burned', 'intensity_numeric']
+CATEGORICAL_FEATURES = ['workout_type', 'equipment']
+
+
+class IncrementalGoalModel:
+    """
+    Goal classifier that learns from successive batches with partial_fit.
+
+    Categorical values are hashed into a fixed number of columns, so workout
+    types or equipment first seen in a later batch need no refit of an encoder.
+    Numerical columns are standardized with running statistics. Exposes
+    predict(features), so it is served through ml_adapter.PipelineGoalModel
+    like a scikit-learn pipeline.
+    """
+
+    def __init__(self, classes, n_hashed_features=256, random_state=42):
+        self.classes_ = np.asarray(classes)
+        self.hasher = FeatureHasher(n_features=n_hashed_features, input_type='string',
+                                    alternate_sign=False)
+        self.scaler = StandardScaler()
+        self.classifier = SGDClassifier(loss='log_loss', alpha=1e-4, random_state=random_state)
+        self.rows_seen = 0
+
+    def _numerical(self, features):
+        return features[NUMERICAL_FEATURES].to_numpy(dtype=np.float64)
+
+    def _transform(self, features, numerical):
+        tokens = [
+            [f"{name}={value}" for name, value in zip(CATEGORICAL_FEATURES, row)]
+            for row in features[CATEGORICAL_FEATURES].itertuples(index=False)
+        ]
+        hashed = self.hasher.transform(tokens).toarray()
+        return np.hstack([self.scaler.transform(numerical), hashed])
+
+    def partial_fit(self, features, target):
+        """Updates the scaler and the classifier with one batch of labelled rows."""
+        numerical = self._numerical(features)
+        self.scaler.partial_fit(numerical)
+        self.classifier.partial_fit(self._transform(features, numerical), np.asarray(target),
+                                    classes=self.classes_)
+        self.rows_seen += len(features)
+        return self
+
+    @property
+    def is_fitted(self):
+        return self.rows_seen > 0
+
+    def predict(self, features):
+        return self.classifier.predict(self._transform(features, self._numerical(features)))
+
+    def score(self, features, target):
+        return float(np.mean(self.predict(features) == np.asarray(target)))
@@ -0,0 +1,174 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InferenceScheduler:
+    """
+    Coalesces concurrent prediction requests into micro-batches and runs each
+    batch in a worker thread, so model calls never block the event loop.
+
+    A batch is dispatched as soon as it holds `max_batch_size` items or the
+    oldest item has waited `max_delay_seconds`, whichever comes first.
+    """
+
+    def __init__(self, predict_batch, max_batch_size: int = 256,
+                 max_delay_seconds: float = 0.002, max_workers: int = 1):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+
+        # Callable taking a list of items and returning one result per item, in order
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay_seconds = max_delay_seconds
+        self.max_workers = max_workers
+
+        self._queue: asyncio.Queue | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._collector: asyncio.Task | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._in_flight: set[asyncio.Task] = set()
+
+        self.batches_run = 0
+        self.items_run = 0
+        self.largest_batch = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._collector is not None and not self._collector.done()
+
+    async def start(self) -> None:
+        """Starts the batch collector on the running event loop."""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="inference")
+        self._collector = asyncio.create_task(self._collect())
+
+    async def stop(self) -> None:
+        """
+        Stops collecting, finishes in-flight batches and fails the requests not
+        dispatched yet (queued or in the batch being collected).
+        """
+        if self._collector is None:
+            return
+
+        self._collector.cancel()
+        try:
+            await self._collector
+        except asyncio.CancelledError:
+            pass
+        self._collector = None
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+        while not self._queue.empty():
+            self._fail_stopped([self._queue.get_nowait()])
+
+        self._executor.shutdown(wait=False)
+        self._executor = None
+
+    async def submit(self, item):
+        """Queues one item and waits for its prediction."""
+        if not self.is_running:
+            raise RuntimeError("Inference scheduler is not running.")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = []
+            try:
+                # 1. Block until at least one request is waiting
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.max_delay_seconds
+
+                # 2. Top up the batch until it is full or the delay budget is spent
+                while len(batch) < self.max_batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                # 3. Run it in the pool; the next batch collects while this one runs
+                await self._slots.acquire()
+            except asyncio.CancelledError:
+                # Stopped while holding a batch: nothing else would ever answer it
+                self._fail_stopped(batch)
+                raise
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    @staticmethod
+    def _fail_stopped(batch) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Inference scheduler stopped."))
+
+    async def _dispatch(self, batch) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            # Skip requests whose caller has already gone away
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                return
+
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self.predict_batch, items)
+            except Exception:
+                if len(batch) == 1:
+                    raise
+                # Isolate the failing item(s) so one bad input does not fail the batch
+                results = []
+                for item in items:
+                    try:
+                        results.append(
+                            (await loop.run_in_executor(self._executor, self.predict_batch,
+                                                        [item]))[0])
+                    except Exception as e:
+                        results.append(e)
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+            self.batches_run += 1
+            self.items_run += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict:
+        """Returns batch counters for monitoring."""
+        return {
+            "running": self.is_running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight_batches": len(self._in_flight),
+            "batches_run": self.batches_run,
+            "items_run": self.items_run,
+            "largest_batch": self.largest_batch,
+            "mean_batch_size": self.items_run / self.batches_run if self.batches_run else 0.0,
+        }
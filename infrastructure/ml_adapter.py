@@ -1,36 +1,200 @@
-import joblib
-import pandas as pd
+import asyncio
+import json
 import os
 
+from core.config import settings
+from infrastructure.compiled_model import CompiledGoalModel
+from infrastructure.inference_scheduler import InferenceScheduler
+from infrastructure.lru_cache import LRUCache
+from infrastructure.model_registry import ModelRegistry
+from infrastructure.segmented_model import SegmentedGoalModel
+
 #  Configuration (Relative path adjustment for running from main.py)
 # NOTE: The path is relative to the project root, which is the running directory.
 MODEL_FILE_PATH = 'models/workout_recommender_pipeline_goal.joblib'
-MODEL = None
+# Flat NumPy export of the same pipeline (see src/model_compiler.py)
+COMPILED_MODEL_FILE_PATH = 'models/workout_recommender_pipeline_goal.npz'
+# The same arrays as memory-mappable .npy files, shared across worker processes
+COMPILED_ARRAYS_DIRECTORY = 'models/workout_recommender_pipeline_goal_arrays'
+# Versions, metadata and traffic split (see src/model_registry.py)
+MODEL_REGISTRY_FILE_PATH = 'models/registry.json'
+
+# NOTE: pandas and joblib (which unpickles scikit-learn) are imported on first use.
+# The compiled model needs neither, so serving processes never pay for them.
+
+# Memoized single predictions, cleared whenever a model version is swapped in
+PREDICTION_CACHE = LRUCache(max_size=settings.PREDICTION_CACHE_MAX_SIZE,
+                            ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS)
+
+
+class PipelineGoalModel:
+    """Adapts a pickled scikit-learn pipeline to the registry's model interface."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def bucket_key(self, workout_type, equipment, intensity, duration_min, calories_burned):
+        return workout_type, equipment, intensity, duration_min, calories_burned
+
+    def predict_one(self, workout_type, equipment, intensity, duration_min, calories_burned):
+        processed_input = preprocess_input(workout_type, equipment, intensity, duration_min,
+                                           calories_burned)
+        return self.pipeline.predict(processed_input)[0]
+
+    def predict_batch(self, workouts):
+        if len(workouts) == 0:
+            return []
+        return self.pipeline.predict(preprocess_batch(workouts)).tolist()
 
 
 #  Model Loading (Updated for FastAPI Lifespan)
 
+def load_model_artifact(metadata):
+    """
+    Loads one registered version: a per-segment bundle, the memory-mapped
+    arrays when enabled, then the compiled arrays, otherwise the pickled pipeline.
+    """
+    segments_path = metadata.get('segments_path')
+    if segments_path and os.path.isdir(segments_path):
+        print(f" Loading per-segment models from {segments_path}...")
+        return SegmentedGoalModel.load(segments_path, memory_mapped=settings.MODEL_MEMORY_MAP)
+
+    arrays_path = metadata.get('arrays_path')
+    if settings.MODEL_MEMORY_MAP and arrays_path and os.path.isdir(arrays_path):
+        print(f" Memory-mapping compiled model from {arrays_path}...")
+        return CompiledGoalModel.load_memory_mapped(arrays_path)
+
+    compiled_path = metadata.get('compiled_path')
+    if compiled_path and os.path.exists(compiled_path):
+        print(f" Loading compiled model from {compiled_path}...")
+        return CompiledGoalModel.load(compiled_path)
+
+    pipeline_path = metadata.get('pipeline_path')
+    if pipeline_path and os.path.exists(pipeline_path):
+        import joblib
+
+        print(f" Loading model from {pipeline_path}...")
+        return PipelineGoalModel(joblib.load(pipeline_path))
+
+    raise FileNotFoundError(f"No model artifact found for {metadata}.")
+
+
+def read_registry_manifest():
+    """
+    Reads the registry manifest. Without one, the default artifacts are served
+    as a single version so older deployments keep working.
+    """
+    if os.path.exists(MODEL_REGISTRY_FILE_PATH):
+        with open(MODEL_REGISTRY_FILE_PATH) as manifest_file:
+            return json.load(manifest_file)
+
+    if not (os.path.exists(COMPILED_MODEL_FILE_PATH) or os.path.exists(MODEL_FILE_PATH)):
+        return {'routing': {}, 'versions': {}}
+
+    return {
+        'routing': {'default': 1.0},
+        'versions': {'default': {'pipeline_path': MODEL_FILE_PATH,
+                                 'compiled_path': COMPILED_MODEL_FILE_PATH,
+                                 'arrays_path': COMPILED_ARRAYS_DIRECTORY}},
+    }
+
+
+MODEL_REGISTRY = ModelRegistry(load_model_artifact)
+MODEL_REGISTRY.add_swap_listener(PREDICTION_CACHE.clear)
+
+
 def load_model():
-    """Loads the model pipeline."""
-    global MODEL
-    if MODEL is None:
-        if not os.path.exists(MODEL_FILE_PATH):
-            print(
-                f"Model file not found at {MODEL_FILE_PATH}. Please run the training script first.")
-            # Do NOT raise FileNotFoundError here; let FastAPI start, but mark model as unloaded
-            return None
+    """Loads the registered model versions once and returns the registry."""
+    if not MODEL_REGISTRY.is_loaded:
+        reload_model()
+
+    if not MODEL_REGISTRY.is_loaded:
+        print("No model found. Please run the training script first.")
+        # Do NOT raise FileNotFoundError here; let FastAPI start, but mark model as unloaded
+        return None
+    return MODEL_REGISTRY
+
+
+def reload_model():
+    """
+    Re-reads the manifest, loads new or changed versions and swaps them in.
+    Predictions keep running against the previous snapshot until the swap.
+    """
+    MODEL_REGISTRY.apply_manifest(read_registry_manifest())
+    print(f" Model versions loaded: {MODEL_REGISTRY.routing}")
+    return MODEL_REGISTRY
+
+
+async def watch_model_registry(poll_seconds):
+    """
+    Background task: reloads in a worker thread whenever the manifest changes.
+    A version that fails to load is reported and the current one keeps serving.
+    """
+    last_modified = None
+    if os.path.exists(MODEL_REGISTRY_FILE_PATH):
+        last_modified = os.path.getmtime(MODEL_REGISTRY_FILE_PATH)
+
+    while True:
+        await asyncio.sleep(poll_seconds)
+        if not os.path.exists(MODEL_REGISTRY_FILE_PATH):
+            continue
 
-        print(f" Loading model from {MODEL_FILE_PATH}...")
-        MODEL = joblib.load(MODEL_FILE_PATH)
-        print(" Model loaded successfully.")
-    return MODEL
+        modified = os.path.getmtime(MODEL_REGISTRY_FILE_PATH)
+        if modified == last_modified:
+            continue
+        last_modified = modified
+
+        try:
+            await asyncio.to_thread(reload_model)
+        except Exception as e:
+            print(f"Model reload failed, keeping current versions: {e}")
+
+
+def get_prediction_cache_stats():
+    """Returns hit/miss counters of the single-prediction cache."""
+    return PREDICTION_CACHE.stats()
+
+
+def get_model_registry_stats():
+    """Returns routing weights and per-version latency/accuracy."""
+    return MODEL_REGISTRY.stats()
+
+
+# Ordinal encoding for intensity (Must match the training logic in src/data_loader.py)
+INTENSITY_MAP = {'very_low': 1, 'low': 2, 'moderate': 3, 'high': 4}
+
+# Column order the pipeline was fitted on
+FEATURE_COLUMNS = ['workout_type', 'equipment', 'duration_min', 'calories_burned',
+                   'intensity_numeric']
+
+
+def preprocess_batch(workouts):
+    """
+    Applies the training preprocessing to many workouts in one vectorized pass.
+    `workouts` is a sequence of mappings with the keys workout_type, equipment,
+    intensity, duration_min and calories_burned.
+    """
+    import pandas as pd
+
+    input_data = pd.DataFrame.from_records(
+        workouts,
+        columns=['workout_type', 'equipment', 'intensity', 'duration_min',
+                 'calories_burned']
+    )
+
+    input_data['intensity_numeric'] = input_data['intensity'].map(INTENSITY_MAP)
+    if input_data['intensity_numeric'].isna().any():
+        raise ValueError(
+            f"Unknown intensity value. Expected one of {list(INTENSITY_MAP)}.")
+
+    return input_data[FEATURE_COLUMNS]
 
 
 def preprocess_input(workout_type, equipment, intensity, duration_min, calories_burned):
     """
     Applies the exact preprocessing steps the model was trained on.
     """
-    input_data = pd.DataFrame([{
+    return preprocess_batch([{
         'workout_type': workout_type,
         'equipment': equipment,
         'intensity': intensity,
@@ -38,28 +202,87 @@ def preprocess_input(workout_type, equipment, intensity, duration_min, calories_
         'calories_burned': calories_burned,
     }])
 
-    intensity_map = {'very_low': 1, 'low': 2, 'moderate': 3, 'high': 4}
-    input_data['intensity_numeric'] = input_data['intensity'].map(intensity_map)
-    input_data = input_data.drop(columns=['intensity'])
 
-    features = input_data[
-        ['workout_type', 'equipment', 'duration_min', 'calories_burned',
-         'intensity_numeric']
-    ]
+def predict_goal_batch(workouts):
+    """
+    Predicts the goal for every workout with a single model call.
+    The whole request is routed to one model version.
+    Returns the predicted goals in the same order as the input.
+    """
+    load_model()
+    return MODEL_REGISTRY.route().predict_batch(workouts)
 
-    return features
+
+def predict_goal_cached_batch(workouts):
+    """
+    Batch prediction that serves repeated workouts from the prediction cache and
+    sends only the misses to the model, one call per routed version.
+    """
+    load_model()
+
+    predictions = [None] * len(workouts)
+    misses = {}
+    for position, workout in enumerate(workouts):
+        version = MODEL_REGISTRY.route()
+        # Numeric inputs are keyed by their tree-threshold bucket (compiled model)
+        cache_key = (version.name,) + version.model.bucket_key(**workout)
+        prediction = PREDICTION_CACHE.get(cache_key)
+        if prediction is None:
+            misses.setdefault(version.name, (version, []))[1].append((position, cache_key))
+        else:
+            predictions[position] = prediction
+
+    for version, missed in misses.values():
+        computed = version.predict_batch([workouts[position] for position, _ in missed])
+        for (position, cache_key), prediction in zip(missed, computed):
+            PREDICTION_CACHE.put(cache_key, prediction)
+            predictions[position] = prediction
+
+    return predictions
 
 
 def predict_goal(workout_type, equipment, intensity, duration_min, calories_burned):
-    """Makes a prediction using the loaded pipeline."""
-    pipeline = load_model()
+    """
+    Makes a prediction with the model version picked by the registry's routing.
+    Results are memoized in PREDICTION_CACHE; with the compiled model, numeric
+    inputs are keyed by their tree-threshold bucket so equivalent requests share
+    one entry.
+    """
+    load_model()
+    version = MODEL_REGISTRY.route()
+    cache_key = (version.name,) + version.model.bucket_key(
+        workout_type, equipment, intensity, duration_min, calories_burned)
+
+    prediction = PREDICTION_CACHE.get(cache_key)
+    if prediction is not None:
+        return prediction
+
+    prediction = version.predict_one(workout_type, equipment, intensity, duration_min,
+                                     calories_burned)
 
-    if pipeline is None:
-        raise Exception("ML Model is not loaded. Cannot make prediction.")
+    PREDICTION_CACHE.put(cache_key, prediction)
+    return prediction
 
-    processed_input = preprocess_input(workout_type, equipment, intensity, duration_min,
-                                       calories_burned)
 
-    prediction = pipeline.predict(processed_input)
+# Micro-batches concurrent predict_goal_async calls off the event loop
+INFERENCE_SCHEDULER = InferenceScheduler(
+    predict_goal_cached_batch,
+    max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+    max_delay_seconds=settings.INFERENCE_MAX_DELAY_MS / 1000,
+    max_workers=settings.INFERENCE_WORKERS,
+)
 
-    return prediction[0]
+
+async def predict_goal_async(workout_type, equipment, intensity, duration_min,
+                             calories_burned):
+    """
+    Awaitable predict_goal for async handlers. The request is queued on the
+    inference scheduler and batched with concurrent requests.
+    """
+    return await INFERENCE_SCHEDULER.submit({
+        'workout_type': workout_type,
+        'equipment': equipment,
+        'intensity': intensity,
+        'duration_min': duration_min,
+        'calories_burned': calories_burned,
+    })
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import random
+import threading
+import time
+
+
+class ModelVersion:
+    """
+    One loaded model version plus its registry metadata and serving counters.
+    `model` exposes predict_one(...) and predict_batch(workouts).
+    """
+
+    def __init__(self, name: str, model, metadata: dict):
+        self.name = name
+        self.model = model
+        self.metadata = metadata
+        self.loaded_at = time.time()
+
+        self._lock = threading.Lock()
+        self.predictions = 0
+        self.calls = 0
+        self.total_seconds = 0.0
+
+    def _record(self, rows: int, seconds: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.predictions += rows
+            self.total_seconds += seconds
+
+    def predict_one(self, workout_type, equipment, intensity, duration_min, calories_burned):
+        started = time.perf_counter()
+        prediction = self.model.predict_one(workout_type, equipment, intensity, duration_min,
+                                            calories_burned)
+        self._record(1, time.perf_counter() - started)
+        return prediction
+
+    def predict_batch(self, workouts):
+        started = time.perf_counter()
+        predictions = self.model.predict_batch(workouts)
+        self._record(len(workouts), time.perf_counter() - started)
+        return predictions
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "version": self.name,
+                "model": type(self.model).__name__,
+                "loaded_at": self.loaded_at,
+                "trained_at": self.metadata.get("trained_at"),
+                "accuracy": self.metadata.get("accuracy"),
+                "calls": self.calls,
+                "predictions": self.predictions,
+                "mean_call_ms": 1000 * self.total_seconds / self.calls if self.calls else 0.0,
+            }
+
+
+class ModelRegistry:
+    """
+    Holds the loaded model versions and the weighted traffic split between them.
+
+    Readers never take a lock: the versions and routing table live in one
+    immutable snapshot that writers rebuild and swap in with a single
+    assignment. In-flight predictions keep using the version they were routed
+    to, so loading or retiring a version never blocks or fails them.
+    """
+
+    def __init__(self, loader, rng: random.Random | None = None):
+        # Callable turning a manifest entry into a model with predict_one/predict_batch
+        self._loader = loader
+        if rng is None:
+            rng = random.Random()
+            # Forked workers would otherwise all replay the parent's routing sequence
+            os.register_at_fork(after_in_child=rng.seed)
+        self._rng = rng
+        self._write_lock = threading.Lock()
+        self._swap_listeners = []
+
+        # (versions by name, routed names, cumulative weights)
+        self._snapshot = ({}, (), ())
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._snapshot[1])
+
+    @property
+    def versions(self) -> dict:
+        return dict(self._snapshot[0])
+
+    @property
+    def routing(self) -> dict:
+        _, names, cumulative = self._snapshot
+        weights, previous = {}, 0.0
+        for name, total in zip(names, cumulative):
+            weights[name] = total - previous
+            previous = total
+        return weights
+
+    def add_swap_listener(self, callback) -> None:
+        """Registers a callback run after every swap (e.g. to clear caches)."""
+        self._swap_listeners.append(callback)
+
+    def _swap(self, versions: dict, routing: dict) -> None:
+        names, cumulative, total = [], [], 0.0
+        for name, weight in routing.items():
+            if name not in versions:
+                raise ValueError(f"Cannot route traffic to unknown model version '{name}'.")
+            if weight < 0:
+                raise ValueError(f"Routing weight for '{name}' must not be negative.")
+            if weight == 0:
+                continue
+            total += weight
+            names.append(name)
+            cumulative.append(total)
+
+        if versions and not names:
+            raise ValueError("At least one model version needs a positive routing weight.")
+
+        self._snapshot = (versions, tuple(names), tuple(cumulative))
+        for callback in self._swap_listeners:
+            callback()
+
+    def apply_manifest(self, manifest: dict) -> None:
+        """
+        Loads new or changed versions from a manifest, retires removed ones and
+        applies its routing. Loading happens before the swap, so a version that
+        fails to load leaves the current snapshot untouched.
+        """
+        with self._write_lock:
+            current = self._snapshot[0]
+            versions = {}
+            for name, metadata in manifest.get("versions", {}).items():
+                loaded = current.get(name)
+                if loaded is not None and loaded.metadata == metadata:
+                    versions[name] = loaded
+                else:
+                    versions[name] = ModelVersion(name, self._loader(metadata), metadata)
+
+            self._swap(versions, manifest.get("routing", {}))
+
+    async def apply_manifest_async(self, manifest: dict) -> None:
+        """Loads in a worker thread so the event loop keeps serving meanwhile."""
+        await asyncio.to_thread(self.apply_manifest, manifest)
+
+    def set_routing(self, routing: dict) -> None:
+        """Changes the traffic split between already loaded versions."""
+        with self._write_lock:
+            self._swap(self._snapshot[0], routing)
+
+    def route(self) -> ModelVersion:
+        """Picks a version for one request according to the routing weights."""
+        versions, names, cumulative = self._snapshot
+        if not names:
+            raise Exception("ML Model is not loaded. Cannot make prediction.")
+        if len(names) == 1:
+            return versions[names[0]]
+        name = self._rng.choices(names, cum_weights=cumulative)[0]
+        return versions[name]
+
+    def stats(self) -> dict:
+        """Per-version latency, volume and accuracy, for side-by-side comparison."""
+        versions = self._snapshot[0]
+        return {
+            "routing": self.routing,
+            "versions": [version.stats() for version in versions.values()],
+        }
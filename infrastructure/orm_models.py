@@ -1,6 +1,7 @@
 from typing import List, Optional
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy import String, Integer, Float, ForeignKey, Boolean, DateTime, Date
+from sqlalchemy import String, Integer, Float, ForeignKey, Boolean, DateTime, Date, Index, \
+    UniqueConstraint, func
 import datetime
 
 from infrastructure.db import Base
@@ -41,6 +42,10 @@ class User(Base):
 class WorkoutLog(Base):
     """SQLAlchemy Model for the 'workout_logs' table."""
     __tablename__ = "workout_logs"
+    __table_args__ = (
+        # Serves a user's logs newest first, date-range filters and keyset pagination
+        Index("ix_workout_logs_user_date_id", "user_id", "workout_date", "id"),
+    )
 
     # CORE FIELDS (Including Primary Key and Timestamps)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -61,4 +66,64 @@ class WorkoutLog(Base):
     user: Mapped["User"] = relationship("User", back_populates="logs")
 
     def __repr__(self):
-        return f"<WorkoutLog(id={self.id}, user_id={self.user_id}, type='{self.workout_type}')>"
\ No newline at end of file
+        return f"<WorkoutLog(id={self.id}, user_id={self.user_id}, type='{self.workout_type}')>"
+
+
+class WorkoutSummary(Base):
+    """
+    SQLAlchemy Model for the 'workout_summaries' table: a user's session count,
+    duration and calories for one workout_type in one week or month. Kept up to
+    date by WorkoutLogService, so dashboards never aggregate the raw logs.
+    """
+    __tablename__ = "workout_summaries"
+    __table_args__ = (
+        # One row per bucket; also serves a user's summary reads by period and date
+        UniqueConstraint("user_id", "period", "period_start", "workout_type",
+                         name="uq_workout_summaries_bucket"),
+    )
+
+    # CORE FIELDS (Including Primary Key and Timestamps)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    # Evaluated by the database per statement (also in bulk upserts and INSERT ... SELECT)
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    # 'week' (starting Monday) or 'month' (starting on the 1st)
+    period: Mapped[str] = mapped_column(String(5))
+    period_start: Mapped[datetime.date] = mapped_column(Date)
+    workout_type: Mapped[str] = mapped_column(String(50))
+
+    # Totals over the logs in the bucket (rows can reach 0 sessions after deletes)
+    sessions: Mapped[int] = mapped_column(Integer, default=0)
+    total_duration_min: Mapped[int] = mapped_column(Integer, default=0)
+    total_calories: Mapped[float] = mapped_column(Float, default=0.0)
+
+    def __repr__(self):
+        return (f"<WorkoutSummary(user_id={self.user_id}, {self.period}={self.period_start}, "
+                f"type='{self.workout_type}', sessions={self.sessions})>")
+
+
+class WorkoutLogArchive(Base):
+    """
+    SQLAlchemy Model for the 'workout_log_archives' table: one row per monthly
+    workout_logs partition rolled up into workout_summaries and detached into
+    the archive schema. Archives are contiguous from the oldest month.
+    """
+    __tablename__ = "workout_log_archives"
+
+    # CORE FIELDS (Including Primary Key and Timestamps)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    # Evaluated by the database per statement: when the month was archived
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+    # Detached table holding the raw rows, e.g. 'archive.workout_logs_2023_01'
+    archive_table: Mapped[str] = mapped_column(String(127), unique=True)
+    # workout_date range of the rows: [range_start, range_end)
+    range_start: Mapped[datetime.date] = mapped_column(Date)
+    range_end: Mapped[datetime.date] = mapped_column(Date)
+    archived_rows: Mapped[int] = mapped_column(Integer)
+
+    def __repr__(self):
+        return f"<WorkoutLogArchive(table='{self.archive_table}', rows={self.archived_rows})>"
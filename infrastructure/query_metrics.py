@@ -0,0 +1,227 @@
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf'))
+
+# Distinct normalized statements tracked; further ones are counted under OTHER_STATEMENTS
+MAX_TRACKED_STATEMENTS = 500
+OTHER_STATEMENTS = '<other statements>'
+UNATTRIBUTED = '<no repository>'
+
+# Recent slow queries kept in memory for the stats endpoint
+SLOW_QUERY_HISTORY = 50
+
+slow_query_logger = logging.getLogger('fitnessbud.sql.slow')
+
+# Repository method currently running in this task, set by @timed_repository
+_current_method = contextvars.ContextVar('repository_method', default=None)
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'(?<![\w$])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'\$\d+|%\(\w+\)s|%s|:\w+|\?')
+_IN_LIST = re.compile(r'\bIN \(\?(?:, \?)+\)', re.IGNORECASE)
+_REPEATED_ROWS = re.compile(r'(\(\?(?:, \?)*\))(?:, \1)+')
+
+
+def normalize_sql(statement):
+    """
+    Reduces a statement to its shape: literals and every driver's placeholder
+    style become '?', and IN lists and multi-row VALUES collapse, so the same
+    query is one key whatever its parameters.
+    """
+    normalized = _WHITESPACE.sub(' ', statement).strip()
+    normalized = _STRING_LITERAL.sub('?', normalized)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _REPEATED_ROWS.sub(r'\1, ...', normalized)
+    return _IN_LIST.sub('IN (?, ...)', normalized)
+
+
+def redact_parameters(parameters):
+    """Parameters with every value replaced by its type name; keeps the shape only."""
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) for value in parameters]
+    return f"<{type(parameters).__name__}>"
+
+
+class LatencyHistogram:
+    """Counts of observed latencies per bucket, plus count, sum and max."""
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms):
+        for index, upper_bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= upper_bound:
+                self.buckets[index] += 1
+                break
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations."""
+        needed = fraction * self.count
+        seen = 0
+        for upper_bound, bucket_count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += bucket_count
+            if seen >= needed:
+                return min(upper_bound, round(self.max_ms, 3))
+        return round(self.max_ms, 3)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 3),
+            'buckets': {('+Inf' if upper_bound == float('inf') else str(upper_bound)): count
+                        for upper_bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)
+                        if count},
+        }
+
+
+class QueryMetrics:
+    """
+    Thread-safe latency histograms of executed statements, keyed by normalized
+    SQL and by the repository method that issued them, and a slow-query log.
+    """
+
+    def __init__(self, slow_query_ms):
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.by_statement = {}
+            self.by_method = {}
+            self.slow_queries = deque(maxlen=SLOW_QUERY_HISTORY)
+            self.slow_query_count = 0
+
+    def record(self, statement, parameters, elapsed_ms, method=None, executemany=False):
+        normalized = normalize_sql(statement)
+        method = method or UNATTRIBUTED
+        with self._lock:
+            if (normalized not in self.by_statement
+                    and len(self.by_statement) >= MAX_TRACKED_STATEMENTS):
+                normalized = OTHER_STATEMENTS
+            self.by_statement.setdefault(normalized, LatencyHistogram()).observe(elapsed_ms)
+            self.by_method.setdefault(method, LatencyHistogram()).observe(elapsed_ms)
+
+            if elapsed_ms < self.slow_query_ms:
+                return
+            self.slow_query_count += 1
+            entry = {
+                'elapsed_ms': round(elapsed_ms, 3),
+                'threshold_ms': self.slow_query_ms,
+                'repository_method': method,
+                'statement': normalized,
+                'parameters': redact_parameters(parameters),
+                'executemany': executemany,
+            }
+            self.slow_queries.append(entry)
+        slow_query_logger.warning(json.dumps(entry))
+
+    def stats(self):
+        """Histograms by repository method and by statement (slowest total first)."""
+        with self._lock:
+            def ranked(histograms):
+                return dict(sorted(((key, histogram.summary())
+                                    for key, histogram in histograms.items()),
+                                   key=lambda item: item[1]['total_ms'], reverse=True))
+
+            return {
+                'slow_query_ms': self.slow_query_ms,
+                'slow_queries': self.slow_query_count,
+                'by_repository_method': ranked(self.by_method),
+                'by_statement': ranked(self.by_statement),
+                'recent_slow_queries': list(self.slow_queries),
+            }
+
+
+def instrument_engine(engine, metrics):
+    """Times every statement the engine executes (pass engine.sync_engine for async engines)."""
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_timer(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def record_latency(connection, cursor, statement, parameters, context, executemany):
+        started = connection.info['query_started'].pop()
+        metrics.record(statement, parameters, (time.perf_counter() - started) * 1000,
+                       _current_method.get(), executemany)
+
+    @event.listens_for(engine, 'handle_error')
+    def discard_timer(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get('query_started'):
+            connection.info['query_started'].pop()
+
+    return metrics
+
+
+def timed_repository(cls):
+    """
+    Class decorator: statements executed inside a public async method (or async
+    generator) are attributed to 'ClassName.method' (the innermost one when
+    methods nest).
+    """
+    def wrap(method, label):
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            token = _current_method.set(label)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                _current_method.reset(token)
+        return wrapper
+
+    def wrap_generator(method, label):
+        # Set around each step only: the consumer may resume the generator from
+        # another context, and the variable must not leak into the consumer
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            generator = method(*args, **kwargs)
+            try:
+                while True:
+                    token = _current_method.set(label)
+                    try:
+                        item = await generator.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        _current_method.reset(token)
+                    yield item
+            finally:
+                await generator.aclose()
+        return wrapper
+
+    for name, method in list(vars(cls).items()):
+        if name.startswith('_'):
+            continue
+        if inspect.iscoroutinefunction(method):
+            setattr(cls, name, wrap(method, f"{cls.__name__}.{name}"))
+        elif inspect.isasyncgenfunction(method):
+            setattr(cls, name, wrap_generator(method, f"{cls.__name__}.{name}"))
+    return cls
@@ -0,0 +1,87 @@
+import json
+import os
+
+import numpy as np
+
+from infrastructure.compiled_model import CompiledGoalModel
+
+# Written by src/segmented_trainer.py next to one arrays directory per segment
+SEGMENTS_MANIFEST_FILE = 'segments.json'
+
+# Inputs a bundle can be segmented on; both are known when a prediction is made
+SEGMENT_FEATURES = ('equipment', 'workout_type')
+
+
+class SegmentedGoalModel:
+    """
+    One compiled model per value of a segment feature (e.g. equipment), plus a
+    fallback model for values that had too little training data. Each request
+    is dispatched to its segment's model, so every tree only has to separate
+    the goals within one segment.
+    """
+
+    def __init__(self, segment_feature, models: dict, fallback):
+        if segment_feature not in SEGMENT_FEATURES:
+            raise ValueError(f"Cannot segment on '{segment_feature}'. "
+                             f"Expected one of {SEGMENT_FEATURES}.")
+        self.segment_feature = segment_feature
+        self.models = models
+        self.fallback = fallback
+
+    @classmethod
+    def load(cls, directory, memory_mapped=True):
+        """Loads a bundle directory; memory-mapped arrays are shared across workers."""
+        with open(os.path.join(directory, SEGMENTS_MANIFEST_FILE)) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        def load_arrays(name):
+            path = os.path.join(directory, name)
+            if memory_mapped:
+                return CompiledGoalModel.load_memory_mapped(path)
+            return CompiledGoalModel({
+                file_name[:-len('.npy')]: np.load(os.path.join(path, file_name),
+                                                  allow_pickle=False)
+                for file_name in os.listdir(path) if file_name.endswith('.npy')
+            })
+
+        models = {segment: load_arrays(name) for segment, name in manifest['segments'].items()}
+        return cls(manifest['segment_feature'], models, load_arrays(manifest['fallback']))
+
+    def _segment(self, workout_type, equipment):
+        """Segment key of a request; None for values without their own model."""
+        value = equipment if self.segment_feature == 'equipment' else workout_type
+        return value if value in self.models else None
+
+    def _model(self, segment):
+        return self.fallback if segment is None else self.models[segment]
+
+    def bucket_key(self, workout_type, equipment, intensity, duration_min, calories_burned):
+        segment = self._segment(workout_type, equipment)
+        return (segment,) + self._model(segment).bucket_key(
+            workout_type, equipment, intensity, duration_min, calories_burned)
+
+    def predict_one(self, workout_type, equipment, intensity, duration_min, calories_burned):
+        model = self._model(self._segment(workout_type, equipment))
+        return model.predict_one(workout_type, equipment, intensity, duration_min,
+                                 calories_burned)
+
+    def predict_batch(self, workouts):
+        """Groups the workouts by segment: one vectorized call per segment model."""
+        groups = {}
+        for position, workout in enumerate(workouts):
+            segment = self._segment(workout['workout_type'], workout['equipment'])
+            groups.setdefault(segment, []).append(position)
+
+        predictions = [None] * len(workouts)
+        for segment, positions in groups.items():
+            computed = self._model(segment).predict_batch(
+                [workouts[position] for position in positions])
+            for position, prediction in zip(positions, computed):
+                predictions[position] = prediction
+        return predictions
+
+    def node_counts(self):
+        """Tree size of every segment model, for comparing against a single tree."""
+        counts = {segment: len(model.children_left) for segment, model in self.models.items()}
+        counts['fallback'] = len(self.fallback.children_left)
+        return counts
@@ -1,19 +1,26 @@
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
+from infrastructure.query_metrics import timed_repository
 from infrastructure.models import User
 from domain.schemas import UserCreate
 
 
+@timed_repository
 class UserRepository:
     """Handles persistence (CRUD) operations for the User model."""
 
     def __init__(self, db_session: AsyncSession):
         self.db = db_session
 
-    async def create(self, user_in: UserCreate, hashed_password: str) -> User:
-        """Creates a new User record in the database."""
+    async def create(self, user_in: UserCreate, hashed_password: str) -> Optional[User]:
+        """
+        Creates a new User record in the database with one
+        INSERT ... ON CONFLICT (email) DO NOTHING RETURNING.
+        Returns None when the email is already registered.
+        """
 
         # Unpack the schema data into a dictionary
         user_data = user_in.model_dump()
@@ -23,17 +30,14 @@ class UserRepository:
         # Remove the original plaintext password key to avoid saving it
         del user_data['password']
 
-        # Create the SQLAlchemy ORM model instance
-        db_user = User(**user_data)
+        # ON CONFLICT is dialect-specific syntax (PostgreSQL in production, SQLite in tests)
+        dialect = postgresql if self.db.get_bind().dialect.name == 'postgresql' else sqlite
+        stmt = dialect.insert(User).values(**user_data).on_conflict_do_nothing(
+            index_elements=[User.email]
+        ).returning(User)
 
-        # Add the instance to the session
-        self.db.add(db_user)
-        # Flush the session to assign an ID (primary key) to the object
-        await self.db.flush()
-        # Refresh the object to get the ID and other defaults
-        await self.db.refresh(db_user)
-
-        return db_user
+        result = await self.db.scalars(stmt)
+        return result.first()
 
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """Fetches a User by their primary key ID."""
@@ -52,4 +56,16 @@ class UserRepository:
         result = await self.db.execute(select(User))
         return list(result.scalars().all())
 
-    # NOTE: Update/Delete methods will be added later as needed.
+    async def set_active(self, user_id: int, is_active: bool) -> Optional[User]:
+        """
+        Activates or deactivates a user with one UPDATE ... RETURNING.
+        Returns None if there is no such user.
+        """
+        stmt = update(User).where(User.id == user_id).values(
+            is_active=is_active
+        ).returning(User)
+
+        result = await self.db.scalars(stmt)
+        return result.first()
+
+    # NOTE: Delete methods will be added later as needed.
@@ -1,12 +1,57 @@
-from sqlalchemy import select, delete, update
+import datetime
+
+from sqlalchemy import Date, Row, cast, func, insert, literal, literal_column, select, delete, \
+    update, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence
 
 # Local imports from Infrastructure and Domain
-from infrastructure.models import WorkoutLog
+from infrastructure.query_metrics import timed_repository
+from infrastructure.models import WorkoutLog, WorkoutSummary
 from domain.schemas import WorkoutLogCreate, WorkoutLogUpdate
 
+# Fields a PATCH may change
+UPDATABLE_COLUMNS = {'workout_date', 'duration_min', 'intensity', 'workout_type',
+                     'calories_burned'}
+
+# What a log contributes to the workout summaries
+SUMMARY_COLUMNS = [WorkoutLog.workout_date, WorkoutLog.workout_type, WorkoutLog.duration_min,
+                   WorkoutLog.calories_burned]
+SUMMARY_PERIODS = ('week', 'month')
+
+# Columns of a full-history export, in output order
+EXPORT_COLUMNS = [
+    WorkoutLog.id, WorkoutLog.workout_date, WorkoutLog.workout_type, WorkoutLog.intensity,
+    WorkoutLog.duration_min, WorkoutLog.calories_burned, WorkoutLog.created_at,
+    WorkoutLog.updated_at,
+]
+
+
+def period_start(period: str, day: datetime.date) -> datetime.date:
+    """First day of the week (Monday) or month containing `day`."""
+    if period == 'week':
+        return day - datetime.timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    """First day of the month `months` after (or before) the month of `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
 
+def period_start_expression(dialect_name: str, period: str, column):
+    """period_start() as SQL, for aggregating in the database."""
+    if dialect_name == 'postgresql':
+        # Inlined, not bound: GROUP BY must repeat the exact SELECT expression
+        return cast(func.date_trunc(literal_column(f"'{period}'"), column), Date)
+    # SQLite: next Sunday (or the day itself) minus six days is the Monday
+    modifiers = ('weekday 0', '-6 days') if period == 'week' else ('start of month',)
+    return func.date(column, *modifiers)
+
+
+@timed_repository
 class WorkoutLogRepository:
     """Handles persistence (CRUD) operations for the WorkoutLog model."""
 
@@ -14,43 +59,32 @@ class WorkoutLogRepository:
         self.db = db_session
 
     async def create(self, log_in: WorkoutLogCreate, user_id: int) -> WorkoutLog:
-        """Creates a new WorkoutLog record associated with a user."""
-
-        # Unpack the schema data and add the required user_id foreign key
-        log_data = {
-            'user_id': user_id,
-            'workout_date': log_in.workout_date,  # Direct access to the date object
-            'duration_min': log_in.duration_min,
-            'intensity': log_in.intensity,
-            'workout_type': log_in.workout_type,
-            'calories_burned': log_in.calories_burned
-        }
-        # Create the SQLAlchemy ORM model instance
-        print("DEBUG: Final log_data to ORM:", log_data)
-
-        try:
-            # 2. Instantiate the SQLAlchemy ORM model instance
-            db_log = WorkoutLog(**log_data)
-
-            # 🚨 DEBUG PRINT 2: Check if ORM instantiation succeeded
-            print("DEBUG: ORM instantiation succeeded.")
-
-            # 3. Add to session and flush
-            self.db.add(db_log)
-            await self.db.flush()
-            await self.db.refresh(db_log)
-
-            # 🚨 DEBUG PRINT 3: Check if flush succeeded
-            print("DEBUG: DB flush succeeded.")
-
-            return db_log
-
-        except Exception as e:
-            # 🚨 CRITICAL: Print the full error and re-raise
-            print("FATAL ERROR IN REPOSITORY CREATE:", e)
-            import traceback
-            traceback.print_exc()
-            raise e  # Re-raise the exception to send the 500 error back
+        """
+        Creates a new WorkoutLog record associated with a user.
+        One INSERT ... RETURNING brings back the ID and defaults (no flush + refresh).
+        """
+        stmt = insert(WorkoutLog).values(
+            user_id=user_id, **log_in.model_dump()
+        ).returning(WorkoutLog)
+
+        result = await self.db.scalars(stmt)
+        return result.one()
+
+    async def create_many(self, logs_in: List[WorkoutLogCreate],
+                          user_id: int) -> List[WorkoutLog]:
+        """
+        Creates all logs with a bulk INSERT ... RETURNING, so the IDs and defaults
+        come back with it (no flush/refresh per log). One statement on
+        PostgreSQL; SQLite gets one per log. Returns the logs in the order of
+        `logs_in`.
+        """
+        rows = [{'user_id': user_id, **log_in.model_dump()} for log_in in logs_in]
+        # Bulk INSERT ("insertmanyvalues"): SQLAlchemy correlates the RETURNING
+        # rows with the parameter sets, since neither the RETURNING order nor the
+        # order in which a multi-row VALUES draws ids is guaranteed
+        result = await self.db.scalars(
+            insert(WorkoutLog).returning(WorkoutLog, sort_by_parameter_order=True), rows)
+        return list(result.all())
 
     async def get_by_id(self, log_id: int, user_id: int) -> Optional[WorkoutLog]:
         """
@@ -73,38 +107,231 @@ class WorkoutLogRepository:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
-    async def update(self, log_id: int, user_id: int, log_update: WorkoutLogUpdate) -> \
-            Optional[WorkoutLog]:
-        """Updates an existing WorkoutLog for a specific user."""
+    async def get_page_by_user(self, user_id: int, limit: int,
+                               after: Optional[tuple[datetime.date, int]] = None,
+                               date_from: Optional[datetime.date] = None,
+                               date_to: Optional[datetime.date] = None,
+                               workout_type: Optional[str] = None,
+                               intensity: Optional[str] = None) -> List[WorkoutLog]:
+        """
+        Fetches up to `limit` of a user's logs, newest workout_date first (id breaks ties).
+        `after` is the (workout_date, id) of the last log of the previous page; the
+        row comparison seeks straight to it on the (user_id, workout_date, id) index,
+        so every page costs the same however long the history is.
+        """
+        stmt = select(WorkoutLog).where(WorkoutLog.user_id == user_id)
+
+        if after is not None:
+            stmt = stmt.where(tuple_(WorkoutLog.workout_date, WorkoutLog.id) < tuple_(*after),
+                              # Redundant with the row comparison, but lets PostgreSQL
+                              # skip the partitions of later months
+                              WorkoutLog.workout_date <= after[0])
+        if date_from is not None:
+            stmt = stmt.where(WorkoutLog.workout_date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(WorkoutLog.workout_date <= date_to)
+        if workout_type is not None:
+            stmt = stmt.where(WorkoutLog.workout_type == workout_type)
+        if intensity is not None:
+            stmt = stmt.where(WorkoutLog.intensity == intensity)
+
+        stmt = stmt.order_by(WorkoutLog.workout_date.desc(), WorkoutLog.id.desc()).limit(limit)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
 
-        # 1. Fetch the existing log, ensuring ownership
-        db_log = await self.get_by_id(log_id, user_id)
-        if not db_log:
-            return None
+    async def stream_by_user(self, user_id: int,
+                             batch_size: int) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yields a user's logs oldest first, as plain rows in batches of up to
+        `batch_size`. The query runs on a server-side cursor (yield_per) and no
+        ORM objects are built, so memory stays bounded by one batch.
+        """
+        stmt = select(*EXPORT_COLUMNS).where(
+            WorkoutLog.user_id == user_id
+        ).order_by(WorkoutLog.workout_date, WorkoutLog.id).execution_options(
+            yield_per=batch_size)
+
+        result = await self.db.stream(stmt)
+        async for partition in result.partitions(batch_size):
+            yield partition
+
+    async def get_summary_fields(self, log_id: int, user_id: int) -> Optional[Row]:
+        """
+        Fetches the SUMMARY_COLUMNS of a user's log and locks the row (FOR UPDATE on
+        PostgreSQL) until the transaction ends, so an update can move its totals
+        between summary buckets without racing another writer.
+        """
+        stmt = select(*SUMMARY_COLUMNS).where(
+            WorkoutLog.id == log_id,
+            WorkoutLog.user_id == user_id
+        ).with_for_update()
+        result = await self.db.execute(stmt)
+        return result.first()
 
-        # 2. Update model attributes from the Pydantic schema
-        update_data = log_update.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_log, key, value)
+    async def update(self, log_id: int, user_id: int, log_update: WorkoutLogUpdate) -> \
+            Optional[WorkoutLog]:
+        """
+        Updates an existing WorkoutLog for a specific user with one
+        UPDATE ... WHERE id AND user_id RETURNING; None if no such log is owned by the user.
+        """
+        # Only mapped columns are written (WorkoutLogUpdate also carries equipment_used)
+        update_data = {key: value
+                       for key, value in log_update.model_dump(exclude_unset=True).items()
+                       if key in UPDATABLE_COLUMNS}
+        if not update_data:
+            return await self.get_by_id(log_id, user_id)
 
-        # Flush the session to register the update
-        await self.db.flush()
-        await self.db.refresh(db_log)
+        stmt = update(WorkoutLog).where(
+            WorkoutLog.id == log_id,
+            WorkoutLog.user_id == user_id
+        ).values(**update_data).returning(WorkoutLog)
 
-        return db_log
+        result = await self.db.scalars(stmt)
+        return result.first()
 
-    async def delete(self, log_id: int, user_id: int) -> bool:
-        """Deletes a specific WorkoutLog, ensuring it belongs to the user."""
+    async def delete(self, log_id: int, user_id: int) -> Optional[Row]:
+        """
+        Deletes a specific WorkoutLog, ensuring it belongs to the user.
+        Returns the deleted log's SUMMARY_COLUMNS (DELETE ... RETURNING), or None
+        if no such log is owned by the user.
+        """
 
         # Build the delete statement, including the user_id for security
         stmt = delete(WorkoutLog).where(
             WorkoutLog.id == log_id,
             WorkoutLog.user_id == user_id
+        ).returning(*SUMMARY_COLUMNS)
+
+        result = await self.db.execute(stmt)
+        return result.first()
+
+
+@timed_repository
+class WorkoutSummaryRepository:
+    """
+    Persistence for the per-user weekly and monthly totals (WorkoutSummary).
+    Writes run in the caller's transaction, next to the log change they reflect.
+    """
+
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+
+    async def apply_log_changes(self, user_id: int, added=(), removed=()) -> int:
+        """
+        Adds the `added` logs to and subtracts the `removed` logs from their week
+        and month buckets, with one INSERT ... ON CONFLICT DO UPDATE for all
+        buckets. Logs are anything with the SUMMARY_COLUMNS attributes.
+        Returns the number of buckets changed.
+        """
+        deltas = {}
+        for sign, logs in ((1, added), (-1, removed)):
+            for log in logs:
+                for period in SUMMARY_PERIODS:
+                    key = (period, period_start(period, log.workout_date), log.workout_type)
+                    totals = deltas.setdefault(key, [0, 0, 0.0])
+                    totals[0] += sign
+                    totals[1] += sign * log.duration_min
+                    totals[2] += sign * (log.calories_burned or 0.0)
+
+        rows = [
+            {'user_id': user_id, 'period': period, 'period_start': start,
+             'workout_type': workout_type, 'sessions': sessions,
+             'total_duration_min': duration, 'total_calories': calories}
+            for (period, start, workout_type), (sessions, duration, calories) in deltas.items()
+            if sessions or duration or calories
+        ]
+        if not rows:
+            return 0
+
+        dialect = postgresql if self.db.get_bind().dialect.name == 'postgresql' else sqlite
+        stmt = dialect.insert(WorkoutSummary).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'period', 'period_start', 'workout_type'],
+            set_={
+                'sessions': WorkoutSummary.sessions + stmt.excluded.sessions,
+                'total_duration_min':
+                    WorkoutSummary.total_duration_min + stmt.excluded.total_duration_min,
+                'total_calories': WorkoutSummary.total_calories + stmt.excluded.total_calories,
+                'updated_at': func.now(),
+            }
         )
+        await self.db.execute(stmt)
+        return len(rows)
 
+    async def get_by_user(self, user_id: int, period: str,
+                          date_from: Optional[datetime.date] = None,
+                          date_to: Optional[datetime.date] = None,
+                          workout_type: Optional[str] = None) -> List[WorkoutSummary]:
+        """A user's non-empty buckets of one period, oldest first; served by the bucket index."""
+        stmt = select(WorkoutSummary).where(
+            WorkoutSummary.user_id == user_id,
+            WorkoutSummary.period == period,
+            WorkoutSummary.sessions > 0
+        )
+        if date_from is not None:
+            stmt = stmt.where(WorkoutSummary.period_start >= period_start(period, date_from))
+        if date_to is not None:
+            stmt = stmt.where(WorkoutSummary.period_start <= date_to)
+        if workout_type is not None:
+            stmt = stmt.where(WorkoutSummary.workout_type == workout_type)
+
+        stmt = stmt.order_by(WorkoutSummary.period_start, WorkoutSummary.workout_type)
         result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def rebuild(self, user_id: Optional[int] = None,
+                      date_from: Optional[datetime.date] = None,
+                      date_to: Optional[datetime.date] = None,
+                      user_id_range: Optional[tuple[int, int]] = None) -> None:
+        """
+        Recomputes the summaries from the raw logs (all users, one, or the ids in
+        the half-open user_id_range, e.g. a bulk-loaded chunk), aggregating in
+        the database with one INSERT ... SELECT ... GROUP BY per period.
+        Only buckets with date_from <= period_start < date_to are replaced; the
+        raw logs of every day from date_from on must still exist (buckets before
+        an archived range are kept as they are).
+        """
+        dialect_name = self.db.get_bind().dialect.name
+
+        stmt = delete(WorkoutSummary)
+        if user_id is not None:
+            stmt = stmt.where(WorkoutSummary.user_id == user_id)
+        if user_id_range is not None:
+            stmt = stmt.where(WorkoutSummary.user_id.between(user_id_range[0],
+                                                             user_id_range[1] - 1))
+        if date_from is not None:
+            stmt = stmt.where(WorkoutSummary.period_start >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(WorkoutSummary.period_start < date_to)
+        await self.db.execute(stmt)
+
+        for period in SUMMARY_PERIODS:
+            start = period_start_expression(dialect_name, period, WorkoutLog.workout_date)
+            aggregate = select(
+                WorkoutLog.user_id, literal(period), start, WorkoutLog.workout_type,
+                func.count(), func.sum(WorkoutLog.duration_min),
+                func.coalesce(func.sum(WorkoutLog.calories_burned), 0.0)
+            ).group_by(WorkoutLog.user_id, start, WorkoutLog.workout_type)
+            if user_id is not None:
+                aggregate = aggregate.where(WorkoutLog.user_id == user_id)
+            if user_id_range is not None:
+                aggregate = aggregate.where(WorkoutLog.user_id.between(user_id_range[0],
+                                                                       user_id_range[1] - 1))
+            if date_from is not None:
+                # Days after date_from can still fall in a bucket starting before it;
+                # the plain date bound (implied) lets PostgreSQL prune partitions
+                aggregate = aggregate.where(start >= date_from,
+                                            WorkoutLog.workout_date >= date_from)
+            if date_to is not None:
+                # Buckets starting before date_to end within a week or month of it;
+                # the plain date bound lets PostgreSQL prune later partitions
+                last_day = date_to + datetime.timedelta(days=7) if period == 'week' \
+                    else add_months(date_to, 1)
+                aggregate = aggregate.where(start < date_to,
+                                            WorkoutLog.workout_date < last_day)
 
-        # Check if any row was actually deleted
-        if result.rowcount > 0:
-            return True
-        return False
+            await self.db.execute(insert(WorkoutSummary).from_select(
+                ['user_id', 'period', 'period_start', 'workout_type', 'sessions',
+                 'total_duration_min', 'total_calories'],
+                aggregate
+            ))
@@ -0,0 +1,184 @@
+import datetime
+import re
+from typing import List, Optional
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from infrastructure.models import WorkoutLogArchive
+from infrastructure.query_metrics import timed_repository
+from infrastructure.workout_log_repository import WorkoutSummaryRepository, add_months
+
+# workout_logs is range-partitioned by workout_date (PostgreSQL, migration 0003):
+# one partition per month, plus workout_logs_default for dates outside them
+PARTITION_NAME = re.compile(r'^workout_logs_(\d{4})_(\d{2})$')
+DEFAULT_PARTITION = 'workout_logs_default'
+
+_IDENTIFIER = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"workout_logs_{month:%Y_%m}"
+
+
+def plan_maintenance(partitions: List[datetime.date], today: datetime.date,
+                     retention_months: int,
+                     ahead_months: int) -> tuple[List[datetime.date], List[datetime.date]]:
+    """
+    Months (first days) of the partitions to create and to archive: every month
+    from the current one to `ahead_months` ahead must exist before rows for it
+    arrive, and months entirely older than `retention_months` are archived,
+    oldest first.
+    """
+    this_month = today.replace(day=1)
+    cutoff = add_months(this_month, -retention_months)
+
+    to_create = [month for month in (add_months(this_month, ahead)
+                                     for ahead in range(ahead_months + 1))
+                 if month not in partitions]
+    to_archive = sorted(month for month in partitions if month < cutoff)
+    return to_create, to_archive
+
+
+@timed_repository
+class WorkoutLogPartitionRepository:
+    """Partition DDL (PostgreSQL) and archive bookkeeping for workout_logs."""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+
+    async def is_partitioned(self) -> bool:
+        if self.db.get_bind().dialect.name != 'postgresql':
+            return False
+        result = await self.db.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table"
+            " WHERE partrelid = 'workout_logs'::regclass)"
+        ))
+        return bool(result.scalar())
+
+    async def list_partitions(self) -> List[datetime.date]:
+        """First days of the months with an attached partition, oldest first."""
+        result = await self.db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = 'workout_logs'::regclass"
+        ))
+        months = []
+        for name in result.scalars():
+            match = PARTITION_NAME.match(name)
+            if match:
+                months.append(datetime.date(int(match[1]), int(match[2]), 1))
+        return sorted(months)
+
+    async def create_partition(self, month: datetime.date) -> int:
+        """
+        Creates the partition of one month and returns how many rows it took
+        over from the default partition. PostgreSQL refuses to create it while
+        the default partition holds rows of that month (logs dated beyond the
+        pre-created months), so the default is then detached, its rows of the
+        month moved and the default reattached, all in the caller's
+        transaction. Writes to workout_logs wait until it commits.
+        """
+        name, month_end = partition_name(month), add_months(month, 1)
+        bounds = f"FOR VALUES FROM ('{month}') TO ('{month_end}')"
+        in_month = f"workout_date >= '{month}' AND workout_date < '{month_end}'"
+
+        stray = (await self.db.execute(text(
+            f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE {in_month}"
+        ))).scalar()
+        if not stray:
+            await self.db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF workout_logs {bounds}"))
+            return 0
+
+        await self.db.execute(text(
+            f"ALTER TABLE workout_logs DETACH PARTITION {DEFAULT_PARTITION}"))
+        await self.db.execute(text(f"CREATE TABLE {name} PARTITION OF workout_logs {bounds}"))
+        await self.db.execute(text(
+            f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_month}"))
+        await self.db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}"))
+        await self.db.execute(text(
+            f"ALTER TABLE workout_logs ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        return stray
+
+    async def archive_partition(self, month: datetime.date, archive_schema: str) -> int:
+        """
+        Rolls the month up into workout_summaries, then detaches its partition and
+        moves it to `archive_schema`, all in the caller's transaction. DETACH
+        briefly locks workout_logs, but moves no data. Returns the archived rows.
+        """
+        if not _IDENTIFIER.match(archive_schema):
+            raise ValueError(f"Invalid archive schema name: {archive_schema!r}")
+        name, month_end = partition_name(month), add_months(month, 1)
+
+        # Recomputed from the raw rows while they are still attached: the
+        # summaries are all that remains online of this month afterwards
+        await WorkoutSummaryRepository(db_session=self.db).rebuild(date_from=month,
+                                                                   date_to=month_end)
+        rows = (await self.db.execute(text(f"SELECT count(*) FROM {name}"))).scalar()
+
+        await self.db.execute(text(f"ALTER TABLE workout_logs DETACH PARTITION {name}"))
+        await self.db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+        await self.db.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+        await self.db.execute(insert(WorkoutLogArchive).values(
+            archive_table=f"{archive_schema}.{name}", range_start=month, range_end=month_end,
+            archived_rows=rows
+        ))
+        return rows
+
+    async def archived_until(self) -> Optional[datetime.date]:
+        """End of the archived workout_date range (None if nothing was archived)."""
+        result = await self.db.execute(select(func.max(WorkoutLogArchive.range_end)))
+        return result.scalar()
+
+
+async def maintain_partitions(session_factory: async_sessionmaker, today: datetime.date,
+                              retention_months: int, ahead_months: int,
+                              archive_schema: str, dry_run: bool = False) -> dict:
+    """
+    Creates the upcoming monthly partitions and archives the expired ones, one
+    transaction per partition. A month that fails is rolled back and reported
+    under 'failed'; the other months are still processed. Returns what was
+    (or, with dry_run, would be) done.
+    """
+    async with session_factory() as session:
+        repository = WorkoutLogPartitionRepository(db_session=session)
+        if not await repository.is_partitioned():
+            return {'partitioned': False, 'created': [], 'archived': {}, 'failed': {}}
+        to_create, to_archive = plan_maintenance(await repository.list_partitions(), today,
+                                                 retention_months, ahead_months)
+
+    if dry_run:
+        return {'partitioned': True, 'created': [partition_name(m) for m in to_create],
+                'archived': {partition_name(m): None for m in to_archive}, 'failed': {}}
+
+    report = {'partitioned': True, 'created': [], 'archived': {}, 'failed': {}}
+    for month in to_create:
+        name = partition_name(month)
+        try:
+            async with session_factory() as session:
+                moved = await WorkoutLogPartitionRepository(
+                    db_session=session).create_partition(month)
+                await session.commit()
+        except Exception as e:
+            report['failed'][name] = repr(e)
+            print(f"Creating {name} failed: {e!r}")
+            continue
+        report['created'].append(name)
+        if moved:
+            print(f"Created {name}: moved {moved} rows out of {DEFAULT_PARTITION}.")
+
+    for month in to_archive:
+        name = partition_name(month)
+        try:
+            async with session_factory() as session:
+                rows = await WorkoutLogPartitionRepository(
+                    db_session=session).archive_partition(month, archive_schema)
+                await session.commit()
+        except Exception as e:
+            report['failed'][name] = repr(e)
+            print(f"Archiving {name} failed: {e!r}")
+            continue
+        report['archived'][name] = rows
+        print(f"Archived {name}: {rows} rows rolled up and detached.")
+
+    return report
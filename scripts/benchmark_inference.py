@@ -0,0 +1,282 @@
+"""
+Offline benchmark suite for the recommendation path, run against the bundled
+models/ artifacts. No database or network is needed.
+
+Covers:
+  * single-call latency percentiles: preprocess_input, the sklearn pipeline,
+    the compiled model, predict_goal (cache hits) and the /recommend handler
+  * batch throughput for sizes 1 through 100k
+  * cold start (fresh interpreter: import + load + first prediction) vs warm
+  * memory allocated per prediction (tracemalloc peak)
+
+Results are written as JSON. Comparing against a saved baseline exits with
+status 1 when any metric regressed by more than the tolerance:
+
+    python -m scripts.benchmark_inference --output bench.json
+    python -m scripts.benchmark_inference --baseline benchmarks/inference_baseline.json
+    python -m scripts.benchmark_inference --save-baseline benchmarks/inference_baseline.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+BASELINE_FILE_PATH = 'benchmarks/inference_baseline.json'
+DATA_FILE_PATH = 'models/synthetic_workout_data.csv'
+BATCH_SIZES = [1, 10, 100, 1000, 10000, 100000]
+
+# Metric name suffixes and the direction that counts as a regression
+LOWER_IS_BETTER = ('_us', '_ms', '_bytes')
+HIGHER_IS_BETTER = ('_per_s',)
+
+SAMPLE_WORKOUT = {'workout_type': 'Deadlift', 'equipment': 'barbell', 'intensity': 'high',
+                  'duration_min': 45, 'calories_burned': 10.0}
+
+COLD_START_CODE = {
+    'compiled': """
+import time; started = time.perf_counter()
+from infrastructure.ml_adapter import load_model, predict_goal
+load_model(); predict_goal('Deadlift', 'barbell', 'high', 45, 10.0)
+print(time.perf_counter() - started)
+""",
+    'pipeline': """
+import time; started = time.perf_counter()
+import joblib
+from infrastructure.ml_adapter import MODEL_FILE_PATH, PipelineGoalModel
+PipelineGoalModel(joblib.load(MODEL_FILE_PATH)).predict_one('Deadlift', 'barbell', 'high', 45, 10.0)
+print(time.perf_counter() - started)
+""",
+}
+
+
+def load_workouts(count):
+    """Real rows from the training CSV, repeated up to `count`."""
+    import pandas as pd
+
+    rows = pd.read_csv(DATA_FILE_PATH)[
+        ['workout_type', 'equipment', 'intensity', 'duration_min', 'calories_burned']
+    ].to_dict(orient='records')
+    return [rows[i % len(rows)] for i in range(count)]
+
+
+def latency(func, iterations, warmup=20):
+    """Calls func repeatedly and returns latency percentiles in microseconds."""
+    for _ in range(warmup):
+        func()
+
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        started = time.perf_counter_ns()
+        func()
+        samples[i] = time.perf_counter_ns() - started
+
+    samples /= 1000
+    return {
+        'iterations': iterations,
+        'p50_us': round(float(np.percentile(samples, 50)), 2),
+        'p90_us': round(float(np.percentile(samples, 90)), 2),
+        'p99_us': round(float(np.percentile(samples, 99)), 2),
+        'mean_us': round(float(samples.mean()), 2),
+    }
+
+
+def throughput(predict_batch, workouts, repeats):
+    """Best-of-N wall time for one batch call, as rows per second."""
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        predict_batch(workouts)
+        best = min(best, time.perf_counter() - started)
+    return {'batch_ms': round(best * 1000, 3),
+            'rows_per_s': round(len(workouts) / best, 1)}
+
+
+def allocated_bytes(func):
+    """Peak bytes allocated by Python while func runs."""
+    func()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def cold_start(kind, repeats):
+    """Fresh interpreter: imports, model load and first prediction, in ms."""
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', COLD_START_CODE[kind]],
+                                capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return {'best_ms': round(min(timings) * 1000, 1),
+            'median_ms': round(float(np.median(timings)) * 1000, 1)}
+
+
+def bench_recommend_handler(iterations):
+    """Posts the /recommend form through the ASGI app, with the scheduler running."""
+    try:
+        import httpx
+        from api.main import app
+        from infrastructure.ml_adapter import INFERENCE_SCHEDULER
+    except Exception as e:
+        return {'skipped': f"{type(e).__name__}: {e}"}
+
+    form = {'workout_type': 'deadlift', 'equipment': 'full_gym', 'intensity': 'high',
+            'duration_min': '45', 'calories_burned': '10'}
+
+    async def run():
+        await INFERENCE_SCHEDULER.start()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            samples = []
+            for i in range(iterations + 20):
+                started = time.perf_counter_ns()
+                response = await client.post('/recommend', data=form)
+                if i >= 20:
+                    samples.append(time.perf_counter_ns() - started)
+            response.raise_for_status()
+        await INFERENCE_SCHEDULER.stop()
+        return np.array(samples) / 1000
+
+    samples = asyncio.run(run())
+    return {
+        'iterations': iterations,
+        'p50_us': round(float(np.percentile(samples, 50)), 2),
+        'p90_us': round(float(np.percentile(samples, 90)), 2),
+        'p99_us': round(float(np.percentile(samples, 99)), 2),
+        'mean_us': round(float(samples.mean()), 2),
+    }
+
+
+def run_benchmarks(quick=False):
+    import joblib
+    from infrastructure import ml_adapter
+
+    iterations = 200 if quick else 2000
+    repeats = 2 if quick else 5
+    sizes = BATCH_SIZES[:-1] if quick else BATCH_SIZES
+
+    registry = ml_adapter.load_model()
+    compiled = registry.route().model
+    pipeline_model = ml_adapter.PipelineGoalModel(joblib.load(ml_adapter.MODEL_FILE_PATH))
+    workouts = load_workouts(max(sizes))
+
+    results = {'single': {}, 'batch': {}, 'cold_start': {}, 'memory': {}}
+
+    # 1. Single-call latency
+    results['single']['preprocess_input'] = latency(
+        lambda: ml_adapter.preprocess_input(**SAMPLE_WORKOUT), iterations // 4)
+    results['single']['pipeline_predict'] = latency(
+        lambda: pipeline_model.predict_one(**SAMPLE_WORKOUT), iterations // 4)
+    results['single']['compiled_predict'] = latency(
+        lambda: compiled.predict_one(**SAMPLE_WORKOUT), iterations)
+    results['single']['predict_goal_cached'] = latency(
+        lambda: ml_adapter.predict_goal(**SAMPLE_WORKOUT), iterations)
+    results['single']['recommend_handler'] = bench_recommend_handler(iterations // 4)
+
+    # 2. Batch throughput
+    for size in sizes:
+        batch = workouts[:size]
+        results['batch'][f'compiled_{size}'] = throughput(compiled.predict_batch, batch,
+                                                          repeats)
+        results['batch'][f'pipeline_{size}'] = throughput(pipeline_model.predict_batch, batch,
+                                                          repeats)
+
+    # 3. Cold vs warm
+    for kind in COLD_START_CODE:
+        results['cold_start'][kind] = cold_start(kind, repeats)
+    results['cold_start']['warm_compiled_p50_us'] = results['single']['compiled_predict'][
+        'p50_us']
+
+    # 4. Memory per prediction
+    batch = workouts[:10000]
+    results['memory']['compiled_single_bytes'] = allocated_bytes(
+        lambda: compiled.predict_one(**SAMPLE_WORKOUT))
+    results['memory']['pipeline_single_bytes'] = allocated_bytes(
+        lambda: pipeline_model.predict_one(**SAMPLE_WORKOUT))
+    results['memory']['compiled_batch_per_row_bytes'] = round(
+        allocated_bytes(lambda: compiled.predict_batch(batch)) / len(batch), 1)
+    results['memory']['pipeline_batch_per_row_bytes'] = round(
+        allocated_bytes(lambda: pipeline_model.predict_batch(batch)) / len(batch), 1)
+
+    return {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'quick': quick,
+        },
+        'results': results,
+    }
+
+
+def flatten(results, prefix=''):
+    """{'a': {'b_us': 1}} -> {'a.b_us': 1}"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline, tolerance):
+    """Returns the metrics that got worse than the baseline by more than `tolerance`."""
+    current_metrics = flatten(current['results'])
+    regressions = []
+    for name, before in flatten(baseline['results']).items():
+        after = current_metrics.get(name)
+        if after is None or before == 0:
+            continue
+        if name.endswith(LOWER_IS_BETTER):
+            change = after / before - 1
+        elif name.endswith(HIGHER_IS_BETTER):
+            change = before / after - 1
+        else:
+            continue
+        if change > tolerance:
+            regressions.append({'metric': name, 'baseline': before, 'current': after,
+                                'regression': f"{change:+.0%}"})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help="Write the JSON results to this file.")
+    parser.add_argument('--baseline', help="Compare against this saved result file.")
+    parser.add_argument('--save-baseline', nargs='?', const=BASELINE_FILE_PATH,
+                        help="Save the results as the new baseline.")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed relative slowdown before failing (default 0.25).")
+    parser.add_argument('--quick', action='store_true',
+                        help="Fewer iterations and no 100k batch.")
+    args = parser.parse_args()
+
+    report = run_benchmarks(quick=args.quick)
+    text = json.dumps(report, indent=2)
+    print(text)
+
+    for file_path in (args.output, args.save_baseline):
+        if file_path:
+            with open(file_path, 'w') as output_file:
+                output_file.write(text + '\n')
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.tolerance)
+        if regressions:
+            print(json.dumps({'regressions': regressions}, indent=2))
+            sys.exit(1)
+        print("No regressions against the baseline.")
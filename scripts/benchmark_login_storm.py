@@ -0,0 +1,133 @@
+"""
+Latency of the authenticated CRUD endpoints during a login storm.
+
+Clients keep listing and reading workout logs while others keep signing in
+(POST /v1/auth/token, a sha256_crypt verification each). Every phase runs
+through the ASGI app on one event loop, like a single app worker:
+
+- idle:   CRUD clients only;
+- inline: CRUD + logins, password checks on the event loop (no worker pool);
+- pool:   CRUD + logins, password checks in the password worker pool.
+
+Runs on a throwaway SQLite database unless DATABASE_URL is set:
+
+    python -m scripts.benchmark_login_storm
+    python -m scripts.benchmark_login_storm --seconds 10 --login-clients 16
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+
+PASSWORD = 'storm-password'
+
+
+def summary(latencies, elapsed):
+    if not latencies:
+        return {'requests': 0}
+    milliseconds = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(float(np.percentile(milliseconds, 50)), 2),
+        'p99_ms': round(float(np.percentile(milliseconds, 99)), 2),
+        'max_ms': round(float(milliseconds.max()), 2),
+    }
+
+
+async def client_loop(client, request, deadline, latencies, statuses):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await request(client)
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def run_phase(client, headers, log_id, email, seconds, crud_clients, login_clients):
+    crud_latencies, login_latencies, statuses = [], [], {}
+
+    async def crud(client):
+        # Alternate between a page of logs and a single log
+        if len(crud_latencies) % 2:
+            return await client.get(f'/v1/workout_logs/{log_id}', headers=headers)
+        return await client.get('/v1/workout_logs/?limit=20', headers=headers)
+
+    async def login(client):
+        return await client.post('/v1/auth/token',
+                                 data={'username': email, 'password': PASSWORD})
+
+    started = time.perf_counter()
+    deadline = started + seconds
+    await asyncio.gather(
+        *[client_loop(client, crud, deadline, crud_latencies, statuses)
+          for _ in range(crud_clients)],
+        *[client_loop(client, login, deadline, login_latencies, statuses)
+          for _ in range(login_clients)],
+    )
+    elapsed = time.perf_counter() - started
+    return {'crud': summary(crud_latencies, elapsed),
+            'login': summary(login_latencies, elapsed),
+            'status_codes': statuses}
+
+
+async def run(args):
+    import httpx
+
+    # Imported here: the settings are read from the environment set up in __main__
+    from api.main import app
+    from domain.auth_service import PASSWORD_POOL
+    from infrastructure.db import create_db_and_tables, dispose_engine
+
+    await create_db_and_tables()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        email = f"storm-{time.time_ns()}@example.com"
+        response = await client.post('/v1/users/', json={
+            'email': email, 'password': PASSWORD, 'age': 30, 'goal': 'gain_muscle',
+            'equipment': 'barbell'})
+        response.raise_for_status()
+        token = (await client.post('/v1/auth/token', data={
+            'username': email, 'password': PASSWORD})).json()['access_token']
+        headers = {'Authorization': f"Bearer {token}"}
+        response = await client.post('/v1/workout_logs/bulk', headers=headers, json={'logs': [
+            {'workout_date': f"2025-01-{day:02d}", 'duration_min': 45, 'intensity': 'high',
+             'workout_type': 'Deadlift', 'calories_burned': 300.0} for day in range(1, 29)]})
+        log_id = response.json()['created'][0]['id']
+
+        phases = [('idle', False, 0), ('inline', False, args.login_clients),
+                  ('pool', True, args.login_clients)]
+        print(f"{'phase':<8}{'crud p50':>10}{'crud p99':>10}{'crud max':>10}{'crud/s':>9}"
+              f"{'logins/s':>10}{'login p99':>11}  status codes")
+        for name, use_pool, login_clients in phases:
+            if use_pool:
+                await PASSWORD_POOL.start()
+            result = await run_phase(client, headers, log_id, email, args.seconds,
+                                     args.crud_clients, login_clients)
+            if use_pool:
+                result['status_codes']['pool_rejected'] = PASSWORD_POOL.stats()['rejected']
+                await PASSWORD_POOL.stop()
+
+            crud, login = result['crud'], result['login']
+            print(f"{name:<8}{crud['p50_ms']:>10}{crud['p99_ms']:>10}{crud['max_ms']:>10}"
+                  f"{crud['per_second']:>9}{login.get('per_second', 0):>10}"
+                  f"{login.get('p99_ms', '-'):>11}  {result['status_codes']}")
+
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=5.0, help="Duration of each phase.")
+    parser.add_argument('--crud-clients', type=int, default=4)
+    parser.add_argument('--login-clients', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='fitnessbud-storm-') as directory:
+        os.environ.setdefault('DATABASE_URL',
+                              f"sqlite+aiosqlite:///{os.path.join(directory, 'storm.db')}")
+        os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+        asyncio.run(run(args))
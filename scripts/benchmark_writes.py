@@ -0,0 +1,166 @@
+"""
+Round trips and latency of the write paths: creating and updating a workout
+log and registering a user, each as the previous multi-statement flow
+(add/flush/refresh, SELECT then UPDATE, email lookup then INSERT) and as the
+current single-statement repository method (RETURNING / ON CONFLICT).
+
+Runs on a throwaway SQLite database by default. SQLite has no network, so
+--rtt-ms adds a simulated round-trip time to every statement; point
+--database-url at PostgreSQL to measure real round trips:
+
+    python -m scripts.benchmark_writes
+    python -m scripts.benchmark_writes --rtt-ms 0.5 --iterations 500
+    python -m scripts.benchmark_writes --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import tempfile
+import time
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from domain.schemas import UserCreate, WorkoutLogCreate, WorkoutLogUpdate
+from infrastructure.db import Base
+from infrastructure.models import User, WorkoutLog
+from infrastructure.user_repository import UserRepository
+from infrastructure.workout_log_repository import WorkoutLogRepository
+
+# Password hashing is left out: only the database work is compared
+HASHED_PASSWORD = 'benchmark-hash'
+
+LOG_IN = WorkoutLogCreate(workout_date=datetime.date(2025, 11, 1), duration_min=45,
+                          intensity='high', workout_type='Deadlift', calories_burned=320.0)
+
+
+def log_update(number):
+    # A different value every call, so every call really writes
+    return WorkoutLogUpdate(duration_min=30 + number % 60, intensity='moderate')
+
+
+def new_user(number, prefix):
+    return UserCreate(email=f"{prefix}-{number}@example.com", password='benchmark-password',
+                      age=35, goal='gain_muscle', equipment='barbell')
+
+
+# --- Previous implementations, kept here for comparison ---
+
+async def legacy_create(session, user_id, number, log_id):
+    db_log = WorkoutLog(user_id=user_id, **LOG_IN.model_dump())
+    session.add(db_log)
+    await session.flush()
+    await session.refresh(db_log)
+    return db_log
+
+
+async def legacy_update(session, user_id, number, log_id):
+    result = await session.execute(
+        select(WorkoutLog).where(WorkoutLog.id == log_id, WorkoutLog.user_id == user_id))
+    db_log = result.scalars().first()
+    for key, value in log_update(number).model_dump(exclude_unset=True).items():
+        setattr(db_log, key, value)
+    await session.flush()
+    await session.refresh(db_log)
+    return db_log
+
+
+async def legacy_register(session, user_id, number, log_id):
+    user_in = new_user(number, 'legacy')
+    result = await session.execute(select(User).where(User.email == user_in.email))
+    if result.scalars().first():
+        raise RuntimeError("email taken")
+    user_data = user_in.model_dump(exclude={'password'})
+    db_user = User(hashed_password=HASHED_PASSWORD, **user_data)
+    session.add(db_user)
+    await session.flush()
+    await session.refresh(db_user)
+    return db_user
+
+
+# --- Current repository methods ---
+
+async def current_create(session, user_id, number, log_id):
+    return await WorkoutLogRepository(db_session=session).create(LOG_IN, user_id)
+
+
+async def current_update(session, user_id, number, log_id):
+    return await WorkoutLogRepository(db_session=session).update(log_id, user_id,
+                                                                 log_update(number))
+
+
+async def current_register(session, user_id, number, log_id):
+    return await UserRepository(db_session=session).create(new_user(number, 'current'),
+                                                           HASHED_PASSWORD)
+
+
+OPERATIONS = [
+    ('create_log', legacy_create, current_create),
+    ('update_log', legacy_update, current_update),
+    ('register_user', legacy_register, current_register),
+]
+
+
+async def measure(session_factory, statements, operation, user_id, log_ids, iterations):
+    """Mean statements and milliseconds per call; one transaction per call, like a request."""
+    statements.clear()
+    started = time.perf_counter()
+    for number in range(iterations):
+        async with session_factory() as session:
+            await operation(session, user_id, number, log_ids[number % len(log_ids)])
+            await session.commit()
+    elapsed = time.perf_counter() - started
+    return {'statements_per_call': round(len(statements) / iterations, 2),
+            'mean_ms': round(elapsed / iterations * 1000, 3)}
+
+
+async def run(database_url, iterations, rtt_ms):
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    statements = []
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def count_round_trip(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+        if rtt_ms:
+            time.sleep(rtt_ms / 1000)
+
+    async with session_factory() as session:
+        owner = await UserRepository(db_session=session).create(
+            new_user(time.time_ns(), 'owner'), HASHED_PASSWORD)
+        logs = await WorkoutLogRepository(db_session=session).create_many([LOG_IN] * 50,
+                                                                          owner.id)
+        await session.commit()
+    log_ids = [log.id for log in logs]
+
+    print(f"{'operation':<15}{'before: stmts':>15}{'ms':>9}{'after: stmts':>15}{'ms':>9}")
+    for name, legacy, current in OPERATIONS:
+        before = await measure(session_factory, statements, legacy, owner.id, log_ids,
+                               iterations)
+        after = await measure(session_factory, statements, current, owner.id, log_ids,
+                              iterations)
+        print(f"{name:<15}{before['statements_per_call']:>15}{before['mean_ms']:>9}"
+              f"{after['statements_per_call']:>15}{after['mean_ms']:>9}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url',
+                        help="Database to benchmark against (default: a temporary SQLite file). "
+                             "Benchmark users and logs are left in it.")
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--rtt-ms', type=float, default=0.0,
+                        help="Simulated network round-trip time added to every statement.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='fitnessbud-writes-') as directory:
+        database_url = args.database_url or \
+            f"sqlite+aiosqlite:///{os.path.join(directory, 'writes.db')}"
+        asyncio.run(run(database_url, args.iterations, args.rtt_ms))
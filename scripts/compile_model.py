@@ -0,0 +1,20 @@
+import os
+import sys
+
+import joblib
+
+# Add the 'src' directory to the Python path so we can import modules from it
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.model_compiler import save_compiled_model, save_compiled_arrays
+from src.model_trainer import MODEL_FILE_PATH
+
+if __name__ == "__main__":
+    print(f"Compiling {MODEL_FILE_PATH} without retraining...")
+
+    # 1. Load the fitted pipeline
+    model_pipeline = joblib.load(MODEL_FILE_PATH)
+
+    # 2. Export the flat arrays (compressed, and memory-mappable)
+    arrays = save_compiled_model(model_pipeline)
+    save_compiled_arrays(arrays)
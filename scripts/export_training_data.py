@@ -0,0 +1,21 @@
+"""
+Exports workout_logs joined with users into partitioned columnar files for
+training. Re-running appends only the logs added since the last export:
+
+    python -m scripts.export_training_data
+    python -m scripts.export_training_data --rows-per-file 500000
+"""
+import argparse
+import asyncio
+
+from infrastructure.db import AsyncSessionLocal
+from src.training_export import EXPORT_DIRECTORY, ROWS_PER_FILE, export_training_data
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output-dir', default=EXPORT_DIRECTORY)
+    parser.add_argument('--rows-per-file', type=int, default=ROWS_PER_FILE)
+    args = parser.parse_args()
+
+    asyncio.run(export_training_data(AsyncSessionLocal, args.output_dir, args.rows_per_file))
@@ -0,0 +1,63 @@
+"""
+Generates synthetic users and workout logs with NumPy, in chunks of users.
+
+    python -m scripts.generate_data --output workouts.csv
+    python -m scripts.generate_data --force                  # replace the bundled CSV
+    python -m scripts.generate_data --users 200000 --partitions models/exports/synthetic
+    python -m scripts.generate_data --users 200000 --database # bulk-load DATABASE_URL
+
+The defaults (100 users x ~50 logs) match the size of the bundled CSV. The
+shipped models and the compiled-model parity tests are built from that CSV,
+so an existing --output file is only replaced with --force.
+"""
+import argparse
+import asyncio
+import os
+
+from src.data_generator import LOGS_PER_USER, USERS_PER_CHUNK, generate_chunks
+from src.data_generator import write_training_csv, write_training_partitions
+from src.data_loader import DATA_FILE_PATH
+
+
+async def seed(args):
+    from infrastructure.db import create_db_and_tables, engine
+    from src.db_seeder import seed_database
+
+    await create_db_and_tables()
+    await seed_database(engine, args.users, args.logs_per_user, args.seed,
+                        args.users_per_chunk)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--logs-per-user', type=float, default=LOGS_PER_USER,
+                        help="Mean number of logs per user (Poisson).")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--users-per-chunk', type=int, default=USERS_PER_CHUNK)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--output', default=DATA_FILE_PATH,
+                        help="CSV file to write (default: the bundled training CSV).")
+    target.add_argument('--partitions', help="Directory of columnar partitions to write.")
+    target.add_argument('--database', action='store_true',
+                        help="Bulk-load into DATABASE_URL instead of writing files.")
+    parser.add_argument('--force', action='store_true',
+                        help="Replace the --output CSV if it already exists.")
+    args = parser.parse_args()
+
+    writes_csv = not (args.database or args.partitions)
+    if writes_csv and os.path.exists(args.output) and not args.force:
+        parser.error(f"{args.output} already exists; pass --force to replace it or choose "
+                     f"another --output.")
+
+    if args.database:
+        asyncio.run(seed(args))
+    else:
+        chunks = generate_chunks(args.users, args.logs_per_user, args.seed,
+                                 users_per_chunk=args.users_per_chunk)
+        if args.partitions:
+            write_training_partitions(chunks, args.partitions)
+        else:
+            write_training_csv(chunks, args.output)
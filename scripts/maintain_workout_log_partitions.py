@@ -0,0 +1,52 @@
+"""
+Maintenance of the monthly workout_logs partitions (PostgreSQL, after
+migration 0003). Run it daily, e.g. from cron:
+
+- creates the partitions of the current and the next months, moving logs
+  already dated in them out of the default partition;
+- rolls months older than the retention window up into workout_summaries,
+  then detaches their partitions into the archive schema.
+
+A month that fails does not stop the others; the exit status is then 1.
+
+    python -m scripts.maintain_workout_log_partitions
+    python -m scripts.maintain_workout_log_partitions --dry-run
+    python -m scripts.maintain_workout_log_partitions --retention-months 36
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import sys
+
+from core.config import settings
+from infrastructure.db import AsyncSessionLocal, engine
+from infrastructure.workout_partitions import maintain_partitions
+
+
+async def run(args):
+    report = await maintain_partitions(
+        AsyncSessionLocal, datetime.date.today(), retention_months=args.retention_months,
+        ahead_months=args.ahead_months, archive_schema=args.archive_schema,
+        dry_run=args.dry_run
+    )
+    await engine.dispose()
+    if not report['partitioned']:
+        print("workout_logs is not partitioned (PostgreSQL only, see migration 0003).")
+    print(json.dumps(report, indent=2))
+    # Non-zero for cron: some month needs attention, the others were done
+    if report['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--retention-months', type=int,
+                        default=settings.WORKOUT_LOGS_RETENTION_MONTHS)
+    parser.add_argument('--ahead-months', type=int,
+                        default=settings.WORKOUT_LOGS_PARTITIONS_AHEAD)
+    parser.add_argument('--archive-schema', default=settings.WORKOUT_LOGS_ARCHIVE_SCHEMA)
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Only print the partitions that would be created and archived.")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,137 @@
+"""
+Measures per-worker memory of the two ways of launching several workers.
+
+  private: every worker starts its own interpreter and joblib-loads the
+           pipeline (what `uvicorn --workers N` does: workers are spawned).
+  shared:  the master preloads the memory-mapped model, freezes the GC and
+           forks the workers (what gunicorn.conf.py does).
+
+Reads /proc/<pid>/smaps_rollup, so it only runs on Linux:
+
+    python -m scripts.measure_worker_memory --workers 4 --output memory.json
+"""
+import argparse
+import gc
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+# Enough calls to touch every code path a real worker would
+WARMUP_PREDICTIONS = 1000
+
+PRIVATE_WORKER_CODE = f"""
+import sys, joblib
+from infrastructure.ml_adapter import MODEL_FILE_PATH, PipelineGoalModel
+model = PipelineGoalModel(joblib.load(MODEL_FILE_PATH))
+for i in range({WARMUP_PREDICTIONS}):
+    model.predict_one('Deadlift', 'barbell', 'high', 10 + i % 120, 2.0 + i % 25)
+print('ready', flush=True)
+sys.stdin.read()
+"""
+
+
+def read_memory_kb(pid):
+    """Returns Rss, Pss and Uss (private clean + dirty) of a process, in kB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss_kb': fields['Rss'],
+        'pss_kb': fields['Pss'],
+        'uss_kb': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
+
+
+def summarize(mode, samples, master=None):
+    count = len(samples)
+    summary = {
+        'mode': mode,
+        'workers': count,
+        'mean_rss_mb': round(sum(s['rss_kb'] for s in samples) / count / 1024, 1),
+        'mean_pss_mb': round(sum(s['pss_kb'] for s in samples) / count / 1024, 1),
+        'mean_uss_mb': round(sum(s['uss_kb'] for s in samples) / count / 1024, 1),
+        'total_pss_mb': round(sum(s['pss_kb'] for s in samples) / 1024, 1),
+    }
+    if master is not None:
+        # The preloading master holds the shared pages; count it in the total
+        summary['master_pss_mb'] = round(master['pss_kb'] / 1024, 1)
+        summary['total_pss_mb'] = round(summary['total_pss_mb'] + summary['master_pss_mb'], 1)
+    return summary
+
+
+def measure_private(workers):
+    """Spawns independent interpreters, each loading its own pipeline."""
+    processes = [
+        subprocess.Popen([sys.executable, '-c', PRIVATE_WORKER_CODE],
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    try:
+        for process in processes:
+            process.stdout.readline()
+        return [read_memory_kb(process.pid) for process in processes]
+    finally:
+        for process in processes:
+            process.kill()
+            process.wait()
+
+
+def measure_shared(workers):
+    """Preloads in this process, then forks workers that share its pages."""
+    from infrastructure.ml_adapter import load_model, predict_goal, PREDICTION_CACHE
+
+    load_model()
+    gc.freeze()
+
+    pids, ready_pipes = [], []
+    for _ in range(workers):
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            for i in range(WARMUP_PREDICTIONS):
+                predict_goal('Deadlift', 'barbell', 'high', 10 + i % 120, 2.0 + i % 25)
+                PREDICTION_CACHE.clear()
+            os.write(write_end, b'ready')
+            signal.pause()
+            os._exit(0)
+        os.close(write_end)
+        pids.append(pid)
+        ready_pipes.append(read_end)
+
+    try:
+        for read_end in ready_pipes:
+            os.read(read_end, 5)
+            os.close(read_end)
+        # Let the kernel settle copy-on-write faults from the warm-up
+        time.sleep(0.5)
+        return [read_memory_kb(pid) for pid in pids], read_memory_kb(os.getpid())
+    finally:
+        for pid in pids:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--output', help="Write the JSON results to this file.")
+    args = parser.parse_args()
+
+    results = [
+        summarize('private', measure_private(args.workers)),
+        summarize('shared', *measure_shared(args.workers)),
+    ]
+
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(report + '\n')
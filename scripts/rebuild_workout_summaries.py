@@ -0,0 +1,35 @@
+"""
+Recomputes workout_summaries (weekly and monthly totals) from workout_logs.
+Run it once after the migration that adds the table, or to repair the totals
+of one user. Totals of archived months (see maintain_workout_log_partitions)
+are kept: their raw logs are no longer online.
+
+    python -m scripts.rebuild_workout_summaries
+    python -m scripts.rebuild_workout_summaries --user-id 42
+"""
+import argparse
+import asyncio
+
+from infrastructure.db import AsyncSessionLocal, engine
+from infrastructure.workout_log_repository import WorkoutSummaryRepository
+from infrastructure.workout_partitions import WorkoutLogPartitionRepository
+
+
+async def rebuild(user_id):
+    # One transaction: readers see the old totals until the new ones are complete
+    async with AsyncSessionLocal() as session:
+        archived_until = await WorkoutLogPartitionRepository(db_session=session).archived_until()
+        await WorkoutSummaryRepository(db_session=session).rebuild(user_id=user_id,
+                                                                   date_from=archived_until)
+        await session.commit()
+    await engine.dispose()
+    print(f"Rebuilt workout summaries for {'user ' + str(user_id) if user_id else 'all users'}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--user-id', type=int, help="Only this user (default: everyone)")
+    args = parser.parse_args()
+
+    asyncio.run(rebuild(args.user_id))
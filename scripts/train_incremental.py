@@ -0,0 +1,28 @@
+"""
+Updates the Goal Prediction model with the workout logs recorded since the last
+run and publishes it as a new registry version:
+
+    python -m scripts.train_incremental
+    python -m scripts.train_incremental --routing-weight 0.1   # canary
+"""
+import argparse
+import asyncio
+
+from infrastructure.db import AsyncSessionLocal
+from src.incremental_trainer import BATCH_SIZE, train_incremental
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--version', help="Registry version name (default: timestamp).")
+    parser.add_argument('--routing-weight', type=float,
+                        help="Add the version alongside the current ones with this weight.")
+    parser.add_argument('--no-publish', action='store_true',
+                        help="Update the checkpoint without registering a version.")
+    args = parser.parse_args()
+
+    checkpoint = asyncio.run(train_incremental(
+        AsyncSessionLocal, batch_size=args.batch_size, publish=not args.no_publish,
+        version=args.version, routing_weight=args.routing_weight))
+    print(checkpoint)
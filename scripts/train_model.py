@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 
@@ -6,13 +7,42 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 # Import the refactored functions
 from src.data_loader import load_and_prepare_data_for_goal_prediction
-from src.model_trainer import train_and_save_model
+from src.model_trainer import search_and_save_model, train_and_save_model
+from src.segmented_trainer import MIN_SEGMENT_ROWS, train_segmented_model
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the Goal Prediction model.")
+    parser.add_argument('--search', choices=['grid', 'random'],
+                        help="Cross-validated hyperparameter search instead of a single fit.")
+    parser.add_argument('--n-iter', type=int, default=30,
+                        help="Candidates sampled by --search random (default 30).")
+    parser.add_argument('--folds', type=int, default=5, help="Cross-validation folds.")
+    parser.add_argument('--n-jobs', type=int, default=-1,
+                        help="Parallel workers for the search (default: all cores).")
+    parser.add_argument('--segment-by', choices=['equipment', 'workout_type'],
+                        help="Fit one model per value of this feature in a process pool.")
+    parser.add_argument('--min-segment-rows', type=int, default=MIN_SEGMENT_ROWS,
+                        help="Smaller segments are served by the all-rows fallback model.")
+    parser.add_argument('--version', help="Registry version name (default: timestamp).")
+    parser.add_argument('--routing-weight', type=float,
+                        help="Add the version alongside the current ones with this weight.")
+    args = parser.parse_args()
+
     print("Starting model training using modular architecture...")
 
     # 1. Load Data
     features, target = load_and_prepare_data_for_goal_prediction()
 
     # 2. Train and Save Model
-    train_and_save_model(features, target)
\ No newline at end of file
+    if args.segment_by:
+        train_segmented_model(features, target, segment_feature=args.segment_by,
+                              min_segment_rows=args.min_segment_rows,
+                              max_workers=None if args.n_jobs == -1 else args.n_jobs,
+                              version=args.version, routing_weight=args.routing_weight)
+    elif args.search:
+        search_and_save_model(features, target, mode=args.search, n_iter=args.n_iter,
+                              folds=args.folds, n_jobs=args.n_jobs, version=args.version,
+                              routing_weight=args.routing_weight)
+    else:
+        train_and_save_model(features, target, version=args.version,
+                             routing_weight=args.routing_weight)
@@ -0,0 +1,202 @@
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.data_loader import DATA_FILE_PATH, columnar_extension, write_frame
+
+# Conditional distributions measured on the original 5,000-row synthetic sample
+GOAL_SHARES = {'lose_weight': 0.39, 'gain_muscle': 0.27, 'increase_stamina': 0.22,
+               'rehabilitation': 0.12}
+
+EQUIPMENT_BY_GOAL = {
+    'gain_muscle': {'barbell': 0.22, 'full_gym': 0.19, 'exercise_bands': 0.15,
+                    'bodyweight_only': 0.15, 'kettlebells': 0.11, 'yoga_mat': 0.11,
+                    'home_weights': 0.04, 'dumbbells': 0.04},
+    'increase_stamina': {'exercise_bands': 0.23, 'dumbbells': 0.18, 'home_weights': 0.14,
+                         'kettlebells': 0.14, 'barbell': 0.14, 'full_gym': 0.09,
+                         'bodyweight_only': 0.05, 'yoga_mat': 0.05},
+    'lose_weight': {'full_gym': 0.23, 'home_weights': 0.15, 'barbell': 0.15,
+                    'exercise_bands': 0.13, 'dumbbells': 0.13, 'kettlebells': 0.10,
+                    'yoga_mat': 0.05, 'bodyweight_only': 0.05},
+    'rehabilitation': {'barbell': 0.33, 'home_weights': 0.17, 'dumbbells': 0.17,
+                       'kettlebells': 0.08, 'yoga_mat': 0.08, 'full_gym': 0.08,
+                       'exercise_bands': 0.08},
+}
+
+WORKOUT_TYPES_BY_GOAL = {
+    'gain_muscle': {'Bodyweight Squat': 0.195, 'Pushups': 0.168, 'Lunge': 0.101,
+                    'Barbell Squat': 0.093, 'Deadlift': 0.076, 'Bicep Curl': 0.069,
+                    'HIIT Sprints': 0.068, 'Bench Press': 0.064, 'Overhead Press': 0.062,
+                    'Dumbbell Lateral Raise': 0.039, 'Tricep Pushdown': 0.039,
+                    'Leg Press': 0.021, 'Cable Row': 0.007},
+    'increase_stamina': {'Pushups': 0.295, 'Bodyweight Squat': 0.285, 'Elliptical': 0.21,
+                         'Rowing Machine': 0.093, 'Treadmill Run': 0.065,
+                         'HIIT Sprints': 0.051},
+    'lose_weight': {'Bodyweight Squat': 0.222, 'Pushups': 0.21, 'HIIT Sprints': 0.151,
+                    'Elliptical': 0.146, 'Treadmill Run': 0.074, 'Barbell Squat': 0.054,
+                    'Deadlift': 0.053, 'Rowing Machine': 0.047, 'Leg Press': 0.043},
+    'rehabilitation': {'Yoga Flow': 0.342, 'Plank': 0.258, 'Bodyweight Squat': 0.257,
+                       'Foam Rolling': 0.08, 'Meditation': 0.063},
+}
+
+INTENSITY_BY_GOAL = {
+    'gain_muscle': {'high': 0.419, 'moderate': 0.385, 'low': 0.147, 'very_low': 0.049},
+    'increase_stamina': {'moderate': 0.405, 'high': 0.40, 'low': 0.149, 'very_low': 0.046},
+    'lose_weight': {'high': 0.403, 'moderate': 0.397, 'low': 0.158, 'very_low': 0.042},
+    'rehabilitation': {'low': 0.505, 'very_low': 0.28, 'moderate': 0.163, 'high': 0.052},
+}
+
+# Calories burned per minute: (mean, std, min, max), by intensity
+CALORIE_RATE_BY_INTENSITY = {
+    'very_low': (0.053, 0.018, 0.015, 0.09),
+    'low': (0.076, 0.024, 0.02, 0.12),
+    'moderate': (0.108, 0.024, 0.025, 0.15),
+    'high': (0.131, 0.026, 0.03, 0.18),
+}
+
+AGE_RANGE = (20, 50)
+DURATION_RANGE = (30, 120)
+LOGS_PER_USER = 50
+# Users generated per chunk; bounds memory for runs of any size
+USERS_PER_CHUNK = 100_000
+# Workout dates fall in the year before this day
+LAST_WORKOUT_DATE = datetime.date(2025, 11, 1)
+
+GOALS = list(GOAL_SHARES)
+EQUIPMENT = sorted({name for shares in EQUIPMENT_BY_GOAL.values() for name in shares})
+WORKOUT_TYPES = sorted({name for shares in WORKOUT_TYPES_BY_GOAL.values() for name in shares})
+INTENSITIES = list(CALORIE_RATE_BY_INTENSITY)
+
+CSV_COLUMNS = ['user_id', 'workout_type', 'intensity', 'duration_min', 'calories_burned',
+               'age', 'goal', 'equipment']
+
+
+def _probabilities(shares, categories):
+    """Probability vector over `categories` (normalized; missing names get 0)."""
+    weights = np.array([shares.get(name, 0.0) for name in categories])
+    return weights / weights.sum()
+
+
+def _conditional_codes(rng, condition_codes, table, categories):
+    """
+    Draws one category code per row, given each row's goal code. One vectorized
+    draw per goal instead of a Python call per row.
+    """
+    codes = np.empty(len(condition_codes), dtype=np.int16)
+    for goal_code, goal in enumerate(GOALS):
+        rows = np.flatnonzero(condition_codes == goal_code)
+        codes[rows] = rng.choice(len(categories), size=len(rows),
+                                 p=_probabilities(table[goal], categories))
+    return codes
+
+
+def _categorical(codes, categories):
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def generate_users(rng, count, first_id=1):
+    """Users with age, goal and goal-dependent equipment, like orm_models.User."""
+    goal_codes = rng.choice(len(GOALS), size=count, p=_probabilities(GOAL_SHARES, GOALS))
+    equipment_codes = _conditional_codes(rng, goal_codes, EQUIPMENT_BY_GOAL, EQUIPMENT)
+    return pd.DataFrame({
+        'id': np.arange(first_id, first_id + count, dtype=np.int64),
+        'age': rng.integers(*AGE_RANGE, size=count, dtype=np.int16),
+        'goal': _categorical(goal_codes, GOALS),
+        'equipment': _categorical(equipment_codes, EQUIPMENT),
+    })
+
+
+def generate_workout_logs(rng, users, logs_per_user=LOGS_PER_USER, first_id=1):
+    """
+    Workout logs for `users`, like orm_models.WorkoutLog. The number of logs per
+    user is Poisson distributed; workout type and intensity depend on the
+    user's goal and calories on duration and intensity.
+    """
+    counts = np.maximum(rng.poisson(logs_per_user, size=len(users)), 1)
+    user_rows = np.repeat(np.arange(len(users)), counts)
+    total = len(user_rows)
+
+    goal_codes = users['goal'].cat.codes.to_numpy()[user_rows]
+    workout_codes = _conditional_codes(rng, goal_codes, WORKOUT_TYPES_BY_GOAL, WORKOUT_TYPES)
+    intensity_codes = _conditional_codes(rng, goal_codes, INTENSITY_BY_GOAL, INTENSITIES)
+
+    duration = rng.integers(*DURATION_RANGE, size=total, dtype=np.int16)
+    mean, std, low, high = (np.array(values) for values in
+                            zip(*CALORIE_RATE_BY_INTENSITY.values()))
+    rate = np.clip(rng.normal(mean[intensity_codes], std[intensity_codes]),
+                   low[intensity_codes], high[intensity_codes])
+
+    days_ago = rng.integers(0, 365, size=total)
+    workout_date = np.datetime64(LAST_WORKOUT_DATE) - days_ago.astype('timedelta64[D]')
+
+    return pd.DataFrame({
+        'id': np.arange(first_id, first_id + total, dtype=np.int64),
+        'user_id': users['id'].to_numpy()[user_rows],
+        'workout_date': workout_date,
+        'workout_type': _categorical(workout_codes, WORKOUT_TYPES),
+        'intensity': _categorical(intensity_codes, INTENSITIES),
+        'duration_min': duration,
+        'calories_burned': np.round(duration * rate, 2).astype(np.float32),
+    })
+
+
+def generate_chunks(user_count, logs_per_user=LOGS_PER_USER, seed=42, first_user_id=1,
+                    first_log_id=1, users_per_chunk=USERS_PER_CHUNK):
+    """
+    Yields (users, logs) frames covering `user_count` users, a chunk at a time.
+    Ids continue across chunks, so the chunks can be loaded side by side.
+    """
+    rng = np.random.default_rng(seed)
+    user_id, log_id = first_user_id, first_log_id
+    remaining = user_count
+    while remaining > 0:
+        count = min(users_per_chunk, remaining)
+        users = generate_users(rng, count, user_id)
+        logs = generate_workout_logs(rng, users, logs_per_user, log_id)
+        yield users, logs
+
+        user_id += count
+        log_id += len(logs)
+        remaining -= count
+
+
+def to_training_frame(users, logs):
+    """Logs joined with their user's profile, in the training CSV's columns."""
+    profile = users.set_index('id').loc[logs['user_id'], ['age', 'goal', 'equipment']]
+    training = logs[['id', 'user_id', 'workout_type', 'intensity', 'duration_min',
+                     'calories_burned']].reset_index(drop=True)
+    return pd.concat([training, profile.reset_index(drop=True)], axis=1)
+
+
+def write_training_csv(chunks, file_path=DATA_FILE_PATH):
+    """Appends every chunk to one CSV with the columns src/data_loader.py reads."""
+    rows = 0
+    temp_path = f"{file_path}.tmp"
+    for index, (users, logs) in enumerate(chunks):
+        training = to_training_frame(users, logs)
+        training[CSV_COLUMNS].to_csv(temp_path, mode='w' if index == 0 else 'a',
+                                     header=index == 0, index=False)
+        rows += len(training)
+    os.replace(temp_path, file_path)
+    print(f"💾 Wrote {rows} workout logs to {file_path}")
+    return rows
+
+
+def write_training_partitions(chunks, directory):
+    """
+    Writes one columnar partition per chunk, named like the database export
+    (src/training_export.py), so src/data_loader.load_exported_data reads both.
+    """
+    os.makedirs(directory, exist_ok=True)
+    extension = columnar_extension()
+    rows = 0
+    for users, logs in chunks:
+        training = to_training_frame(users, logs)
+        first_id, last_id = training['id'].iloc[0], training['id'].iloc[-1]
+        write_frame(training, os.path.join(directory,
+                                           f"part-{first_id:012d}-{last_id:012d}{extension}"))
+        rows += len(training)
+    print(f"💾 Wrote {rows} workout logs to {directory}")
+    return rows
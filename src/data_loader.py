@@ -1,34 +1,215 @@
-import pandas as pd
+import json
 import os
 
+import pandas as pd
+from pandas.api.types import union_categoricals
+
 DATA_FILE_PATH = 'models/synthetic_workout_data.csv'
 
+# Rows parsed per read_csv chunk; bounds peak memory while streaming large CSVs
+CHUNK_SIZE = 1_000_000
+
+# Bump when the prepared frame's columns or dtypes change, so old caches are rebuilt
+CACHE_FORMAT_VERSION = 1
+
+# Only the columns the Goal Prediction model needs, in compact dtypes
+COLUMN_DTYPES = {
+    'workout_type': 'category',
+    'equipment': 'category',
+    'intensity': 'category',
+    'duration_min': 'int16',
+    'calories_burned': 'float32',
+    'goal': 'category',
+}
+
+# Ordinal encoding for intensity (Must match the training logic)
+INTENSITY_MAP = {'very_low': 1, 'low': 2, 'moderate': 3, 'high': 4}
+
+# Free-text spellings accepted by the workout log API (matched after lowercasing)
+INTENSITY_ALIASES = {'medium': 'moderate', 'very low': 'very_low'}
+
+# Column order of the prepared frame
+PREPARED_COLUMNS = ['workout_type', 'equipment', 'duration_min', 'calories_burned',
+                    'intensity_numeric', 'goal']
+
+
+def columnar_extension():
+    """Parquet when pyarrow is installed, otherwise pandas' own pickle format."""
+    try:
+        import pyarrow  # noqa: F401
+        return '.parquet'
+    except ImportError:
+        return '.pkl'
+
+
+def write_frame(data_frame, file_path):
+    """Writes a frame in the format its extension names, replacing the file atomically."""
+    temp_path = f"{file_path}.tmp"
+    if file_path.endswith('.parquet'):
+        data_frame.to_parquet(temp_path, index=False)
+    else:
+        data_frame.to_pickle(temp_path)
+    os.replace(temp_path, file_path)
+
+
+def read_frame(file_path):
+    if file_path.endswith('.parquet'):
+        return pd.read_parquet(file_path)
+    return pd.read_pickle(file_path)
+
 
-def load_and_prepare_data_for_goal_prediction():
+def default_cache_path(data_file_path, extension=None):
+    return os.path.splitext(data_file_path)[0] + (extension or columnar_extension())
+
+
+def _source_fingerprint(data_file_path):
+    """Identifies one version of the CSV without reading it."""
+    stat = os.stat(data_file_path)
+    return {
+        'source': os.path.abspath(data_file_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'cache_format_version': CACHE_FORMAT_VERSION,
+    }
+
+
+def normalize_intensity(intensity):
     """
-    Loads the synthetic data and prepares features and target specifically
-    for the Goal Prediction model (Workout Log -> User Goal).
+    Logged intensity labels as INTENSITY_MAP levels: trimmed, lowercased and
+    with the aliases resolved. Shared by batch and incremental training, so
+    both see the same rows; labels still not in INTENSITY_MAP are left as is.
+    """
+    return intensity.astype('string').str.strip().str.lower().replace(INTENSITY_ALIASES)
 
-    Features: ['workout_type', 'equipment', 'intensity', 'duration_min', 'calories_burned']
-    Target: ['goal']
+
+def _prepare_chunk(chunk):
+    """Replaces the intensity labels with their ordinal encoding."""
+    chunk['intensity_numeric'] = chunk['intensity'].map(INTENSITY_MAP).astype('float32')
+    if not chunk['intensity_numeric'].isna().any():
+        chunk['intensity_numeric'] = chunk['intensity_numeric'].astype('int8')
+    return chunk[PREPARED_COLUMNS]
+
+
+def _concat_chunks(chunks):
+    """
+    Concatenates chunks without falling back to object dtype: each chunk has its
+    own category set, so categorical columns are merged with union_categoricals
+    (sorted, like the categories read_csv infers for a single chunk).
     """
-    if not os.path.exists(DATA_FILE_PATH):
+    if len(chunks) == 1:
+        return chunks[0]
+
+    columns = {}
+    for name in chunks[0].columns:
+        if isinstance(chunks[0][name].dtype, pd.CategoricalDtype):
+            columns[name] = union_categoricals([chunk[name] for chunk in chunks],
+                                               sort_categories=True)
+        else:
+            columns[name] = pd.concat([chunk[name] for chunk in chunks], ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def read_workout_csv(data_file_path=DATA_FILE_PATH, chunk_size=CHUNK_SIZE):
+    """Streams the CSV in chunks, keeping only the model columns in compact dtypes."""
+    reader = pd.read_csv(data_file_path, usecols=list(COLUMN_DTYPES), dtype=COLUMN_DTYPES,
+                         chunksize=chunk_size)
+    chunks = [_prepare_chunk(chunk) for chunk in reader]
+    if not chunks:
+        raise ValueError(f"Data file {data_file_path} contains no rows.")
+    return _concat_chunks(chunks)
+
+
+def _read_cache(cache_file_path, fingerprint):
+    """The cached frame; None when it is missing, stale or unreadable (then rebuilt)."""
+    try:
+        with open(f"{cache_file_path}.json") as metadata_file:
+            if json.load(metadata_file) != fingerprint:
+                return None
+        return read_frame(cache_file_path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Truncated or corrupt file (pickle, parquet or metadata): the CSV is the source
+        print(f"⚠️ Ignoring unreadable training data cache {cache_file_path}: {e!r}")
+        return None
+
+
+def _write_cache(data_frame, cache_file_path, fingerprint):
+    """Writes the frame, then its fingerprint; both replaced atomically."""
+    write_frame(data_frame, cache_file_path)
+
+    with open(f"{cache_file_path}.json.tmp", 'w') as metadata_file:
+        json.dump(fingerprint, metadata_file)
+    os.replace(f"{cache_file_path}.json.tmp", f"{cache_file_path}.json")
+
+
+def load_workout_data(data_file_path=DATA_FILE_PATH, cache_file_path=None, use_cache=True,
+                      chunk_size=CHUNK_SIZE):
+    """
+    Returns the prepared training frame (features plus 'goal').
+    The first run parses the CSV and writes a columnar cache next to it; later
+    runs read the cache as long as the CSV's size and modification time match.
+    """
+    if not os.path.exists(data_file_path):
         raise FileNotFoundError(
-            f"Data file not found at {DATA_FILE_PATH}. Please run generate_data.py first."
+            f"Data file not found at {data_file_path}. Please run `python -m scripts.generate_data` first."
         )
 
-    data_frame = pd.read_csv(DATA_FILE_PATH)
+    if not use_cache:
+        return read_workout_csv(data_file_path, chunk_size)
 
-    # 1. Define Target and Features
-    target_variable = data_frame['goal']
+    cache_file_path = cache_file_path or default_cache_path(data_file_path)
+    fingerprint = _source_fingerprint(data_file_path)
+
+    data_frame = _read_cache(cache_file_path, fingerprint)
+    if data_frame is not None:
+        print(f"📦 Loaded training data from cache {cache_file_path}")
+        return data_frame
+
+    data_frame = read_workout_csv(data_file_path, chunk_size)
+    _write_cache(data_frame, cache_file_path, fingerprint)
+    print(f"💾 Training data cache written to {cache_file_path}")
+    return data_frame
 
-    all_features = data_frame[
-        ['workout_type', 'equipment', 'intensity', 'duration_min', 'calories_burned']
-    ].copy()
 
-    # 2. Ordinally encode intensity (Must match the training logic)
-    intensity_map = {'very_low': 1, 'low': 2, 'moderate': 3, 'high': 4}
-    all_features['intensity_numeric'] = all_features['intensity'].map(intensity_map)
-    all_features = all_features.drop(columns=['intensity'])
+def load_exported_data(directory):
+    """
+    Reads the partitions written by src/training_export.py into the prepared
+    training frame, one partition at a time. Intensities are normalized like
+    in incremental training; rows whose intensity is still not one of
+    INTENSITY_MAP's levels cannot be encoded and are dropped (and counted).
+    """
+    file_names = sorted(name for name in os.listdir(directory)
+                        if name.startswith('part-') and name.endswith(('.parquet', '.pkl')))
+    if not file_names:
+        raise FileNotFoundError(f"No exported partitions found in {directory}.")
+
+    chunks, dropped = [], 0
+    for file_name in file_names:
+        partition = read_frame(os.path.join(directory, file_name))
+        partition['intensity'] = normalize_intensity(partition['intensity'])
+        encodable = partition['intensity'].isin(list(INTENSITY_MAP))
+        dropped += int((~encodable).sum())
+        partition = partition[encodable.to_numpy()]
+        chunks.append(_prepare_chunk(partition[list(COLUMN_DTYPES)].astype(COLUMN_DTYPES)))
+    if dropped:
+        print(f"⚠️ Dropped {dropped} exported rows with an intensity outside "
+              f"{list(INTENSITY_MAP)}.")
+    return _concat_chunks(chunks)
+
+
+def load_and_prepare_data_for_goal_prediction(data_file_path=DATA_FILE_PATH, use_cache=True):
+    """
+    Loads the synthetic data and prepares features and target specifically
+    for the Goal Prediction model (Workout Log -> User Goal).
+
+    Features: ['workout_type', 'equipment', 'intensity', 'duration_min', 'calories_burned']
+    Target: ['goal']
+    """
+    data_frame = load_workout_data(data_file_path, use_cache=use_cache)
+
+    # 1. Define Target and Features (intensity is already ordinally encoded)
+    target_variable = data_frame['goal']
+    all_features = data_frame.drop(columns=['goal'])
 
-    return all_features, target_variable
\ No newline at end of file
+    return all_features, target_variable
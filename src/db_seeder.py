@@ -0,0 +1,113 @@
+import datetime
+import time
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.auth_service import hash_password
+from infrastructure.models import User, WorkoutLog
+from infrastructure.workout_log_repository import WorkoutSummaryRepository
+from src.data_generator import LOGS_PER_USER, USERS_PER_CHUNK, generate_chunks
+
+# Every seeded user logs in with this password; hashed once, not once per user
+SEED_PASSWORD = 'loadtest-password'
+
+USER_COLUMNS = ['id', 'email', 'hashed_password', 'is_active', 'age', 'goal', 'equipment',
+                'created_at', 'updated_at']
+LOG_COLUMNS = ['id', 'user_id', 'workout_date', 'duration_min', 'intensity', 'workout_type',
+               'calories_burned', 'created_at', 'updated_at']
+
+
+def user_records(users, hashed_password, now):
+    """Rows for the users table as tuples of plain Python values, in USER_COLUMNS order."""
+    ids = users['id'].tolist()
+    return list(zip(
+        ids,
+        [f"loadtest-{user_id}@example.com" for user_id in ids],
+        [hashed_password] * len(ids),
+        [True] * len(ids),
+        users['age'].tolist(),
+        users['goal'].tolist(),
+        users['equipment'].tolist(),
+        [now] * len(ids),
+        [now] * len(ids),
+    ))
+
+
+def log_records(logs, now):
+    """Rows for the workout_logs table, in LOG_COLUMNS order."""
+    return list(zip(
+        logs['id'].tolist(),
+        logs['user_id'].tolist(),
+        logs['workout_date'].dt.date.tolist(),
+        logs['duration_min'].tolist(),
+        logs['intensity'].tolist(),
+        logs['workout_type'].tolist(),
+        logs['calories_burned'].astype('float64').round(2).tolist(),
+        [now] * len(logs),
+        [now] * len(logs),
+    ))
+
+
+async def _copy_records(conn, table, columns, records):
+    """Postgres COPY through the asyncpg connection underneath SQLAlchemy."""
+    raw_connection = await conn.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name, records=records, columns=columns)
+
+
+async def _insert_records(conn, table, columns, records):
+    """One executemany INSERT for every other database (e.g. SQLite in tests)."""
+    await conn.execute(insert(table), [dict(zip(columns, record)) for record in records])
+
+
+async def _next_ids(conn):
+    user_id = await conn.scalar(select(func.coalesce(func.max(User.id), 0)))
+    log_id = await conn.scalar(select(func.coalesce(func.max(WorkoutLog.id), 0)))
+    return user_id + 1, log_id + 1
+
+
+async def seed_database(engine, user_count, logs_per_user=LOGS_PER_USER, seed=42,
+                        users_per_chunk=USERS_PER_CHUNK):
+    """
+    Generates users and workout logs and bulk-loads them, one transaction per
+    chunk: COPY on PostgreSQL, executemany elsewhere. Each chunk's workout
+    summaries are built in its transaction. Ids continue after the rows
+    already in the tables, and the id sequences are moved past them.
+    Returns (users, logs) inserted.
+    """
+    hashed_password = hash_password(SEED_PASSWORD)
+    now = datetime.datetime.now(datetime.UTC)
+
+    async with engine.begin() as conn:
+        first_user_id, first_log_id = await _next_ids(conn)
+    load = _copy_records if engine.dialect.name == 'postgresql' else _insert_records
+
+    started = time.perf_counter()
+    seeded_users = seeded_logs = 0
+    for users, logs in generate_chunks(user_count, logs_per_user, seed, first_user_id,
+                                       first_log_id, users_per_chunk):
+        async with engine.begin() as conn:
+            await load(conn, User.__table__, USER_COLUMNS,
+                       user_records(users, hashed_password, now))
+            await load(conn, WorkoutLog.__table__, LOG_COLUMNS, log_records(logs, now))
+            # /v1/workout_logs/stats reads only workout_summaries: fill in the chunk's
+            # buckets in the same transaction (the session joins it, no commit)
+            async with AsyncSession(bind=conn) as session:
+                await WorkoutSummaryRepository(db_session=session).rebuild(
+                    user_id_range=(int(users['id'].min()), int(users['id'].max()) + 1))
+        seeded_users += len(users)
+        seeded_logs += len(logs)
+        print(f"   {seeded_users} users / {seeded_logs} logs "
+              f"({time.perf_counter() - started:.1f}s)")
+
+    if engine.dialect.name == 'postgresql':
+        async with engine.begin() as conn:
+            for table in ('users', 'workout_logs'):
+                await conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT max(id) FROM {table}))"))
+
+    print(f"💾 Seeded {seeded_users} users and {seeded_logs} workout logs "
+          f"in {time.perf_counter() - started:.1f}s")
+    return seeded_users, seeded_logs
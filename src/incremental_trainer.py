@@ -0,0 +1,156 @@
+import os
+from datetime import datetime, timezone
+
+import joblib
+import pandas as pd
+from sqlalchemy import select
+
+from infrastructure.incremental_model import (CATEGORICAL_FEATURES, NUMERICAL_FEATURES,
+                                              IncrementalGoalModel)
+from infrastructure.models import User, WorkoutLog
+from src.data_loader import INTENSITY_MAP, normalize_intensity
+from src.model_registry import REGISTRY_FILE_PATH, register_model_version, version_directory
+
+# Model state and checkpoint of the incremental job, kept in one file so they never disagree
+INCREMENTAL_STATE_FILE_PATH = 'models/incremental_state.joblib'
+
+# Rows fetched per round trip and per partial_fit call
+BATCH_SIZE = 10_000
+
+# Labels the classifier knows; partial_fit needs the full set up front
+GOAL_CLASSES = ['gain_muscle', 'increase_stamina', 'lose_weight', 'rehabilitation']
+
+LOG_COLUMNS = ['id', 'workout_type', 'equipment', 'intensity', 'duration_min',
+               'calories_burned', 'goal']
+
+
+def load_state(file_path=INCREMENTAL_STATE_FILE_PATH):
+    """Returns (model, checkpoint); a fresh model and checkpoint on the first run."""
+    if os.path.exists(file_path):
+        state = joblib.load(file_path)
+        return state['model'], state['checkpoint']
+
+    checkpoint = {'last_log_id': 0, 'rows_trained': 0, 'rows_skipped': 0,
+                  'rows_evaluated': 0, 'rows_correct': 0, 'updated_at': None}
+    return IncrementalGoalModel(GOAL_CLASSES), checkpoint
+
+
+def save_state(model, checkpoint, file_path=INCREMENTAL_STATE_FILE_PATH):
+    """Writes model and checkpoint atomically, so an interrupted run resumes cleanly."""
+    checkpoint['updated_at'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    temp_path = f"{file_path}.tmp"
+    joblib.dump({'model': model, 'checkpoint': checkpoint}, temp_path)
+    os.replace(temp_path, file_path)
+
+
+def new_logs_query(last_log_id):
+    """Logs after the checkpoint joined with their user's goal and equipment, in id order."""
+    return (
+        select(WorkoutLog.id, WorkoutLog.workout_type, User.equipment, WorkoutLog.intensity,
+               WorkoutLog.duration_min, WorkoutLog.calories_burned, User.goal)
+        .join(User, WorkoutLog.user_id == User.id)
+        .where(WorkoutLog.id > last_log_id)
+        .order_by(WorkoutLog.id)
+    )
+
+
+def prepare_batch(rows):
+    """
+    Turns fetched rows into model features and targets.
+    Rows with an intensity or goal the model cannot use are dropped and counted.
+    """
+    data_frame = pd.DataFrame.from_records(rows, columns=LOG_COLUMNS)
+
+    intensity = normalize_intensity(data_frame['intensity'])
+    data_frame['intensity_numeric'] = intensity.map(INTENSITY_MAP)
+    data_frame['calories_burned'] = data_frame['calories_burned'].fillna(0.0)
+
+    usable = data_frame['intensity_numeric'].notna() & data_frame['goal'].isin(GOAL_CLASSES)
+    data_frame = data_frame[usable]
+
+    features = data_frame[CATEGORICAL_FEATURES + NUMERICAL_FEATURES]
+    return features, data_frame['goal'], int((~usable).sum())
+
+
+async def stream_new_logs(session, last_log_id, batch_size=BATCH_SIZE):
+    """
+    Yields lists of rows newer than last_log_id. The query runs on a server-side
+    cursor (yield_per), so memory stays bounded by one batch.
+    """
+    statement = new_logs_query(last_log_id).execution_options(yield_per=batch_size)
+    result = await session.stream(statement)
+    async for partition in result.partitions(batch_size):
+        yield partition
+
+
+def publish_model(model, checkpoint, version=None, routing_weight=None,
+                  registry_file_path=REGISTRY_FILE_PATH):
+    """
+    Saves the model as a new registry version. Serving processes pick it up
+    through the registry watcher and serve it with PipelineGoalModel.
+    """
+    version = version or datetime.now(timezone.utc).strftime('goal-incremental-%Y%m%d%H%M%S')
+    pipeline_path = os.path.join(version_directory(version), 'pipeline.joblib')
+    joblib.dump(model, pipeline_path)
+
+    evaluated = checkpoint['rows_evaluated']
+    metadata = {
+        'pipeline_path': pipeline_path,
+        'trained_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        # Progressive validation: every batch is scored before it is trained on
+        'accuracy': round(checkpoint['rows_correct'] / evaluated, 4) if evaluated else None,
+        'training_rows': checkpoint['rows_trained'],
+        'last_log_id': checkpoint['last_log_id'],
+        'incremental': True,
+        'feature_schema': {
+            'numerical_features': NUMERICAL_FEATURES,
+            'categorical_features': CATEGORICAL_FEATURES,
+            'target': 'goal',
+            'classes': GOAL_CLASSES,
+        },
+    }
+    register_model_version(version, metadata, routing_weight=routing_weight,
+                           file_path=registry_file_path)
+    return version
+
+
+async def train_incremental(session_factory, state_file_path=INCREMENTAL_STATE_FILE_PATH,
+                            batch_size=BATCH_SIZE, publish=True, version=None,
+                            routing_weight=None, registry_file_path=REGISTRY_FILE_PATH):
+    """
+    Trains on the workout logs created since the last checkpoint and publishes
+    the updated model. Work is proportional to the number of new logs; with no
+    new logs nothing is published. Returns the updated checkpoint.
+    """
+    model, checkpoint = load_state(state_file_path)
+    start_id, trained_before = checkpoint['last_log_id'], checkpoint['rows_trained']
+    skipped_before = checkpoint['rows_skipped']
+
+    async with session_factory() as session:
+        async for rows in stream_new_logs(session, checkpoint['last_log_id'], batch_size):
+            features, target, skipped = prepare_batch(rows)
+            if len(features):
+                if model.is_fitted:
+                    checkpoint['rows_evaluated'] += len(features)
+                    checkpoint['rows_correct'] += int(
+                        (model.predict(features) == target.to_numpy()).sum())
+                model.partial_fit(features, target)
+                checkpoint['rows_trained'] += len(features)
+
+            checkpoint['rows_skipped'] += skipped
+            checkpoint['last_log_id'] = rows[-1].id
+            save_state(model, checkpoint, state_file_path)
+
+    new_rows = checkpoint['rows_trained'] - trained_before
+    if checkpoint['last_log_id'] == start_id:
+        print(f"No workout logs after id {start_id}; model unchanged.")
+    else:
+        print(f"Trained on {new_rows} new logs (ids {start_id + 1}..{checkpoint['last_log_id']}), "
+              f"skipped {checkpoint['rows_skipped'] - skipped_before} with an unknown "
+              f"intensity or goal.")
+
+    if publish and new_rows:
+        checkpoint['version'] = publish_model(model, checkpoint, version, routing_weight,
+                                              registry_file_path)
+        save_state(model, checkpoint, state_file_path)
+    return checkpoint
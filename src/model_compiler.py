@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+
+# Define the location where the compiled model arrays will be saved
+COMPILED_MODEL_FILE_PATH = 'models/workout_recommender_pipeline_goal.npz'
+
+# Same arrays as one .npy file each, so serving processes can memory-map them
+COMPILED_ARRAYS_DIRECTORY = 'models/workout_recommender_pipeline_goal_arrays'
+
+# Bump when the array layout below changes, so old artifacts are rejected
+COMPILED_FORMAT_VERSION = 1
+
+# Ordinal encoding for intensity (Must match the training logic in src/data_loader.py)
+INTENSITY_MAP = {'very_low': 1, 'low': 2, 'moderate': 3, 'high': 4}
+
+
+def compile_pipeline(model_pipeline):
+    """
+    Flattens a fitted Goal Prediction pipeline into plain NumPy arrays:
+    scaler constants, category tables and the decision tree's node arrays.
+    The arrays can be evaluated without pandas or scikit-learn.
+    """
+    preprocessor = model_pipeline.named_steps['data_preprocessor']
+    classifier = model_pipeline.named_steps['classifier']
+
+    if classifier.n_outputs_ != 1:
+        raise ValueError("Only single-output classifiers can be compiled.")
+
+    # 1. Preprocessing constants, located by their output columns
+    column_groups = {name: columns for name, _, columns in preprocessor.transformers_}
+    scaler = preprocessor.named_transformers_['standard_scaler']
+    encoder = preprocessor.named_transformers_['one_hot_encoder']
+
+    numerical_features = list(column_groups['standard_scaler'])
+    categorical_features = list(column_groups['one_hot_encoder'])
+
+    arrays = {
+        'format_version': np.array(COMPILED_FORMAT_VERSION, dtype=np.int16),
+        'intensity_levels': np.array(list(INTENSITY_MAP.keys())),
+        'intensity_values': np.array(list(INTENSITY_MAP.values()), dtype=np.float64),
+        'numerical_features': np.array(numerical_features),
+        'numerical_offset': np.array(
+            preprocessor.output_indices_['standard_scaler'].start, dtype=np.int32),
+        'scaler_mean': np.asarray(scaler.mean_, dtype=np.float64),
+        'scaler_scale': np.asarray(scaler.scale_, dtype=np.float64),
+        'categorical_features': np.array(categorical_features),
+        'categorical_offset': np.array(
+            preprocessor.output_indices_['one_hot_encoder'].start, dtype=np.int32),
+        'n_columns': np.array(
+            sum(s.stop - s.start for s in preprocessor.output_indices_.values()),
+            dtype=np.int32),
+    }
+
+    for position, categories in enumerate(encoder.categories_):
+        arrays[f'categories_{position}'] = np.asarray(categories).astype(str)
+
+    # 2. Tree structure. Each node's class is resolved up front, so a prediction
+    # is a walk to a leaf followed by a single lookup.
+    tree = classifier.tree_
+    arrays.update({
+        'classes': np.asarray(classifier.classes_).astype(str),
+        'children_left': tree.children_left.astype(np.int32),
+        'children_right': tree.children_right.astype(np.int32),
+        'feature': tree.feature.astype(np.int32),
+        'threshold': tree.threshold.astype(np.float64),
+        'node_class': np.argmax(tree.value[:, 0, :], axis=1).astype(np.int16),
+    })
+
+    return arrays
+
+
+def save_compiled_model(model_pipeline, file_path=COMPILED_MODEL_FILE_PATH):
+    """Compiles the pipeline and saves the arrays to a compressed .npz file."""
+    arrays = compile_pipeline(model_pipeline)
+    np.savez_compressed(file_path, **arrays)
+    print(f"💾 Compiled model saved to {file_path}")
+    return arrays
+
+
+def save_compiled_arrays(arrays, directory=COMPILED_ARRAYS_DIRECTORY):
+    """
+    Saves each compiled array to its own uncompressed .npy file, which
+    np.load(mmap_mode='r') can map straight from the page cache.
+    Files are replaced atomically: a running server keeps its old mapping
+    instead of seeing a truncated file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, array in arrays.items():
+        file_path = os.path.join(directory, f"{name}.npy")
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, 'wb') as array_file:
+            np.save(array_file, array, allow_pickle=False)
+        os.replace(temp_path, file_path)
+    print(f"💾 Memory-mappable arrays saved to {directory}")
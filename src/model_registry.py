@@ -0,0 +1,55 @@
+import json
+import os
+
+# Manifest listing every served model version, its metadata and its traffic share
+REGISTRY_FILE_PATH = 'models/registry.json'
+
+# Each trained version gets its own artifact directory
+MODEL_VERSIONS_DIR = 'models/versions'
+
+
+def read_manifest(file_path=REGISTRY_FILE_PATH):
+    """Reads the registry manifest, or returns an empty one."""
+    if not os.path.exists(file_path):
+        return {'routing': {}, 'versions': {}}
+    with open(file_path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def write_manifest(manifest, file_path=REGISTRY_FILE_PATH):
+    """
+    Writes the manifest atomically (temp file + rename), so a serving process
+    polling it never reads a half-written file.
+    """
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+        manifest_file.write('\n')
+    os.replace(temp_path, file_path)
+
+
+def version_directory(version):
+    """Returns (and creates) the artifact directory of a model version."""
+    directory = os.path.join(MODEL_VERSIONS_DIR, version)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def register_model_version(version, metadata, routing_weight=None,
+                           file_path=REGISTRY_FILE_PATH):
+    """
+    Adds a version to the manifest.
+    With routing_weight=None the new version takes all traffic; otherwise it is
+    added next to the current versions with the given weight (e.g. a canary).
+    """
+    manifest = read_manifest(file_path)
+    manifest['versions'][version] = metadata
+
+    if routing_weight is None:
+        manifest['routing'] = {version: 1.0}
+    else:
+        manifest['routing'][version] = float(routing_weight)
+
+    write_manifest(manifest, file_path)
+    print(f"📒 Registered model version {version} in {file_path}")
+    return manifest
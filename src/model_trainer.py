@@ -1,22 +1,49 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+
 import joblib
-from sklearn.model_selection import train_test_split
+from scipy.stats import randint
+from sklearn.model_selection import (GridSearchCV, RandomizedSearchCV, StratifiedKFold,
+                                     train_test_split)
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.tree import DecisionTreeClassifier
 
+from src.model_compiler import save_compiled_model, save_compiled_arrays
+from src.model_registry import register_model_version, version_directory
+
 # Define the location where the model pipeline will be saved
 MODEL_FILE_PATH = 'models/workout_recommender_pipeline_goal.joblib'
 
+# Search spaces for the Decision Tree (pipeline step 'classifier')
+PARAMETER_GRID = {
+    'classifier__criterion': ['gini', 'entropy'],
+    'classifier__max_depth': [None, 6, 10, 14, 20],
+    'classifier__min_samples_leaf': [1, 5, 20, 50],
+}
+PARAMETER_DISTRIBUTIONS = {
+    'classifier__criterion': ['gini', 'entropy', 'log_loss'],
+    'classifier__max_depth': [None] + list(range(4, 31)),
+    'classifier__min_samples_leaf': randint(1, 100),
+    'classifier__min_samples_split': randint(2, 50),
+}
+
 
 def build_preprocessor(features_dataframe):
     """
     Creates a ColumnTransformer to apply different preprocessing steps
     to numerical and categorical columns, matching the Goal Prediction model.
+    Categorical columns missing from the frame (e.g. the segment column of a
+    per-segment model) are left out.
     """
 
     numerical_features = ['duration_min', 'calories_burned', 'intensity_numeric']
-    categorical_features = ['workout_type', 'equipment']
+    categorical_features = [name for name in ['workout_type', 'equipment']
+                            if name in features_dataframe.columns]
 
     preprocessor = ColumnTransformer(
         transformers=[
@@ -34,8 +61,78 @@ def build_preprocessor(features_dataframe):
     return preprocessor
 
 
-def train_and_save_model(all_features, target_variable):
-    """Trains the model pipeline and saves it to joblib file."""
+def build_model_metadata(model_pipeline, accuracy, training_rows, pipeline_path,
+                         compiled_path, arrays_path):
+    """Describes a trained pipeline for the model registry manifest."""
+    column_groups = {name: list(columns) for name, _, columns
+                     in model_pipeline.named_steps['data_preprocessor'].transformers_}
+
+    return {
+        'pipeline_path': pipeline_path,
+        'compiled_path': compiled_path,
+        'arrays_path': arrays_path,
+        'trained_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'accuracy': round(float(accuracy), 4),
+        'training_rows': int(training_rows),
+        'feature_schema': {
+            'numerical_features': column_groups['standard_scaler'],
+            'categorical_features': column_groups['one_hot_encoder'],
+            'target': 'goal',
+            'classes': [str(label) for label in
+                        model_pipeline.named_steps['classifier'].classes_],
+        },
+    }
+
+
+def build_model_pipeline(preprocessor, classifier_params=None, memory=None):
+    """Preprocessing -> Decision Tree. `memory` caches the fitted preprocessor."""
+    classifier = DecisionTreeClassifier(random_state=42, **(classifier_params or {}))
+    return Pipeline(steps=[
+        ('data_preprocessor', preprocessor),
+        ('classifier', classifier)
+    ], memory=memory)
+
+
+def save_and_register_model(model_pipeline, accuracy, training_rows, version=None,
+                            routing_weight=None, hyperparameters=None):
+    """
+    Saves the pipeline and its compiled arrays, then registers the run as a new
+    model version (see src/model_registry.py); routing_weight=None sends it all
+    traffic, a number adds it alongside the current versions.
+    """
+    # A pipeline fitted with a preprocessing cache must not point at it once saved
+    model_pipeline.set_params(memory=None)
+
+    # Save the entire pipeline (preprocessor + model) to a file
+    joblib.dump(model_pipeline, MODEL_FILE_PATH)
+    print(f"💾 Model pipeline saved to {MODEL_FILE_PATH}")
+
+    # Export the flat NumPy arrays served by the ML adapter
+    arrays = save_compiled_model(model_pipeline)
+    save_compiled_arrays(arrays)
+
+    # Register the run as a model version with its own copy of the artifacts
+    version = version or datetime.now(timezone.utc).strftime('goal-%Y%m%d%H%M%S')
+    directory = version_directory(version)
+    pipeline_path = os.path.join(directory, 'pipeline.joblib')
+    compiled_path = os.path.join(directory, 'compiled.npz')
+    arrays_path = os.path.join(directory, 'arrays')
+    joblib.dump(model_pipeline, pipeline_path)
+    save_compiled_model(model_pipeline, compiled_path)
+    save_compiled_arrays(arrays, arrays_path)
+
+    metadata = build_model_metadata(model_pipeline, accuracy, training_rows,
+                                    pipeline_path, compiled_path, arrays_path)
+    if hyperparameters:
+        metadata['hyperparameters'] = hyperparameters
+    register_model_version(version, metadata, routing_weight=routing_weight)
+
+
+def train_and_save_model(all_features, target_variable, version=None, routing_weight=None):
+    """
+    Trains the model pipeline and saves it to joblib file.
+    The run is also registered as a new model version (see save_and_register_model).
+    """
 
     # Split data for validation (80% training, 20% testing)
     training_features, testing_features, training_targets, testing_targets = train_test_split(
@@ -43,12 +140,7 @@ def train_and_save_model(all_features, target_variable):
     )
 
     # Build the complete pipeline: Preprocessing -> Model
-    preprocessor = build_preprocessor(training_features)
-
-    model_pipeline = Pipeline(steps=[
-        ('data_preprocessor', preprocessor),
-        ('classifier', DecisionTreeClassifier(random_state=42))
-    ])
+    model_pipeline = build_model_pipeline(build_preprocessor(training_features))
 
     # Train the model (FIT)
     model_pipeline.fit(training_features, training_targets)
@@ -58,6 +150,86 @@ def train_and_save_model(all_features, target_variable):
     print("Model trained successfully.")
     print(f"   Accuracy on test set: {accuracy:.4f}")
 
-    # Save the entire pipeline (preprocessor + model) to a file
-    joblib.dump(model_pipeline, MODEL_FILE_PATH)
-    print(f"💾 Model pipeline saved to {MODEL_FILE_PATH}")
\ No newline at end of file
+    save_and_register_model(model_pipeline, accuracy, len(training_features), version,
+                            routing_weight)
+
+    return model_pipeline, accuracy
+
+
+def summarize_search(search, folds):
+    """
+    One row per candidate, best first. Wall time covers every fold's fit and
+    score for that candidate, as reported by cv_results_.
+    """
+    results = search.cv_results_
+    candidates = []
+    for index, params in enumerate(results['params']):
+        fold_seconds = results['mean_fit_time'][index] + results['mean_score_time'][index]
+        candidates.append({
+            'rank': int(results['rank_test_score'][index]),
+            # numpy scalars from the distributions are unwrapped for the JSON manifest
+            'params': {name.removeprefix('classifier__'): getattr(value, 'item', lambda: value)()
+                       for name, value in params.items()},
+            'mean_cv_accuracy': round(float(results['mean_test_score'][index]), 4),
+            'std_cv_accuracy': round(float(results['std_test_score'][index]), 4),
+            'wall_seconds': round(float(fold_seconds * folds), 4),
+        })
+    return sorted(candidates, key=lambda candidate: candidate['rank'])
+
+
+def search_and_save_model(all_features, target_variable, mode='grid', n_iter=30, folds=5,
+                          n_jobs=-1, version=None, routing_weight=None):
+    """
+    Cross-validated hyperparameter search over the Decision Tree, run on all
+    cores (n_jobs=-1). The preprocessor is identical for every candidate, so the
+    pipeline caches its fitted output per fold on disk and only the tree is refit.
+    The best candidate (refit on the training split) is evaluated on the held-out
+    20% and saved like train_and_save_model does.
+    """
+    training_features, testing_features, training_targets, testing_targets = train_test_split(
+        all_features, target_variable, test_size=0.2, random_state=42
+    )
+
+    cache_directory = tempfile.mkdtemp(prefix='fitnessbud-preprocessing-')
+    try:
+        model_pipeline = build_model_pipeline(build_preprocessor(training_features),
+                                              memory=cache_directory)
+        cross_validation = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+
+        if mode == 'grid':
+            search = GridSearchCV(model_pipeline, PARAMETER_GRID, cv=cross_validation,
+                                  n_jobs=n_jobs)
+        elif mode == 'random':
+            search = RandomizedSearchCV(model_pipeline, PARAMETER_DISTRIBUTIONS, n_iter=n_iter,
+                                        cv=cross_validation, n_jobs=n_jobs, random_state=42)
+        else:
+            raise ValueError(f"Unknown search mode '{mode}'. Use 'grid' or 'random'.")
+
+        started = time.perf_counter()
+        search.fit(training_features, training_targets)
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(cache_directory, ignore_errors=True)
+
+    candidates = summarize_search(search, folds)
+    print(f"Searched {len(candidates)} candidates x {folds} folds in {elapsed:.1f}s")
+    for candidate in candidates:
+        print(f"   #{candidate['rank']:<3} cv={candidate['mean_cv_accuracy']:.4f} "
+              f"±{candidate['std_cv_accuracy']:.4f}  {candidate['wall_seconds']:.3f}s  "
+              f"{candidate['params']}")
+
+    best_pipeline = search.best_estimator_
+    accuracy = best_pipeline.score(testing_features, testing_targets)
+    print(f"Best parameters: {candidates[0]['params']}")
+    print(f"   Accuracy on test set: {accuracy:.4f}")
+
+    hyperparameters = {
+        'search': mode,
+        'folds': folds,
+        'best_params': candidates[0]['params'],
+        'mean_cv_accuracy': candidates[0]['mean_cv_accuracy'],
+    }
+    save_and_register_model(best_pipeline, accuracy, len(training_features), version,
+                            routing_weight, hyperparameters)
+
+    return best_pipeline, accuracy, candidates
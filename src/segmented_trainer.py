@@ -0,0 +1,208 @@
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from infrastructure.compiled_model import CompiledGoalModel
+from infrastructure.segmented_model import SEGMENTS_MANIFEST_FILE, SegmentedGoalModel
+from src.data_loader import INTENSITY_MAP
+from src.model_compiler import compile_pipeline, save_compiled_arrays
+from src.model_registry import register_model_version, version_directory
+from src.model_trainer import build_model_pipeline, build_preprocessor
+
+# Segments with fewer training rows are served by the fallback model
+MIN_SEGMENT_ROWS = 200
+
+TARGET_COLUMN = 'goal'
+
+
+def share_columns(data_frame, directory):
+    """
+    Writes every column to its own .npy file (categoricals as integer codes).
+    Workers memory-map the files and slice out their rows, so the frame is
+    never pickled to them. Returns the layout needed to rebuild the columns.
+    """
+    layout = {}
+    for name in data_frame.columns:
+        column = data_frame[name]
+        if not isinstance(column.dtype, pd.CategoricalDtype) and column.dtype == object:
+            column = column.astype('category')
+
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            np.save(os.path.join(directory, f"{name}.npy"), column.cat.codes.to_numpy())
+            layout[name] = [str(category) for category in column.cat.categories]
+        else:
+            np.save(os.path.join(directory, f"{name}.npy"), column.to_numpy())
+            layout[name] = None
+    return layout
+
+
+def read_rows(directory, layout, start, stop):
+    """Rebuilds rows [start, stop) from the shared column files."""
+    columns = {}
+    for name, categories in layout.items():
+        mapped = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+        values = np.array(mapped[start:stop])
+        if categories is None:
+            columns[name] = values
+        else:
+            columns[name] = pd.Categorical.from_codes(values, categories=categories)
+    return pd.DataFrame(columns)
+
+
+def fit_segment(directory, layout, segment_feature, segment, start, stop):
+    """
+    Process pool task: fits one segment's pipeline and returns it compiled to
+    arrays, which are small to send back. A segment model does not see the
+    segment column (it is constant there); segment None is the fallback model
+    trained on every row.
+    """
+    started = time.perf_counter()
+    rows = read_rows(directory, layout, start, stop)
+    target = rows.pop(TARGET_COLUMN)
+    if segment is not None:
+        rows = rows.drop(columns=[segment_feature])
+
+    model_pipeline = build_model_pipeline(build_preprocessor(rows))
+    model_pipeline.fit(rows, target)
+
+    return {
+        'segment': segment,
+        'arrays': compile_pipeline(model_pipeline),
+        'rows': stop - start,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def segment_tasks(training, segment_feature, min_segment_rows):
+    """(segment, start, stop) of every segment large enough, largest first, plus the fallback."""
+    values = training[segment_feature].astype(str).to_numpy()
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    stops = np.r_[starts[1:], len(values)]
+
+    tasks = [(None, 0, len(values))]
+    tasks += [(values[start], int(start), int(stop)) for start, stop in zip(starts, stops)
+              if stop - start >= min_segment_rows]
+    return sorted(tasks, key=lambda task: task[2] - task[1], reverse=True)
+
+
+def to_workouts(features):
+    """Feature rows back to the request mappings the served models take."""
+    intensity_levels = {value: level for level, value in INTENSITY_MAP.items()}
+    workouts = features.drop(columns=['intensity_numeric']).astype(
+        {'workout_type': str, 'equipment': str})
+    workouts['intensity'] = features['intensity_numeric'].map(intensity_levels)
+    return workouts.to_dict(orient='records')
+
+
+def save_segmented_model(results, segment_feature, directory):
+    """Saves one memory-mappable arrays directory per segment plus the manifest."""
+    os.makedirs(directory, exist_ok=True)
+    manifest = {'segment_feature': segment_feature, 'segments': {}, 'fallback': 'fallback'}
+    for index, result in enumerate(sorted(results, key=lambda r: (r['segment'] is not None,
+                                                                  str(r['segment'])))):
+        name = 'fallback' if result['segment'] is None else f"segment_{index:03d}"
+        save_compiled_arrays(result['arrays'], os.path.join(directory, name))
+        if result['segment'] is not None:
+            manifest['segments'][result['segment']] = name
+
+    with open(os.path.join(directory, SEGMENTS_MANIFEST_FILE), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+
+
+def train_segmented_model(all_features, target_variable, segment_feature='equipment',
+                          min_segment_rows=MIN_SEGMENT_ROWS, max_workers=None, version=None,
+                          routing_weight=None):
+    """
+    Fits one pipeline per segment_feature value in a process pool (all cores by
+    default), evaluates the bundle on the same held-out 20% as the single-tree
+    trainer and registers it as a new model version.
+    Returns (bundle, accuracy, report).
+    """
+    training_features, testing_features, training_targets, testing_targets = train_test_split(
+        all_features, target_variable, test_size=0.2, random_state=42
+    )
+
+    # Rows of one segment must be contiguous so each worker reads a single slice
+    training = training_features.assign(**{TARGET_COLUMN: training_targets})
+    training = training.sort_values(segment_feature, kind='stable').reset_index(drop=True)
+    tasks = segment_tasks(training, segment_feature, min_segment_rows)
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix='fitnessbud-segments-') as directory:
+        layout = share_columns(training, directory)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(fit_segment, directory, layout, segment_feature, *task)
+                       for task in tasks]
+            results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    fallback = next(result for result in results if result['segment'] is None)
+    bundle = SegmentedGoalModel(
+        segment_feature,
+        {result['segment']: CompiledGoalModel(result['arrays'])
+         for result in results if result['segment'] is not None},
+        CompiledGoalModel(fallback['arrays']),
+    )
+
+    # Evaluate the bundle against the single tree (the fallback) on the same rows
+    workouts = to_workouts(testing_features)
+    expected = np.asarray(testing_targets, dtype=str)
+    segmented = np.asarray(bundle.predict_batch(workouts))
+    single = np.asarray(bundle.fallback.predict_batch(workouts))
+    accuracy = float(np.mean(segmented == expected))
+
+    node_counts = bundle.node_counts()
+    test_segments = np.array([str(workout[segment_feature]) for workout in workouts])
+    report = {'single_tree_accuracy': round(float(np.mean(single == expected)), 4),
+              'segments': {}}
+    print(f"Trained {len(results)} models with a process pool in {elapsed:.1f}s")
+    for result in results:
+        segment = result['segment']
+        if segment is None:
+            continue
+        rows = test_segments == segment
+        if not rows.any():
+            continue
+        segment_report = {
+            'training_rows': result['rows'],
+            'fit_seconds': result['seconds'],
+            'nodes': node_counts[segment],
+            'accuracy': round(float(np.mean(segmented[rows] == expected[rows])), 4),
+            'single_tree_accuracy': round(float(np.mean(single[rows] == expected[rows])), 4),
+        }
+        report['segments'][segment] = segment_report
+        print(f"   {segment:<18} rows={result['rows']:<7} nodes={segment_report['nodes']:<6} "
+              f"accuracy={segment_report['accuracy']:.4f} "
+              f"(single tree {segment_report['single_tree_accuracy']:.4f})")
+    print(f"   Accuracy on test set: {accuracy:.4f} "
+          f"(single tree {report['single_tree_accuracy']:.4f}, "
+          f"{node_counts['fallback']} nodes)")
+
+    version = version or datetime.now(timezone.utc).strftime('goal-segmented-%Y%m%d%H%M%S')
+    segments_path = os.path.join(version_directory(version), 'segments')
+    save_segmented_model(results, segment_feature, segments_path)
+
+    metadata = {
+        'segments_path': segments_path,
+        'segment_feature': segment_feature,
+        'trained_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'accuracy': round(accuracy, 4),
+        'training_rows': int(len(training)),
+        'segments': report['segments'],
+        'feature_schema': {
+            'numerical_features': ['duration_min', 'calories_burned', 'intensity_numeric'],
+            'categorical_features': ['workout_type', 'equipment'],
+            'target': TARGET_COLUMN,
+            'classes': sorted({str(label) for label in training[TARGET_COLUMN]}),
+        },
+    }
+    register_model_version(version, metadata, routing_weight=routing_weight)
+
+    return bundle, accuracy, report
@@ -0,0 +1,85 @@
+import os
+import re
+
+import pandas as pd
+from sqlalchemy import select
+
+from infrastructure.models import User, WorkoutLog
+from src.data_loader import COLUMN_DTYPES, columnar_extension, write_frame
+
+# One directory of partitions per export; later runs append new partitions
+EXPORT_DIRECTORY = 'models/exports/workout_logs'
+
+# Rows per partition file, which is also the cursor's fetch size
+ROWS_PER_FILE = 100_000
+
+# Same columns as models/synthetic_workout_data.csv, plus the log id
+EXPORT_COLUMNS = ['id', 'user_id', 'workout_type', 'intensity', 'duration_min',
+                  'calories_burned', 'age', 'goal', 'equipment']
+
+EXPORT_DTYPES = {'id': 'int64', 'user_id': 'int32', 'age': 'int16', **COLUMN_DTYPES}
+
+# part-<first id>-<last id>; zero padded so name order is id order
+PARTITION_PATTERN = re.compile(r'^part-(\d{12})-(\d{12})\.(parquet|pkl)$')
+
+
+def export_query(after_id):
+    """Workout logs joined with their user's profile, in id order after the watermark."""
+    return (
+        select(WorkoutLog.id, WorkoutLog.user_id, WorkoutLog.workout_type,
+               WorkoutLog.intensity, WorkoutLog.duration_min, WorkoutLog.calories_burned,
+               User.age, User.goal, User.equipment)
+        .join(User, WorkoutLog.user_id == User.id)
+        .where(WorkoutLog.id > after_id)
+        .order_by(WorkoutLog.id)
+    )
+
+
+def read_watermark(directory=EXPORT_DIRECTORY):
+    """
+    Highest log id already exported. Partitions are only ever renamed into
+    place once complete, so their names are the checkpoint.
+    """
+    if not os.path.isdir(directory):
+        return 0
+    matches = [PARTITION_PATTERN.match(name) for name in os.listdir(directory)]
+    last_ids = [int(match.group(2)) for match in matches if match]
+    return max(last_ids, default=0)
+
+
+def rows_to_frame(rows):
+    data_frame = pd.DataFrame.from_records(rows, columns=EXPORT_COLUMNS)
+    # Missing calories are stored as 0, as in the synthetic training data
+    data_frame['calories_burned'] = data_frame['calories_burned'].fillna(0.0)
+    return data_frame.astype(EXPORT_DTYPES)
+
+
+async def export_training_data(session_factory, directory=EXPORT_DIRECTORY,
+                               rows_per_file=ROWS_PER_FILE):
+    """
+    Streams the logs after the watermark through a server-side cursor and writes
+    one columnar partition per fetched batch, so memory is bounded by
+    rows_per_file whatever the table size. An interrupted export resumes after
+    its last complete partition. Returns the partition paths written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    watermark = read_watermark(directory)
+    extension = columnar_extension()
+
+    written = []
+    async with session_factory() as session:
+        statement = export_query(watermark).execution_options(yield_per=rows_per_file)
+        result = await session.stream(statement)
+        async for rows in result.partitions(rows_per_file):
+            file_path = os.path.join(directory,
+                                     f"part-{rows[0].id:012d}-{rows[-1].id:012d}{extension}")
+            write_frame(rows_to_frame(rows), file_path)
+            written.append(file_path)
+
+    exported = read_watermark(directory)
+    if written:
+        print(f"💾 Exported logs {watermark + 1}..{exported} into {len(written)} partitions "
+              f"in {directory}")
+    else:
+        print(f"No workout logs after id {watermark}; export is up to date.")
+    return written
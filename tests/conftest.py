@@ -1,10 +1,107 @@
+import datetime
+import os
+import uuid
+
 import pytest
-from core.config import Settings
 from dotenv import load_dotenv
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.config import Settings
 
 load_dotenv(dotenv_path='./.env.test', override=True)
 
+from infrastructure.db import Base  # noqa: E402 (reads the settings loaded above)
+from infrastructure.models import User, WorkoutLog  # noqa: E402
+
+
 @pytest.fixture(scope="session")
 def mock_settings():
     """Provides the Settings object initialized with .env.test variables."""
-    return Settings()
\ No newline at end of file
+    return Settings()
+
+
+USERS = [
+    {"email": "strength@example.com", "goal": "gain_muscle", "equipment": "barbell"},
+    {"email": "rehab@example.com", "goal": "rehabilitation", "equipment": "yoga_mat"},
+]
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """Session factory on a throwaway SQLite database holding the USERS."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'logs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with factory() as session:
+        users = [User(hashed_password="x", age=30, **fields) for fields in USERS]
+        session.add_all(users)
+        await session.commit()
+
+    factory.user_ids = [user.id for user in users]
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+async def postgres_factory():
+    """
+    Like session_factory, on a throwaway schema of the PostgreSQL database at
+    TEST_POSTGRES_URL (postgresql+asyncpg://...); skipped when it is not set.
+    """
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    engine = create_async_engine(url, connect_args={"server_settings": {"search_path": schema}})
+    async with engine.begin() as conn:
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with factory() as session:
+        users = [User(hashed_password="x", age=30, **fields) for fields in USERS]
+        session.add_all(users)
+        await session.commit()
+
+    factory.user_ids = [user.id for user in users]
+    yield factory
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    await engine.dispose()
+
+
+@pytest.fixture
+def add_logs(session_factory):
+    """
+    Inserts (user index, workout_type, intensity, duration_min, calories_burned)
+    rows, optionally followed by a workout_date (default 2025-01-01).
+    """
+    async def add(logs):
+        async with session_factory() as session:
+            session.add_all([
+                WorkoutLog(user_id=session_factory.user_ids[user], workout_type=workout_type,
+                           intensity=intensity, duration_min=duration,
+                           calories_burned=calories,
+                           workout_date=workout_date[0] if workout_date
+                           else datetime.date(2025, 1, 1))
+                for user, workout_type, intensity, duration, calories, *workout_date in logs
+            ])
+            await session.commit()
+    return add
+
+
+@pytest.fixture
+def executed_statements(session_factory):
+    """SQL statements sent to the session_factory database while the test runs."""
+    engine = session_factory.kw['bind'].sync_engine
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,19 @@
+import pytest
+
+from core.startup import StartupReport
+
+
+def test_phase_records_duration_and_errors():
+    report = StartupReport()
+
+    with report.phase("database"):
+        pass
+    with pytest.raises(RuntimeError):
+        with report.phase("model"):
+            raise RuntimeError("artifact missing")
+
+    summary = report.summary()
+    assert set(summary["phases_seconds"]) == {"database", "model"}
+    assert summary["errors"] == {"model": "artifact missing"}
+    assert summary["crud_ready"] is False
+    assert summary["model_ready"] is False
@@ -0,0 +1,96 @@
+import datetime
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+
+from api.deps import get_current_user
+from core.config import settings
+from domain import auth_service
+from domain.schemas import UserOut
+
+
+def principal(user_id):
+    return UserOut(id=user_id, email=f"user{user_id}@example.com", is_active=True, age=30,
+                   goal="gain_muscle", equipment="barbell", created_at=datetime.datetime.now())
+
+
+@pytest.fixture(autouse=True)
+def empty_principal_cache():
+    auth_service.PRINCIPAL_CACHE.clear()
+    yield
+    auth_service.PRINCIPAL_CACHE.clear()
+
+
+def test_principals_are_cached_until_the_token_expires_at_the_latest(monkeypatch):
+    now = time.time()
+    auth_service.cache_principal("expired", principal(1), exp=int(now) - 1)
+    auth_service.cache_principal("no-exp", principal(1), exp=None)
+    auth_service.cache_principal("valid", principal(1), exp=int(now) + 3600)
+
+    assert auth_service.get_cached_principal("expired") is None
+    assert auth_service.get_cached_principal("no-exp") is None
+    assert auth_service.get_cached_principal("valid").id == 1
+
+    # The entry also never outlives PRINCIPAL_CACHE_TTL_SECONDS
+    monotonic_now = time.monotonic()
+    monkeypatch.setattr(auth_service.PRINCIPAL_CACHE, "_clock",
+                        lambda: monotonic_now + settings.PRINCIPAL_CACHE_TTL_SECONDS + 1)
+    assert auth_service.get_cached_principal("valid") is None
+
+
+def test_invalidate_principal_drops_only_that_users_tokens():
+    exp = int(time.time()) + 3600
+    auth_service.cache_principal("phone", principal(1), exp)
+    auth_service.cache_principal("laptop", principal(1), exp)
+    auth_service.cache_principal("other", principal(2), exp)
+
+    assert auth_service.invalidate_principal(1) == 2
+    assert auth_service.get_cached_principal("phone") is None
+    assert auth_service.get_cached_principal("other").id == 2
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_skips_decoding_and_database_when_cached(monkeypatch):
+    token = auth_service.get_auth_tokens(user_id=5).access_token
+    repo = AsyncMock()
+    repo.db = SimpleNamespace(info={})
+    repo.get_by_id.return_value = SimpleNamespace(**principal(5).model_dump())
+
+    hits = auth_service.get_principal_cache_stats()["hits"]
+    first = await get_current_user(token=token, repo=repo)
+
+    monkeypatch.setattr("api.deps.decode_access_token", lambda token: pytest.fail("decoded"))
+    second = await get_current_user(token=token, repo=repo)
+
+    assert first.id == second.id == 5
+    repo.get_by_id.assert_called_once()
+    assert auth_service.get_principal_cache_stats()["hits"] == hits + 1
+
+    # After invalidation the user is looked up (and found inactive) again
+    auth_service.invalidate_principal(5)
+    repo.get_by_id.return_value.is_active = False
+    monkeypatch.undo()
+    with pytest.raises(HTTPException) as excinfo:
+        await get_current_user(token=token, repo=repo)
+    assert excinfo.value.status_code == 400
+
+
+async def test_saturated_password_pool_is_reported_as_503(monkeypatch):
+    async def saturated(fn, *args):
+        raise auth_service.PoolSaturated("full")
+
+    monkeypatch.setattr(auth_service.PASSWORD_POOL, "run", saturated)
+
+    with pytest.raises(HTTPException) as error:
+        await auth_service.verify_password_async("password", "hash")
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "1"}
+
+
+async def test_password_helpers_run_inline_without_a_started_pool():
+    hashed = await auth_service.hash_password_async("correct-horse")
+    assert await auth_service.verify_password_async("correct-horse", hashed)
+    assert not await auth_service.verify_password_async("wrong-horse", hashed)
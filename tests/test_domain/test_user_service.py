@@ -0,0 +1,60 @@
+import datetime
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import HTTPException
+
+from domain import auth_service
+from domain.schemas import UserCreate, UserOut
+from domain.user_service import UserService
+
+USER_IN = UserCreate(email="taken@example.com", password="long-enough", age=30,
+                     goal="lose_weight", equipment="dumbbells")
+
+
+@pytest.fixture
+def user_service():
+    service = UserService(session=AsyncMock())
+    service.repository = AsyncMock()
+    service.repository.db = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_create_new_user_commits(user_service):
+    user_service.repository.create.return_value = object()
+
+    await user_service.create_new_user(USER_IN)
+
+    # No separate get_by_email lookup: the INSERT handles the conflict
+    user_service.repository.get_by_email.assert_not_called()
+    assert user_service.repository.create.call_args.kwargs["hashed_password"] != "long-enough"
+    user_service.repository.db.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_create_new_user_conflict_is_409(user_service):
+    user_service.repository.create.return_value = None
+
+    with pytest.raises(HTTPException) as excinfo:
+        await user_service.create_new_user(USER_IN)
+
+    assert excinfo.value.status_code == 409
+    user_service.repository.db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_deactivate_user_drops_cached_principals(user_service):
+    principal = UserOut(id=7, email="jane@example.com", is_active=True, age=30,
+                        goal="lose_weight", equipment="dumbbells",
+                        created_at=datetime.datetime.now())
+    auth_service.cache_principal("jane-token", principal, exp=int(time.time()) + 600)
+    user_service.repository.set_active.return_value = object()
+
+    await user_service.deactivate_user(user_id=7)
+
+    assert user_service.repository.set_active.call_args.kwargs == {"user_id": 7,
+                                                                   "is_active": False}
+    user_service.repository.db.commit.assert_called_once()
+    assert auth_service.get_cached_principal("jane-token") is None
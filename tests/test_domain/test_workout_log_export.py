@@ -0,0 +1,68 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+import zlib
+
+import pytest
+
+from domain.workout_log_service import EXPORT_FIELDS, WorkoutLogService
+from infrastructure.workout_log_repository import WorkoutLogRepository
+
+LOGS = [
+    (0, "Deadlift", "high", 45, 300.0, datetime.date(2025, 3, 2)),
+    (0, "Yoga Flow", "low", 30, None, datetime.date(2025, 3, 1)),
+    (1, "Plank", "low", 20, 60.0, datetime.date(2025, 3, 1)),
+    (0, "Bench Press", "moderate", 50, 250.0, datetime.date(2025, 3, 3)),
+]
+
+
+async def export(session_factory, export_format, compress=False, batch_size=2, user=0):
+    """Runs the export and returns (chunks, decoded text)."""
+    async with session_factory() as session:
+        service = WorkoutLogService(repository=WorkoutLogRepository(db_session=session))
+        chunks = [chunk async for chunk in service.export_logs(
+            user_id=session_factory.user_ids[user], export_format=export_format,
+            compress=compress, batch_size=batch_size)]
+    body = b"".join(chunks)
+    return chunks, (gzip.decompress(body) if compress else body).decode()
+
+
+async def test_ndjson_export_is_chronological_and_streams_per_batch(session_factory, add_logs):
+    await add_logs(LOGS)
+
+    chunks, text = await export(session_factory, "ndjson")
+
+    records = [json.loads(line) for line in text.splitlines()]
+    assert [record["workout_type"] for record in records] == \
+        ["Yoga Flow", "Deadlift", "Bench Press"]
+    assert list(records[0]) == EXPORT_FIELDS
+    assert records[0]["workout_date"] == "2025-03-01"
+    assert records[0]["calories_burned"] is None
+    # Three logs in batches of two: one chunk per batch
+    assert len(chunks) == 2
+
+
+@pytest.mark.parametrize("compress", [False, True])
+async def test_csv_export(session_factory, add_logs, compress):
+    await add_logs(LOGS)
+
+    chunks, text = await export(session_factory, "csv", compress=compress)
+
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[0] == EXPORT_FIELDS
+    assert [row[2] for row in rows[1:]] == ["Yoga Flow", "Deadlift", "Bench Press"]
+    if compress:
+        # Every batch is flushed through the compressor: the first chunk alone
+        # decompresses to the header and the first batch
+        first_batch = zlib.decompressobj(wbits=31).decompress(chunks[0]).decode()
+        assert first_batch.splitlines() == text.splitlines()[:3]
+
+
+async def test_empty_history(session_factory):
+    _, ndjson = await export(session_factory, "ndjson", compress=True)
+    _, text = await export(session_factory, "csv")
+
+    assert ndjson == ""
+    assert text.splitlines() == [",".join(EXPORT_FIELDS)]
@@ -4,7 +4,7 @@ from fastapi import HTTPException
 from pydantic import BaseModel, ConfigDict  # 🚨 Import BaseModel and ConfigDict
 
 # 🚨 Import WorkoutLogCreate for the warning fix
-from domain.schemas import  WorkoutLogBase, WorkoutLogCreate
+from domain.schemas import  WorkoutLogBase, WorkoutLogCreate, WorkoutLogUpdate
 import datetime
 
 from domain.workout_log_service import WorkoutLogService
@@ -51,9 +51,15 @@ def mock_repository():
 
 
 @pytest.fixture
-def workout_log_service(mock_repository):
+def mock_summary_repository():
+    return AsyncMock()
+
+
+@pytest.fixture
+def workout_log_service(mock_repository, mock_summary_repository):
     # ... (Remains the same) ...
-    return WorkoutLogService(repository=mock_repository)
+    return WorkoutLogService(repository=mock_repository,
+                             summary_repository=mock_summary_repository)
 
 # --- Test Cases ---
 
@@ -96,4 +102,89 @@ async def test_get_log_by_id_not_found(mock_repository, workout_log_service):
         await workout_log_service.get_log_by_id(log_id=999, user_id=100)
 
     assert excinfo.value.status_code == 404
-    mock_repository.get_by_id.assert_called_once()
\ No newline at end of file
+    mock_repository.get_by_id.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_logs_page_returns_cursor_when_more_logs_exist(mock_repository,
+                                                                workout_log_service):
+    logs = [MockWorkoutLog(**{**MOCK_LOG_DATA, "id": log_id}) for log_id in (5, 4, 3)]
+    mock_repository.get_page_by_user.return_value = logs
+
+    page, next_cursor = await workout_log_service.get_logs_page(user_id=100, limit=2)
+
+    assert [log.id for log in page] == [5, 4]
+    assert mock_repository.get_page_by_user.call_args.kwargs["limit"] == 3
+
+    # The cursor resumes after the last log returned
+    mock_repository.get_page_by_user.return_value = logs[2:]
+    page, last_cursor = await workout_log_service.get_logs_page(
+        user_id=100, limit=2, cursor=next_cursor)
+
+    assert mock_repository.get_page_by_user.call_args.kwargs["after"] == \
+        (MOCK_LOG_DATA["workout_date"], 4)
+    assert [log.id for log in page] == [3]
+    assert last_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_logs_page_rejects_invalid_cursor(mock_repository, workout_log_service):
+    with pytest.raises(HTTPException) as excinfo:
+        await workout_log_service.get_logs_page(user_id=100, limit=2, cursor="not-a-cursor")
+
+    assert excinfo.value.status_code == 400
+    mock_repository.get_page_by_user.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_logs_bulk_reports_invalid_items(mock_repository, workout_log_service):
+    valid = {k: v for k, v in MOCK_LOG_DATA.items() if k in WorkoutLogBase.model_fields}
+    items = [valid, {**valid, "duration_min": 0}, {"workout_type": "Yoga"}, valid]
+    mock_repository.create_many.return_value = [MockWorkoutLog(**MOCK_LOG_DATA)] * 2
+
+    created, errors = await workout_log_service.create_logs_bulk(items=items, user_id=100)
+
+    assert len(created) == 2
+    assert [error.index for error in errors] == [1, 2]
+    assert errors[0].errors[0]["loc"] == ("duration_min",)
+    assert "input" not in errors[0].errors[0]
+    # The valid items go to the database together, committed once
+    assert len(mock_repository.create_many.call_args.kwargs["logs_in"]) == 2
+    mock_repository.db.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_create_logs_bulk_skips_database_when_nothing_is_valid(mock_repository,
+                                                                    workout_log_service):
+    created, errors = await workout_log_service.create_logs_bulk(
+        items=[{"duration_min": -1}], user_id=100)
+
+    assert created == [] and len(errors) == 1
+    mock_repository.create_many.assert_not_called()
+    mock_repository.db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_log_subtracts_from_summaries_before_commit(
+        mock_repository, mock_summary_repository, workout_log_service):
+    deleted = MockWorkoutLog(**MOCK_LOG_DATA)
+    mock_repository.delete.return_value = deleted
+
+    await workout_log_service.delete_log(log_id=1, user_id=100)
+
+    mock_summary_repository.apply_log_changes.assert_called_once_with(user_id=100,
+                                                                      removed=[deleted])
+    mock_repository.db.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_update_log_not_found_before_touching_summaries(
+        mock_repository, mock_summary_repository, workout_log_service):
+    mock_repository.get_summary_fields.return_value = None
+
+    with pytest.raises(HTTPException) as excinfo:
+        await workout_log_service.update_log(log_id=999, user_id=100,
+                                             log_update=WorkoutLogUpdate(duration_min=30))
+
+    assert excinfo.value.status_code == 404
+    mock_repository.update.assert_not_called()
+    mock_summary_repository.apply_log_changes.assert_not_called()
@@ -0,0 +1,126 @@
+import datetime
+
+from sqlalchemy import select, update
+
+from domain.schemas import WorkoutLogCreate, WorkoutLogUpdate
+from domain.workout_log_service import WorkoutLogService
+from infrastructure.models import WorkoutSummary
+from infrastructure.workout_log_repository import (WorkoutLogRepository,
+                                                   WorkoutSummaryRepository, period_start)
+
+
+def new_log(workout_type, duration, calories, workout_date):
+    return WorkoutLogCreate(workout_date=workout_date, duration_min=duration, intensity="high",
+                            workout_type=workout_type, calories_burned=calories)
+
+
+async def summary_rows(session):
+    """Every non-empty bucket as comparable tuples."""
+    result = await session.execute(select(WorkoutSummary).where(WorkoutSummary.sessions > 0))
+    return sorted((row.user_id, row.period, row.period_start, row.workout_type, row.sessions,
+                   row.total_duration_min, round(row.total_calories, 2))
+                  for row in result.scalars())
+
+
+def test_period_start():
+    sunday = datetime.date(2025, 3, 2)
+    assert period_start("week", sunday) == datetime.date(2025, 2, 24)
+    assert period_start("week", datetime.date(2025, 2, 24)) == datetime.date(2025, 2, 24)
+    assert period_start("month", sunday) == datetime.date(2025, 3, 1)
+
+
+async def test_incremental_totals_match_a_rebuild(session_factory):
+    user_id = session_factory.user_ids[0]
+    async with session_factory() as session:
+        service = WorkoutLogService(repository=WorkoutLogRepository(db_session=session))
+
+        deadlift = await service.create_log(
+            new_log("Deadlift", 45, 300.0, datetime.date(2025, 3, 2)), user_id)
+        yoga = await service.create_log(
+            new_log("Yoga", 30, None, datetime.date(2025, 3, 3)), user_id)
+        await service.create_logs_bulk([
+            new_log("Deadlift", 50, 320.5, datetime.date(2025, 2, 27)).model_dump(),
+            new_log("Deadlift", 40, 280.0, datetime.date(2025, 3, 31)).model_dump(),
+        ], user_id)
+        await service.create_log(
+            new_log("Plank", 20, 60.0, datetime.date(2025, 3, 2)), session_factory.user_ids[1])
+
+        # Moves the log to another workout_type bucket, then deletes another one
+        await service.update_log(yoga.id, user_id,
+                                 WorkoutLogUpdate(workout_type="Pilates", duration_min=35))
+        await service.delete_log(deadlift.id, user_id)
+
+        incremental = await summary_rows(session)
+        await WorkoutSummaryRepository(db_session=session).rebuild()
+        rebuilt = await summary_rows(session)
+
+    assert incremental == rebuilt
+    assert (user_id, "week", datetime.date(2025, 3, 3), "Pilates", 1, 35, 0.0) in rebuilt
+    assert (user_id, "month", datetime.date(2025, 3, 1), "Deadlift", 1, 40, 280.0) in rebuilt
+
+
+async def test_get_summary_groups_periods_and_workout_types(session_factory, add_logs):
+    await add_logs([
+        (0, "Deadlift", "high", 45, 300.0, datetime.date(2025, 3, 3)),
+        (0, "Deadlift", "high", 50, 310.0, datetime.date(2025, 3, 4)),
+        (0, "Yoga", "low", 30, None, datetime.date(2025, 3, 9)),
+        (0, "Yoga", "low", 25, 80.0, datetime.date(2025, 3, 10)),
+        (1, "Plank", "low", 20, 60.0, datetime.date(2025, 3, 3)),
+    ])
+    user_id = session_factory.user_ids[0]
+
+    async with session_factory() as session:
+        await WorkoutSummaryRepository(db_session=session).rebuild(user_id=user_id)
+        await session.commit()
+
+        service = WorkoutLogService(repository=WorkoutLogRepository(db_session=session))
+        weekly = await service.get_summary(user_id=user_id, period="week")
+        monthly = await service.get_summary(user_id=user_id, period="month",
+                                            workout_type="Yoga")
+        later = await service.get_summary(user_id=user_id, period="week",
+                                          date_from=datetime.date(2025, 3, 12))
+
+    assert [(p.period_start, p.sessions, p.total_duration_min, p.total_calories)
+            for p in weekly.periods] == [(datetime.date(2025, 3, 3), 3, 125, 610.0),
+                                         (datetime.date(2025, 3, 10), 1, 25, 80.0)]
+    assert [(t.workout_type, t.sessions) for t in weekly.periods[0].by_workout_type] == \
+        [("Deadlift", 2), ("Yoga", 1)]
+    assert [(p.period_start, p.sessions) for p in monthly.periods] == \
+        [(datetime.date(2025, 3, 1), 2)]
+    # date_from selects the week containing that day
+    assert [p.period_start for p in later.periods] == [datetime.date(2025, 3, 10)]
+
+
+async def test_updates_not_touching_totals_skip_the_summaries(session_factory, add_logs,
+                                                              executed_statements):
+    await add_logs([(0, "Deadlift", "high", 45, 300.0)])
+    async with session_factory() as session:
+        service = WorkoutLogService(repository=WorkoutLogRepository(db_session=session))
+        log_id = (await service.repository.get_all_by_user(session_factory.user_ids[0]))[0].id
+        executed_statements.clear()
+
+        await service.update_log(log_id, session_factory.user_ids[0],
+                                 WorkoutLogUpdate(intensity="moderate"))
+
+    assert [statement.split()[0] for statement in executed_statements] == ["UPDATE"]
+
+
+async def test_bucket_timestamps_are_taken_per_write(session_factory):
+    user_id = session_factory.user_ids[0]
+    log = new_log("Deadlift", 45, 300.0, datetime.date(2025, 3, 3))
+    long_ago = datetime.datetime(2000, 1, 1)
+    async with session_factory() as session:
+        summaries = WorkoutSummaryRepository(db_session=session)
+        await summaries.apply_log_changes(user_id, added=[log])
+        await session.execute(update(WorkoutSummary).values(created_at=long_ago,
+                                                            updated_at=long_ago))
+
+        await summaries.apply_log_changes(user_id, added=[log])
+        result = await session.execute(select(WorkoutSummary.created_at,
+                                              WorkoutSummary.updated_at))
+        timestamps = result.all()
+
+    assert len(timestamps) == 2
+    assert all(created.year == 2000 and updated.year > 2000 for created, updated in timestamps)
+    # Not a value frozen when the module was imported
+    assert not WorkoutSummary.__table__.c.created_at.default.is_scalar
@@ -0,0 +1,93 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from infrastructure.compiled_model import CompiledGoalModel
+from infrastructure.ml_adapter import (MODEL_FILE_PATH, COMPILED_MODEL_FILE_PATH,
+                                       preprocess_batch)
+from src.model_compiler import compile_pipeline
+
+DATA_FILE_PATH = 'models/synthetic_workout_data.csv'
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return joblib.load(MODEL_FILE_PATH)
+
+
+@pytest.fixture(scope="module")
+def compiled_model(pipeline):
+    return CompiledGoalModel(compile_pipeline(pipeline))
+
+
+@pytest.fixture(scope="module")
+def workouts():
+    # Every training row, plus random numeric values and unseen categories
+    data_frame = pd.read_csv(DATA_FILE_PATH)
+    rows = data_frame[['workout_type', 'equipment', 'intensity', 'duration_min',
+                       'calories_burned']].to_dict(orient='records')
+
+    rng = np.random.default_rng(42)
+    for row in rng.choice(rows, size=2000):
+        rows.append({**row,
+                     'duration_min': int(rng.integers(1, 180)),
+                     'calories_burned': float(rng.uniform(0.1, 30.0))})
+    rows.append({**rows[0], 'workout_type': 'Underwater Basket Weaving'})
+    rows.append({**rows[1], 'equipment': 'none'})
+    return rows
+
+
+def test_compiled_batch_matches_pipeline(pipeline, compiled_model, workouts):
+    expected = pipeline.predict(preprocess_batch(workouts)).tolist()
+
+    assert compiled_model.predict_batch(workouts) == expected
+
+
+def test_compiled_single_matches_pipeline(pipeline, compiled_model, workouts):
+    sample = workouts[::25]
+    expected = pipeline.predict(preprocess_batch(sample)).tolist()
+
+    assert [compiled_model.predict_one(**workout) for workout in sample] == expected
+
+
+def test_compiled_transform_matches_preprocessor(pipeline, compiled_model, workouts):
+    preprocessor = pipeline.named_steps['data_preprocessor']
+    expected = preprocessor.transform(preprocess_batch(workouts)).astype(np.float32)
+
+    np.testing.assert_array_equal(compiled_model.transform_batch(workouts), expected)
+
+
+def test_shipped_artifact_matches_pipeline(pipeline, workouts):
+    # The committed .npz must stay in sync with the committed .joblib
+    shipped_model = CompiledGoalModel.load(COMPILED_MODEL_FILE_PATH)
+    expected = pipeline.predict(preprocess_batch(workouts)).tolist()
+
+    assert shipped_model.predict_batch(workouts) == expected
+
+
+def test_compiled_unknown_intensity(compiled_model):
+    with pytest.raises(ValueError):
+        compiled_model.predict_one("Plank", "yoga_mat", "extreme", 10, 1.0)
+
+
+def test_bucket_key_groups_equivalent_inputs(compiled_model, workouts):
+    # Inputs sharing a bucket key must share a prediction
+    predictions_by_key = {}
+    for workout, prediction in zip(workouts, compiled_model.predict_batch(workouts)):
+        key = compiled_model.bucket_key(**workout)
+        assert predictions_by_key.setdefault(key, prediction) == prediction
+
+    assert len(predictions_by_key) < len(workouts)
+
+
+def test_memory_mapped_artifact_matches_pipeline(pipeline, workouts, tmp_path):
+    from src.model_compiler import save_compiled_arrays
+
+    save_compiled_arrays(compile_pipeline(pipeline), tmp_path / "arrays")
+    mapped_model = CompiledGoalModel.load_memory_mapped(tmp_path / "arrays")
+    expected = pipeline.predict(preprocess_batch(workouts)).tolist()
+
+    assert isinstance(mapped_model.threshold, np.memmap)
+    assert mapped_model.predict_batch(workouts) == expected
+    assert [mapped_model.predict_one(**workout) for workout in workouts[:200]] == expected[:200]
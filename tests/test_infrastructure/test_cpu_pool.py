@@ -0,0 +1,82 @@
+import asyncio
+import os
+import signal
+import time
+
+import pytest
+
+from infrastructure.cpu_pool import BoundedProcessPool, PoolSaturated
+
+
+@pytest.fixture
+async def pool():
+    pool = BoundedProcessPool(max_workers=1, max_queued=1)
+    await pool.start()
+    yield pool
+    await pool.stop()
+
+
+async def test_calls_run_in_a_worker_process(pool):
+    assert await pool.run(os.getpid) != os.getpid()
+    assert await pool.run(pow, 2, 10) == 1024
+
+
+async def test_calls_beyond_the_queue_are_rejected(pool):
+    # One running, one waiting: the third call is turned away immediately
+    calls = [asyncio.create_task(pool.run(time.sleep, 0.3)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    with pytest.raises(PoolSaturated):
+        await pool.run(time.sleep, 0.3)
+    await asyncio.gather(*calls)
+
+    stats = pool.stats()
+    assert stats["completed"] == 2 and stats["rejected"] == 1
+    assert stats["max_wait_ms"] >= 200
+    assert stats["busy"] == 0 and stats["queued"] == 0
+
+
+async def test_the_event_loop_keeps_running_during_calls(pool):
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    await pool.run(time.sleep, 0.3)
+    ticker.cancel()
+
+    assert ticks >= 10
+
+
+async def test_a_killed_worker_is_replaced(pool):
+    worker = await pool.run(os.getpid)
+    os.kill(worker, signal.SIGKILL)
+    for _ in range(100):
+        if pool.stats()["broken"]:
+            break
+        await asyncio.sleep(0.05)
+    assert pool.stats()["broken"]
+
+    replacement = await pool.run(os.getpid)
+
+    assert replacement not in (worker, os.getpid())
+    assert await pool.run(pow, 2, 10) == 1024
+    stats = pool.stats()
+    assert stats["restarts"] == 1 and not stats["broken"] and stats["running"]
+
+
+async def test_a_call_that_kills_its_worker_is_retried_once(pool):
+    # Dies on the first try and on the retry: reported like a full pool (503)
+    with pytest.raises(PoolSaturated):
+        await pool.run(os._exit, 1)
+
+    assert await pool.run(pow, 2, 10) == 1024
+    assert pool.stats()["restarts"] == 2
+
+
+async def test_calls_run_inline_until_started():
+    pool = BoundedProcessPool(max_workers=1, max_queued=0)
+    assert await pool.run(os.getpid) == os.getpid()
@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import exc, pool, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from infrastructure.db_pool import InstrumentedAsyncQueuePool, pool_options, pool_stats
+
+POOL_SETTINGS = SimpleNamespace(DB_POOL_SIZE=5, DB_MAX_OVERFLOW=2, DB_POOL_TIMEOUT_SECONDS=3.0,
+                                DB_POOL_RECYCLE_SECONDS=600, DB_POOL_PRE_PING=True)
+
+
+@pytest.fixture
+async def single_connection_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+                                 poolclass=InstrumentedAsyncQueuePool, pool_size=1,
+                                 max_overflow=0, pool_timeout=0.2)
+    yield engine
+    await engine.dispose()
+
+
+def test_pool_options():
+    options = pool_options("postgresql+asyncpg://user:pw@db/fitnessbud", POOL_SETTINGS)
+    assert options['poolclass'] is InstrumentedAsyncQueuePool
+    assert options['pool_size'] == 5 and options['max_overflow'] == 2
+    assert options['pool_recycle'] == 600 and options['pool_pre_ping'] is True
+
+    assert pool_options("sqlite+aiosqlite:///./test.db", POOL_SETTINGS) == {
+        'poolclass': pool.NullPool}
+    no_pool = SimpleNamespace(**{**vars(POOL_SETTINGS), 'DB_POOL_SIZE': 0})
+    assert pool_options("postgresql+asyncpg://db/x", no_pool)['poolclass'] is pool.NullPool
+
+
+async def test_connections_are_reused(single_connection_engine):
+    for _ in range(3):
+        async with single_connection_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    stats = pool_stats(single_connection_engine)
+    assert stats['checkouts'] == 3
+    assert stats['connects'] == 1
+    assert stats['waits'] == 0
+    assert stats['checked_out'] == 0 and stats['idle'] == 1
+
+
+async def test_waits_are_counted(single_connection_engine):
+    holding = asyncio.Event()
+
+    async def hold_connection():
+        async with single_connection_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert pool_stats(single_connection_engine)['checked_out'] == 1
+            holding.set()
+            await asyncio.sleep(0.05)
+
+    async def wait_for_connection():
+        await holding.wait()
+        async with single_connection_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(hold_connection(), wait_for_connection())
+
+    stats = pool_stats(single_connection_engine)
+    assert stats['waits'] == 1
+    assert stats['max_wait_ms'] > 10
+    assert stats['timeouts'] == 0
+
+
+async def test_timeouts_are_counted(single_connection_engine):
+    async with single_connection_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+        with pytest.raises(exc.TimeoutError):
+            async with single_connection_engine.connect():
+                pass
+
+    stats = pool_stats(single_connection_engine)
+    assert stats['timeouts'] == 1
+    assert stats['waits'] == 1
+
+
+async def test_metrics_survive_dispose(single_connection_engine):
+    async with single_connection_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    await single_connection_engine.dispose()
+
+    assert isinstance(single_connection_engine.sync_engine.pool, InstrumentedAsyncQueuePool)
+    assert pool_stats(single_connection_engine)['checkouts'] == 1
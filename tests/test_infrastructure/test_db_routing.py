@@ -0,0 +1,158 @@
+import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api.deps import get_current_user
+from domain import auth_service
+from domain.schemas import WorkoutLogCreate
+from domain.workout_log_service import WorkoutLogService
+from infrastructure.db import Base
+from infrastructure.db_routing import ReplicaMonitor, RoutingSession, use_primary
+from infrastructure.models import User
+from infrastructure.user_repository import UserRepository
+from infrastructure.workout_log_repository import WorkoutLogRepository
+
+LOG_IN = WorkoutLogCreate(workout_date=datetime.date(2025, 3, 3), duration_min=45,
+                          intensity="high", workout_type="Deadlift", calories_burned=300.0)
+
+
+class FakeLagMonitor(ReplicaMonitor):
+    """Reports a fixed lag, or fails like an unreachable replica."""
+
+    def __init__(self, engine, lag_seconds=0.0):
+        super().__init__(engine, max_lag_seconds=5.0, check_interval_seconds=60.0)
+        self.fake_lag = lag_seconds
+
+    async def measure_lag(self):
+        if isinstance(self.fake_lag, Exception):
+            raise self.fake_lag
+        return self.fake_lag
+
+
+@pytest.fixture
+async def databases(tmp_path):
+    """A primary and a replica file; each holds one user whose email names the database."""
+    engines = {}
+    for name in ("primary", "replica"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add(User(email=f"{name}@example.com", hashed_password="x", age=30,
+                             goal="gain_muscle", equipment="barbell"))
+            await session.commit()
+        engines[name] = engine
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+async def routed_factory(databases, lag_seconds=0.0):
+    monitor = FakeLagMonitor(databases["replica"], lag_seconds)
+    await monitor.refresh()
+    return async_sessionmaker(databases["primary"], class_=AsyncSession,
+                              sync_session_class=RoutingSession, replica=databases["replica"],
+                              replica_monitor=monitor, expire_on_commit=False)
+
+
+async def served_by(session):
+    """Which database answered a plain read."""
+    return (await session.execute(select(User.email))).scalar().split("@")[0]
+
+
+async def test_reads_go_to_the_replica_and_writes_to_the_primary(databases):
+    factory = await routed_factory(databases)
+
+    async with factory() as session:
+        assert await served_by(session) == "replica"
+
+        user_id = (await session.execute(select(User.id))).scalar()
+        service = WorkoutLogService(repository=WorkoutLogRepository(db_session=session))
+        log = await service.create_log(LOG_IN, user_id)
+
+        # Read-your-writes: after the first write the session stays on the primary
+        assert await served_by(session) == "primary"
+        assert (await service.get_log_by_id(log.id, user_id)).id == log.id
+
+    async with factory() as session:
+        # A new request reads from the replica again
+        assert await served_by(session) == "replica"
+
+
+async def test_select_for_update_and_pinned_sessions_use_the_primary(databases):
+    factory = await routed_factory(databases)
+
+    async with factory() as session:
+        await session.execute(select(User.id).with_for_update())
+        assert await served_by(session) == "primary"
+
+    async with factory() as session:
+        use_primary(session)
+        assert await served_by(session) == "primary"
+
+
+@pytest.mark.parametrize("lag_seconds", [30.0, ConnectionError("replica down")])
+async def test_lagging_or_unreachable_replica_falls_back_to_the_primary(databases, lag_seconds):
+    factory = await routed_factory(databases, lag_seconds)
+
+    async with factory() as session:
+        assert await served_by(session) == "primary"
+
+    monitor = factory.kw["replica_monitor"]
+    assert monitor.status()["usable"] is False
+    # Once the replica catches up it is used again after the next check
+    monitor.fake_lag = 0.5
+    assert await monitor.refresh(force=True) is True
+    async with factory() as session:
+        assert await served_by(session) == "replica"
+
+
+async def test_current_user_is_not_read_from_a_lagging_replica(databases):
+    # Deactivated on the primary; the replica has not replayed it yet
+    async with AsyncSession(databases["primary"]) as session:
+        await session.execute(update(User).values(is_active=False))
+        await session.commit()
+    factory = await routed_factory(databases)
+    token = auth_service.get_auth_tokens(user_id=1).access_token
+    auth_service.invalidate_principal(1)
+
+    async with factory() as session:
+        with pytest.raises(HTTPException) as excinfo:
+            await get_current_user(token=token, repo=UserRepository(db_session=session))
+
+    assert excinfo.value.status_code == 400
+    assert auth_service.get_cached_principal(token) is None
+
+
+async def test_only_the_current_user_lookup_is_sent_to_the_primary(databases):
+    factory = await routed_factory(databases)
+    token = auth_service.get_auth_tokens(user_id=1).access_token
+    auth_service.invalidate_principal(1)
+
+    async with factory() as session:
+        user = await get_current_user(token=token, repo=UserRepository(db_session=session))
+
+        # The endpoint's reads later in the request still use the replica
+        assert await served_by(session) == "replica"
+
+    assert user.email == "primary@example.com"
+    auth_service.invalidate_principal(1)
+
+
+async def test_monitor_measures_at_most_once_per_interval(databases):
+    monitor = FakeLagMonitor(databases["replica"], lag_seconds=1.0)
+    assert await monitor.refresh() is True
+
+    monitor.fake_lag = 30.0
+    assert await monitor.refresh() is True
+    assert await monitor.refresh(force=True) is False
+
+
+async def test_without_replica_everything_uses_the_primary(databases):
+    factory = async_sessionmaker(databases["primary"], class_=AsyncSession,
+                                 sync_session_class=RoutingSession)
+    async with factory() as session:
+        assert await served_by(session) == "primary"
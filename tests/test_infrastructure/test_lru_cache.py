@@ -0,0 +1,74 @@
+from infrastructure.lru_cache import LRUCache
+
+
+class FakeClock:
+    """Manually advanced replacement for time.monotonic."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    # Touch 'a' so 'b' becomes the eviction candidate
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = LRUCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.put("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_explicit_deadline_overrides_ttl():
+    clock = FakeClock()
+    cache = LRUCache(max_size=10, ttl_seconds=60, clock=clock)
+    cache.put("a", 1, expires_at=1.0)
+
+    clock.now = 1.0
+    assert cache.get("a") is None
+
+
+def test_counters_and_clear():
+    cache = LRUCache(max_size=10)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    cache.clear()
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["invalidations"] == 1
+    assert stats["size"] == 0
+
+
+def test_pop_matching_removes_selected_values():
+    cache = LRUCache(max_size=10)
+    for key, owner in [("t1", 1), ("t2", 2), ("t3", 1)]:
+        cache.put(key, {"owner": owner})
+
+    assert cache.pop_matching(lambda value: value["owner"] == 1) == 2
+    assert cache.get("t1") is None and cache.get("t3") is None
+    assert cache.get("t2") == {"owner": 2}
+    assert cache.stats()["invalidations"] == 1
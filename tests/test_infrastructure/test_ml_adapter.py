@@ -0,0 +1,75 @@
+import subprocess
+import sys
+
+import pytest
+
+from infrastructure import ml_adapter
+from infrastructure.ml_adapter import predict_goal, predict_goal_batch, preprocess_batch
+
+# Dummy workouts covering several categories and intensities
+MOCK_WORKOUTS = [
+    {"workout_type": "Deadlift", "equipment": "barbell", "intensity": "high",
+     "duration_min": 45, "calories_burned": 320.0},
+    {"workout_type": "Yoga Flow", "equipment": "yoga_mat", "intensity": "very_low",
+     "duration_min": 30, "calories_burned": 2.5},
+    {"workout_type": "Treadmill Run", "equipment": "full_gym", "intensity": "moderate",
+     "duration_min": 60, "calories_burned": 540.0},
+    {"workout_type": "Plank", "equipment": "bodyweight_only", "intensity": "low",
+     "duration_min": 10, "calories_burned": 1.2},
+]
+
+
+def test_preprocess_batch_columns():
+    features = preprocess_batch(MOCK_WORKOUTS)
+
+    assert list(features.columns) == ['workout_type', 'equipment', 'duration_min',
+                                      'calories_burned', 'intensity_numeric']
+    assert features['intensity_numeric'].tolist() == [4, 1, 3, 2]
+
+
+def test_preprocess_batch_unknown_intensity():
+    with pytest.raises(ValueError):
+        preprocess_batch([{**MOCK_WORKOUTS[0], "intensity": "extreme"}])
+
+
+def test_predict_goal_batch_matches_single_predictions():
+    # The batch path must return exactly what per-row predictions return, in order
+    batch_predictions = predict_goal_batch(MOCK_WORKOUTS)
+    single_predictions = [predict_goal(**workout) for workout in MOCK_WORKOUTS]
+
+    assert batch_predictions == single_predictions
+
+
+def test_predict_goal_batch_empty():
+    assert predict_goal_batch([]) == []
+
+
+def test_predict_goal_uses_cache():
+    ml_adapter.reload_model()
+    workout = MOCK_WORKOUTS[0]
+
+    first = predict_goal(**workout)
+    # The repeated request is served from the cache
+    second = predict_goal(**workout)
+
+    stats = ml_adapter.get_prediction_cache_stats()
+    assert first == second
+    assert stats["misses"] >= 1
+    assert stats["hits"] >= 1
+
+
+def test_reload_model_invalidates_cache():
+    predict_goal(**MOCK_WORKOUTS[1])
+    assert len(ml_adapter.PREDICTION_CACHE) > 0
+
+    ml_adapter.reload_model()
+
+    assert len(ml_adapter.PREDICTION_CACHE) == 0
+
+
+def test_import_does_not_load_pandas_or_sklearn():
+    # Heavy ML libraries are only imported when the pickled pipeline is needed
+    code = ("import sys, infrastructure.ml_adapter; "
+            "sys.exit(any(m in sys.modules for m in ('pandas', 'sklearn', 'joblib')))")
+
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
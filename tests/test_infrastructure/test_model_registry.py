@@ -0,0 +1,98 @@
+import random
+from collections import Counter
+
+import pytest
+
+from infrastructure.model_registry import ModelRegistry
+from src.model_registry import read_manifest, register_model_version
+
+
+class ConstantModel:
+    """Fake model that predicts the same goal for every input."""
+
+    def __init__(self, goal):
+        self.goal = goal
+
+    def predict_one(self, *args):
+        return self.goal
+
+    def predict_batch(self, workouts):
+        return [self.goal] * len(workouts)
+
+
+def load_constant(metadata):
+    if metadata.get("broken"):
+        raise FileNotFoundError("artifact missing")
+    return ConstantModel(metadata["goal"])
+
+
+MANIFEST = {
+    "routing": {"v1": 3.0, "v2": 1.0},
+    "versions": {"v1": {"goal": "lose_weight"}, "v2": {"goal": "gain_muscle"}},
+}
+
+
+def test_weighted_routing():
+    registry = ModelRegistry(load_constant, rng=random.Random(0))
+    registry.apply_manifest(MANIFEST)
+
+    counts = Counter(registry.route().name for _ in range(4000))
+
+    assert registry.routing == {"v1": 3.0, "v2": 1.0}
+    assert 0.7 < counts["v1"] / 4000 < 0.8
+
+
+def test_swap_keeps_in_flight_version_and_reuses_unchanged():
+    registry = ModelRegistry(load_constant)
+    registry.apply_manifest({"routing": {"v1": 1}, "versions": MANIFEST["versions"]})
+    in_flight = registry.route()
+    v2_before = registry.versions["v2"]
+
+    registry.apply_manifest({"routing": {"v2": 1},
+                             "versions": {"v2": MANIFEST["versions"]["v2"]}})
+
+    # The request routed before the swap can still finish on v1
+    assert in_flight.predict_batch([{}]) == ["lose_weight"]
+    assert registry.route().name == "v2"
+    assert registry.versions["v2"] is v2_before
+
+
+def test_failed_load_keeps_current_snapshot():
+    registry = ModelRegistry(load_constant)
+    registry.apply_manifest(MANIFEST)
+
+    with pytest.raises(FileNotFoundError):
+        registry.apply_manifest({"routing": {"v3": 1}, "versions": {"v3": {"broken": True}}})
+
+    assert set(registry.versions) == {"v1", "v2"}
+
+
+def test_swap_listeners_and_routing_validation():
+    cleared = []
+    registry = ModelRegistry(load_constant)
+    registry.add_swap_listener(lambda: cleared.append(True))
+    registry.apply_manifest(MANIFEST)
+
+    with pytest.raises(ValueError):
+        registry.set_routing({"missing": 1.0})
+
+    registry.set_routing({"v2": 1.0})
+    assert len(cleared) == 2
+    assert registry.route().name == "v2"
+
+
+def test_route_without_versions():
+    with pytest.raises(Exception):
+        ModelRegistry(load_constant).route()
+
+
+def test_register_model_version(tmp_path):
+    manifest_path = tmp_path / "registry.json"
+
+    register_model_version("v1", {"accuracy": 0.5}, file_path=manifest_path)
+    register_model_version("v2", {"accuracy": 0.6}, routing_weight=0.1,
+                           file_path=manifest_path)
+    manifest = read_manifest(manifest_path)
+
+    assert manifest["routing"] == {"v1": 1.0, "v2": 0.1}
+    assert manifest["versions"]["v2"] == {"accuracy": 0.6}
@@ -0,0 +1,115 @@
+import json
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from infrastructure.query_metrics import (LatencyHistogram, QueryMetrics, instrument_engine,
+                                          normalize_sql, redact_parameters, timed_repository)
+
+
+def test_normalize_sql_groups_statements_by_shape():
+    assert normalize_sql("SELECT users.id \n  FROM users WHERE users.email = $1") == \
+        "SELECT users.id FROM users WHERE users.email = ?"
+    assert normalize_sql("SELECT * FROM logs WHERE id IN (?, ?, ?) AND type = 'run'") == \
+        "SELECT * FROM logs WHERE id IN (?, ...) AND type = ?"
+    assert normalize_sql("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == \
+        "INSERT INTO t (a, b) VALUES (?, ?), ..."
+    assert normalize_sql("SELECT t1.a FROM t1 LIMIT 10 OFFSET 20") == \
+        "SELECT t1.a FROM t1 LIMIT ? OFFSET ?"
+
+
+def test_redact_parameters_keeps_only_types():
+    assert redact_parameters(("a@b.com", 3)) == ["<str>", "<int>"]
+    assert redact_parameters({'email': "a@b.com", 'ids': [1, 2]}) == \
+        {'email': "<str>", 'ids': ["<int>", "<int>"]}
+
+
+def test_histogram_summary():
+    histogram = LatencyHistogram()
+    for elapsed_ms in [0.5] * 90 + [40] * 9 + [700]:
+        histogram.observe(elapsed_ms)
+
+    summary = histogram.summary()
+    assert summary['count'] == 100
+    assert summary['p50_ms'] == 1
+    assert summary['p95_ms'] == 50
+    assert summary['max_ms'] == 700
+    assert summary['buckets'] == {'1': 90, '50': 9, '1000': 1}
+
+
+@timed_repository
+class AccountRepository:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def get_by_email(self, email):
+        result = await self.connection.execute(
+            text("SELECT :email AS email"), {'email': email})
+        return result.scalar()
+
+    async def get_or_default(self, email):
+        # Nested repository calls are attributed to the innermost method
+        await self.connection.execute(text("SELECT 1"))
+        return await self.get_by_email(email) or "default"
+
+    async def stream_numbers(self):
+        for number in range(2):
+            result = await self.connection.execute(text("SELECT :n"), {'n': number})
+            yield result.scalar()
+
+
+@pytest.fixture
+async def instrumented_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}")
+    metrics = instrument_engine(engine.sync_engine, QueryMetrics(slow_query_ms=0))
+    yield engine, metrics
+    await engine.dispose()
+
+
+async def test_statements_are_attributed_to_repository_methods(instrumented_engine, caplog):
+    engine, metrics = instrumented_engine
+    async with engine.connect() as connection:
+        repository = AccountRepository(connection)
+        with caplog.at_level(logging.WARNING, logger='fitnessbud.sql.slow'):
+            assert await repository.get_or_default("jane@example.com") == "jane@example.com"
+        await connection.execute(text("SELECT 2"))
+
+    stats = metrics.stats()
+    assert stats['by_repository_method']['AccountRepository.get_by_email']['count'] == 1
+    assert stats['by_repository_method']['AccountRepository.get_or_default']['count'] == 1
+    assert stats['by_repository_method']['<no repository>']['count'] == 1
+    assert stats['by_statement']['SELECT ?']['count'] == 2
+
+    # Threshold 0: everything is slow, and the log never contains parameter values
+    assert stats['slow_queries'] == 3
+    assert "jane@example.com" not in caplog.text
+    logged = [json.loads(record.getMessage()) for record in caplog.records]
+    assert [entry['repository_method'] for entry in logged] == [
+        'AccountRepository.get_or_default', 'AccountRepository.get_by_email', '<no repository>']
+    assert logged[1]['parameters'] == ["<str>"]
+
+
+async def test_async_generator_methods_are_attributed(instrumented_engine):
+    engine, metrics = instrumented_engine
+    async with engine.connect() as connection:
+        repository = AccountRepository(connection)
+        async for _ in repository.stream_numbers():
+            # Statements run by the consumer between steps are not attributed
+            await connection.execute(text("SELECT 1"))
+
+    by_method = metrics.stats()['by_repository_method']
+    assert by_method['AccountRepository.stream_numbers']['count'] == 2
+    assert by_method['<no repository>']['count'] == 2
+
+
+async def test_failed_statements_do_not_leak_timers(instrumented_engine):
+    engine, metrics = instrumented_engine
+    async with engine.connect() as connection:
+        with pytest.raises(Exception):
+            await connection.execute(text("SELECT * FROM missing_table"))
+        await connection.rollback()
+        await connection.execute(text("SELECT 1"))
+
+    assert metrics.stats()['by_statement']['SELECT ?']['count'] == 1
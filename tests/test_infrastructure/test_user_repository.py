@@ -0,0 +1,26 @@
+from domain.schemas import UserCreate
+from infrastructure.user_repository import UserRepository
+
+NEW_USER = UserCreate(email="new@example.com", password="correct-horse", age=41,
+                      goal="increase_stamina", equipment="kettlebells")
+
+
+async def test_create_is_one_statement_and_returns_none_on_email_conflict(session_factory,
+                                                                         executed_statements):
+    async with session_factory() as session:
+        repository = UserRepository(db_session=session)
+        created = await repository.create(NEW_USER, hashed_password="hashed")
+        assert len(executed_statements) == 1
+        assert "ON CONFLICT" in executed_statements[0]
+        assert created.id and created.email == NEW_USER.email
+        assert created.hashed_password == "hashed" and created.is_active
+
+        executed_statements.clear()
+        duplicate = await repository.create(NEW_USER, hashed_password="other")
+        assert duplicate is None
+        assert len(executed_statements) == 1
+        await session.commit()
+
+    async with session_factory() as session:
+        stored = await UserRepository(db_session=session).get_by_email(NEW_USER.email)
+    assert stored.id == created.id and stored.hashed_password == "hashed"
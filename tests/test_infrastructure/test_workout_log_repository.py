@@ -0,0 +1,143 @@
+import datetime
+
+from sqlalchemy import event, text
+
+from domain.schemas import WorkoutLogCreate, WorkoutLogUpdate
+from infrastructure.workout_log_repository import WorkoutLogRepository
+
+FIRST_DAY = datetime.date(2025, 1, 1)
+
+
+async def add_history(add_logs, days):
+    """Two logs a day for the first user, one a day for the second."""
+    logs = []
+    for day in range(days):
+        workout_date = FIRST_DAY + datetime.timedelta(days=day)
+        logs.append((0, "Deadlift", "high", 45, 300.0, workout_date))
+        logs.append((0, "Yoga Flow", "low", 30, 90.0, workout_date))
+        logs.append((1, "Plank", "low", 20, 60.0, workout_date))
+    await add_logs(logs)
+
+
+async def test_pages_cover_the_history_once_newest_first(session_factory, add_logs):
+    await add_history(add_logs, days=10)
+    user_id = session_factory.user_ids[0]
+
+    async with session_factory() as session:
+        repository = WorkoutLogRepository(db_session=session)
+        seen, after = [], None
+        while True:
+            page = await repository.get_page_by_user(user_id, limit=3, after=after)
+            if not page:
+                break
+            seen.extend(page)
+            after = (page[-1].workout_date, page[-1].id)
+
+    keys = [(log.workout_date, log.id) for log in seen]
+    assert len(keys) == 20
+    assert keys == sorted(keys, reverse=True)
+    assert {log.user_id for log in seen} == {user_id}
+
+
+async def test_filters(session_factory, add_logs):
+    await add_history(add_logs, days=10)
+    user_id = session_factory.user_ids[0]
+
+    async with session_factory() as session:
+        repository = WorkoutLogRepository(db_session=session)
+        in_range = await repository.get_page_by_user(
+            user_id, limit=100, date_from=FIRST_DAY + datetime.timedelta(days=2),
+            date_to=FIRST_DAY + datetime.timedelta(days=4))
+        yoga = await repository.get_page_by_user(user_id, limit=100, workout_type="Yoga Flow")
+        high = await repository.get_page_by_user(user_id, limit=100, intensity="high")
+
+    assert len(in_range) == 6
+    assert {log.workout_date.day for log in in_range} == {3, 4, 5}
+    assert len(yoga) == 10 and {log.workout_type for log in yoga} == {"Yoga Flow"}
+    assert len(high) == 10 and {log.intensity for log in high} == {"high"}
+
+
+async def test_page_query_seeks_on_the_composite_index(session_factory):
+    async with session_factory() as session:
+        plan = await session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM workout_logs WHERE user_id = 1 "
+            "AND (workout_date, id) < ('2025-01-05', 10) "
+            "ORDER BY workout_date DESC, id DESC LIMIT 51"))
+        details = " ".join(row[-1] for row in plan)
+
+    assert "ix_workout_logs_user_date_id" in details
+    assert "TEMP B-TREE" not in details
+
+
+async def create_many_recorded(factory, statements):
+    """create_many of three logs in the middle of the upload order; its INSERTs."""
+    logs_in = [WorkoutLogCreate(workout_date=FIRST_DAY, duration_min=minutes, intensity="low",
+                                workout_type="Plank", calories_burned=None)
+               for minutes in (30, 10, 20)]
+
+    async with factory() as session:
+        repository = WorkoutLogRepository(db_session=session)
+        created = await repository.create_many(logs_in, factory.user_ids[1])
+        inserts = list(statements)
+        await session.commit()
+
+    assert [log.duration_min for log in created] == [30, 10, 20]
+    assert all(log.id and log.created_at for log in created)
+    assert {log.user_id for log in created} == {factory.user_ids[1]}
+    assert all(statement.startswith("INSERT INTO workout_logs") and "RETURNING" in statement
+               for statement in inserts)
+    return inserts
+
+
+async def test_create_many_keeps_upload_order(session_factory, executed_statements):
+    # SQLite has no deterministic RETURNING order for autoincrement ids:
+    # SQLAlchemy inserts the rows one statement each there
+    assert await create_many_recorded(session_factory, executed_statements)
+
+
+async def test_create_many_is_one_insert_on_postgres(postgres_factory):
+    engine = postgres_factory.kw['bind'].sync_engine
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        inserts = await create_many_recorded(postgres_factory, statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(inserts) == 1
+
+
+async def test_create_and_update_are_single_statements(session_factory, executed_statements):
+    owner, other = session_factory.user_ids
+    log_in = WorkoutLogCreate(workout_date=FIRST_DAY, duration_min=30, intensity="low",
+                              workout_type="Plank", calories_burned=80.0)
+
+    async with session_factory() as session:
+        repository = WorkoutLogRepository(db_session=session)
+        created = await repository.create(log_in, owner)
+        assert len(executed_statements) == 1
+        assert created.id and created.created_at and created.user_id == owner
+
+        executed_statements.clear()
+        updated = await repository.update(
+            created.id, owner,
+            WorkoutLogUpdate(duration_min=45, intensity="high", equipment_used="Mat"))
+        assert len(executed_statements) == 1
+        assert executed_statements[0].startswith("UPDATE workout_logs")
+        assert (updated.id, updated.duration_min, updated.intensity) == (created.id, 45, "high")
+        assert updated.workout_type == "Plank"
+
+        # Ownership: another user's update matches no row
+        assert await repository.update(created.id, other, WorkoutLogUpdate(duration_min=5)) \
+            is None
+        assert await repository.update(created.id + 1, owner,
+                                       WorkoutLogUpdate(duration_min=5)) is None
+        await session.commit()
+
+    async with session_factory() as session:
+        stored = await WorkoutLogRepository(db_session=session).get_by_id(created.id, owner)
+    assert stored.duration_min == 45
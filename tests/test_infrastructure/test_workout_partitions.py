@@ -0,0 +1,168 @@
+import datetime
+
+import pytest
+from sqlalchemy import delete, insert, select, text
+
+from infrastructure.models import WorkoutLog, WorkoutLogArchive, WorkoutSummary
+from infrastructure.workout_log_repository import WorkoutSummaryRepository, add_months
+from infrastructure.workout_partitions import (WorkoutLogPartitionRepository,
+                                               maintain_partitions, partition_name,
+                                               plan_maintenance)
+
+
+def month(year, number):
+    return datetime.date(year, number, 1)
+
+
+def test_add_months_and_partition_name():
+    assert add_months(month(2025, 11), 3) == month(2026, 2)
+    assert add_months(datetime.date(2025, 3, 31), -3) == month(2024, 12)
+    assert partition_name(month(2025, 3)) == "workout_logs_2025_03"
+
+
+def test_plan_creates_upcoming_and_archives_expired_months():
+    partitions = [month(2024, number) for number in range(1, 13)] + [month(2025, 1)]
+
+    to_create, to_archive = plan_maintenance(partitions, today=datetime.date(2025, 1, 20),
+                                             retention_months=10, ahead_months=2)
+
+    assert to_create == [month(2025, 2), month(2025, 3)]
+    # Only whole months before 2024-03 are past the retention window
+    assert to_archive == [month(2024, 1), month(2024, 2)]
+
+
+async def test_archived_months_keep_their_totals_across_rebuilds(session_factory, add_logs):
+    await add_logs([
+        (0, "Deadlift", "high", 45, 300.0, datetime.date(2025, 1, 15)),
+        # Week of Monday 2025-01-27 spans the partition boundary
+        (0, "Deadlift", "high", 50, 310.0, datetime.date(2025, 1, 31)),
+        (0, "Deadlift", "high", 40, 280.0, datetime.date(2025, 2, 1)),
+        (0, "Deadlift", "high", 30, 200.0, datetime.date(2025, 2, 10)),
+    ])
+
+    async with session_factory() as session:
+        summaries = WorkoutSummaryRepository(db_session=session)
+        await summaries.rebuild()
+        # What archiving January leaves behind: its summaries, no raw rows
+        await session.execute(delete(WorkoutLog).where(
+            WorkoutLog.workout_date < month(2025, 2)))
+        await session.execute(insert(WorkoutLogArchive).values(
+            archive_table="archive.workout_logs_2025_01", range_start=month(2025, 1),
+            range_end=month(2025, 2), archived_rows=2))
+
+        archived_until = await WorkoutLogPartitionRepository(session).archived_until()
+        await summaries.rebuild(date_from=archived_until)
+
+        rows = await session.execute(select(
+            WorkoutSummary.period, WorkoutSummary.period_start, WorkoutSummary.sessions))
+        totals = {(period, start): sessions for period, start, sessions in rows}
+
+    assert archived_until == month(2025, 2)
+    # Recorded when archived, not frozen when the models were imported
+    assert not WorkoutLogArchive.__table__.c.created_at.default.is_scalar
+    assert totals == {
+        ("month", month(2025, 1)): 2,
+        ("month", month(2025, 2)): 2,
+        ("week", datetime.date(2025, 1, 13)): 1,
+        ("week", datetime.date(2025, 1, 27)): 2,
+        ("week", datetime.date(2025, 2, 10)): 1,
+    }
+
+
+async def test_rebuild_of_a_date_range_replaces_only_its_buckets(session_factory, add_logs):
+    await add_logs([
+        (0, "Yoga", "low", 30, 90.0, datetime.date(2025, 1, 10)),
+        (0, "Yoga", "low", 30, 90.0, datetime.date(2025, 2, 10)),
+    ])
+    async with session_factory() as session:
+        summaries = WorkoutSummaryRepository(db_session=session)
+        await summaries.rebuild(date_from=month(2025, 2), date_to=month(2025, 3))
+        rows = await session.execute(select(WorkoutSummary.period_start))
+
+        assert sorted(start for start, in rows) == [month(2025, 2), datetime.date(2025, 2, 10)]
+
+
+async def test_maintenance_needs_a_partitioned_table(session_factory):
+    report = await maintain_partitions(session_factory, datetime.date(2025, 1, 20),
+                                       retention_months=12, ahead_months=3,
+                                       archive_schema="archive")
+
+    assert report == {'partitioned': False, 'created': [], 'archived': {}, 'failed': {}}
+
+
+async def test_a_failing_month_does_not_stop_the_others(session_factory, monkeypatch):
+    async def is_partitioned(self):
+        return True
+
+    async def list_partitions(self):
+        return [month(2023, 12), month(2024, 1)]
+
+    async def create_partition(self, created):
+        if created == month(2025, 2):
+            raise RuntimeError("default partition holds rows of 2025-02")
+        return 0
+
+    async def archive_partition(self, archived, archive_schema):
+        return 7
+
+    for name, method in [("is_partitioned", is_partitioned),
+                         ("list_partitions", list_partitions),
+                         ("create_partition", create_partition),
+                         ("archive_partition", archive_partition)]:
+        monkeypatch.setattr(WorkoutLogPartitionRepository, name, method)
+
+    report = await maintain_partitions(session_factory, datetime.date(2025, 1, 20),
+                                       retention_months=12, ahead_months=2,
+                                       archive_schema="archive")
+
+    assert report['created'] == ["workout_logs_2025_01", "workout_logs_2025_03"]
+    assert list(report['failed']) == ["workout_logs_2025_02"]
+    assert report['archived'] == {"workout_logs_2023_12": 7}
+
+
+@pytest.fixture
+async def partitioned_factory(postgres_factory):
+    """postgres_factory with workout_logs partitioned like migration 0003 leaves it."""
+    async with postgres_factory() as session:
+        # Monthly partitions for 2025-01 only, plus the default partition
+        for statement in (
+            "ALTER TABLE workout_logs RENAME TO workout_logs_heap",
+            "ALTER SEQUENCE workout_logs_id_seq OWNED BY NONE",
+            "CREATE TABLE workout_logs (LIKE workout_logs_heap INCLUDING DEFAULTS,"
+            " CONSTRAINT workout_logs_partitioned_pkey PRIMARY KEY (id, workout_date))"
+            " PARTITION BY RANGE (workout_date)",
+            "DROP TABLE workout_logs_heap",
+            "CREATE TABLE workout_logs_2025_01 PARTITION OF workout_logs"
+            " FOR VALUES FROM ('2025-01-01') TO ('2025-02-01')",
+            "CREATE TABLE workout_logs_default PARTITION OF workout_logs DEFAULT",
+        ):
+            await session.execute(text(statement))
+        await session.commit()
+    return postgres_factory
+
+
+async def test_creating_a_month_moves_its_rows_out_of_the_default_partition(
+        partitioned_factory):
+    async with partitioned_factory() as session:
+        # Dated beyond the created months: lands in the default partition
+        session.add_all([
+            WorkoutLog(user_id=partitioned_factory.user_ids[0], workout_type="Yoga", intensity="low",
+                       duration_min=30, calories_burned=90.0, workout_date=workout_date)
+            for workout_date in (datetime.date(2025, 3, 5), datetime.date(2031, 3, 5))
+        ])
+        await session.commit()
+
+    report = await maintain_partitions(partitioned_factory, datetime.date(2025, 1, 20),
+                                       retention_months=12, ahead_months=2,
+                                       archive_schema="archive")
+
+    async with partitioned_factory() as session:
+        rows = await session.execute(text(
+            "SELECT tableoid::regclass::text, workout_date FROM workout_logs"
+            " ORDER BY workout_date"))
+        placement = rows.all()
+
+    assert report['created'] == ["workout_logs_2025_02", "workout_logs_2025_03"]
+    assert report['failed'] == {}
+    assert placement == [("workout_logs_2025_03", datetime.date(2025, 3, 5)),
+                         ("workout_logs_default", datetime.date(2031, 3, 5))]
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from src.data_generator import (WORKOUT_TYPES_BY_GOAL, generate_chunks, to_training_frame,
+                                write_training_csv, write_training_partitions)
+from src.data_loader import load_exported_data, load_workout_data
+
+
+def test_chunks_continue_ids():
+    chunks = list(generate_chunks(25, logs_per_user=4, users_per_chunk=10))
+
+    assert [len(users) for users, _ in chunks] == [10, 10, 5]
+    user_ids = np.concatenate([users['id'].to_numpy() for users, _ in chunks])
+    log_ids = np.concatenate([logs['id'].to_numpy() for _, logs in chunks])
+    assert user_ids.tolist() == list(range(1, 26))
+    assert log_ids.tolist() == list(range(1, len(log_ids) + 1))
+
+
+def test_generation_is_deterministic_per_seed():
+    first = to_training_frame(*next(generate_chunks(50, seed=7)))
+    second = to_training_frame(*next(generate_chunks(50, seed=7)))
+    other = to_training_frame(*next(generate_chunks(50, seed=8)))
+
+    pd.testing.assert_frame_equal(first, second)
+    assert not first.equals(other)
+
+
+def test_logs_follow_the_goal_tables():
+    users, logs = next(generate_chunks(500, logs_per_user=20))
+    training = to_training_frame(users, logs)
+
+    for goal, workout_types in WORKOUT_TYPES_BY_GOAL.items():
+        generated = set(training.loc[training['goal'] == goal, 'workout_type'])
+        assert generated <= set(workout_types)
+
+    rate = training['calories_burned'] / training['duration_min']
+    assert rate.between(0.015 - 1e-3, 0.18 + 1e-3).all()
+    assert training['duration_min'].between(30, 119).all()
+    # Every user belongs to exactly one goal and equipment
+    assert training.groupby('user_id')[['goal', 'equipment']].nunique().max().max() == 1
+
+
+def test_written_files_load_for_training(tmp_path):
+    csv_path = str(tmp_path / "generated.csv")
+    rows = write_training_csv(generate_chunks(30, users_per_chunk=10), csv_path)
+    from_csv = load_workout_data(csv_path, use_cache=False)
+
+    directory = str(tmp_path / "partitions")
+    write_training_partitions(generate_chunks(30, users_per_chunk=10), directory)
+    from_partitions = load_exported_data(directory)
+
+    assert len(from_csv) == len(from_partitions) == rows
+    assert from_csv['workout_type'].tolist() == from_partitions['workout_type'].tolist()
@@ -0,0 +1,99 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src import data_loader
+from src.data_loader import load_and_prepare_data_for_goal_prediction, load_workout_data
+
+CSV_HEADER = "user_id,workout_type,intensity,duration_min,calories_burned,age,goal,equipment\n"
+CSV_ROWS = [
+    "1,Deadlift,high,45,10.5,30,gain_muscle,barbell\n",
+    "2,Yoga Flow,very_low,30,2.5,51,rehabilitation,yoga_mat\n",
+    "3,Treadmill Run,moderate,60,9.0,24,lose_weight,full_gym\n",
+    "4,Plank,low,10,1.2,40,increase_stamina,bodyweight_only\n",
+    "5,Bench Press,high,50,8.25,35,gain_muscle,barbell\n",
+]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "workouts.csv"
+    path.write_text(CSV_HEADER + "".join(CSV_ROWS))
+    return str(path)
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".pkl"])
+def test_load_writes_and_reuses_cache(csv_path, extension, monkeypatch):
+    if extension == ".parquet":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(data_loader, "columnar_extension", lambda: extension)
+
+    first = load_workout_data(csv_path)
+    cache_path = data_loader.default_cache_path(csv_path, extension)
+    assert os.path.exists(cache_path)
+
+    # A cache hit must not parse the CSV again
+    monkeypatch.setattr(data_loader, "read_workout_csv",
+                        lambda *args: pytest.fail("CSV was re-read"))
+    second = load_workout_data(csv_path)
+
+    pd.testing.assert_frame_equal(first, second)
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".pkl"])
+def test_corrupt_cache_is_rebuilt(csv_path, extension, monkeypatch, capsys):
+    if extension == ".parquet":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(data_loader, "columnar_extension", lambda: extension)
+    expected = load_workout_data(csv_path)
+    cache_path = data_loader.default_cache_path(csv_path, extension)
+
+    # Truncated, e.g. by an interrupted copy; the fingerprint still matches
+    with open(cache_path, "r+b") as cache_file:
+        cache_file.truncate(os.path.getsize(cache_path) // 2)
+
+    pd.testing.assert_frame_equal(load_workout_data(csv_path), expected)
+    assert "Ignoring unreadable training data cache" in capsys.readouterr().out
+    # Rewritten: the next load is a cache hit again
+    monkeypatch.setattr(data_loader, "read_workout_csv",
+                        lambda *args: pytest.fail("CSV was re-read"))
+    pd.testing.assert_frame_equal(load_workout_data(csv_path), expected)
+
+
+def test_cache_invalidated_when_csv_changes(csv_path):
+    assert len(load_workout_data(csv_path)) == 5
+
+    with open(csv_path, "a") as csv_file:
+        csv_file.write("6,Lunge,moderate,20,3.0,29,lose_weight,dumbbells\n")
+
+    assert len(load_workout_data(csv_path)) == 6
+
+
+def test_chunked_read_matches_single_read(csv_path):
+    whole = load_workout_data(csv_path, use_cache=False)
+    chunked = load_workout_data(csv_path, use_cache=False, chunk_size=2)
+
+    pd.testing.assert_frame_equal(whole, chunked)
+    # Categories from every chunk survive the concatenation
+    assert isinstance(chunked['workout_type'].dtype, pd.CategoricalDtype)
+    assert set(chunked['workout_type'].cat.categories) == {
+        'Deadlift', 'Yoga Flow', 'Treadmill Run', 'Plank', 'Bench Press'}
+
+
+def test_prepared_features_and_dtypes(csv_path):
+    features, target = load_and_prepare_data_for_goal_prediction(csv_path, use_cache=False)
+
+    assert list(features.columns) == ['workout_type', 'equipment', 'duration_min',
+                                      'calories_burned', 'intensity_numeric']
+    assert features['intensity_numeric'].tolist() == [4, 1, 3, 2, 4]
+    assert features['duration_min'].dtype == 'int16'
+    assert features['calories_burned'].dtype == 'float32'
+    assert features['intensity_numeric'].dtype == 'int8'
+    assert target.tolist() == ['gain_muscle', 'rehabilitation', 'lose_weight',
+                               'increase_stamina', 'gain_muscle']
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_workout_data(str(tmp_path / "missing.csv"))
@@ -0,0 +1,48 @@
+from sqlalchemy import func, select
+
+from infrastructure.models import User, WorkoutLog, WorkoutSummary
+from infrastructure.workout_log_repository import WorkoutSummaryRepository
+from src.db_seeder import seed_database
+
+
+async def test_seed_appends_after_existing_rows(session_factory, add_logs):
+    await add_logs([(0, "Deadlift", "high", 45, 10.0)])
+    engine = session_factory.kw['bind']
+
+    users, logs = await seed_database(engine, 25, logs_per_user=3, users_per_chunk=10)
+
+    async with session_factory() as session:
+        assert await session.scalar(select(func.count(User.id))) == 2 + users
+        assert await session.scalar(select(func.count(WorkoutLog.id))) == 1 + logs
+        assert await session.scalar(select(func.min(User.id)).where(
+            User.email.like("loadtest-%"))) == 3
+
+        # Seeded logs reference seeded users
+        orphans = await session.scalar(
+            select(func.count(WorkoutLog.id))
+            .outerjoin(User, WorkoutLog.user_id == User.id)
+            .where(User.id.is_(None)))
+        assert orphans == 0
+
+
+async def summary_rows(session):
+    rows = await session.execute(select(
+        WorkoutSummary.user_id, WorkoutSummary.period, WorkoutSummary.period_start,
+        WorkoutSummary.workout_type, WorkoutSummary.sessions,
+        WorkoutSummary.total_duration_min, func.round(WorkoutSummary.total_calories, 2)))
+    return sorted(rows.all())
+
+
+async def test_seeded_logs_have_their_summaries(session_factory):
+    engine = session_factory.kw['bind']
+    users, logs = await seed_database(engine, 25, logs_per_user=3, users_per_chunk=10)
+
+    async with session_factory() as session:
+        seeded = await summary_rows(session)
+        monthly_sessions = await session.scalar(select(func.sum(WorkoutSummary.sessions))
+                                                .where(WorkoutSummary.period == "month"))
+        await WorkoutSummaryRepository(db_session=session).rebuild()
+        rebuilt = await summary_rows(session)
+
+    assert monthly_sessions == logs
+    assert seeded == rebuilt
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from infrastructure.ml_adapter import load_model_artifact
+from src import model_registry
+from src.incremental_trainer import GOAL_CLASSES, prepare_batch, train_incremental
+
+LOGS = [
+    # (user index, workout_type, intensity, duration_min, calories_burned)
+    (0, "Deadlift", "high", 45, 10.0),
+    (1, "Yoga Flow", "very_low", 30, 2.5),
+    (0, "Bench Press", "High", 50, None),
+    (1, "Plank", "low", 10, 1.2),
+    (0, "Barbell Squat", "medium", 40, 8.0),
+    (1, "Foam Rolling", "extreme", 15, 1.0),  # unknown intensity, skipped
+]
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "MODEL_VERSIONS_DIR", str(tmp_path / "versions"))
+    return {"state_file_path": str(tmp_path / "state.joblib"),
+            "registry_file_path": str(tmp_path / "registry.json")}
+
+
+def test_prepare_batch_normalizes_and_skips():
+    rows = [(i + 1, workout_type, "barbell", intensity, duration, calories, "gain_muscle")
+            for i, (_, workout_type, intensity, duration, calories) in enumerate(LOGS)]
+
+    features, target, skipped = prepare_batch(rows)
+
+    assert skipped == 1
+    assert features["intensity_numeric"].tolist() == [4, 1, 4, 2, 3]
+    assert features["calories_burned"].tolist()[2] == 0.0
+    assert len(target) == 5
+
+
+async def test_trains_only_on_new_logs(session_factory, add_logs, paths):
+    await add_logs(LOGS)
+
+    first = await train_incremental(session_factory, batch_size=2, version="inc-1", **paths)
+    assert first["rows_trained"] == 5
+    assert first["rows_skipped"] == 1
+    assert first["last_log_id"] == 6
+
+    # Nothing new: no training and no new version
+    second = await train_incremental(session_factory, version="inc-2", **paths)
+    assert second["rows_trained"] == 5
+    with open(paths["registry_file_path"]) as manifest_file:
+        assert list(json.load(manifest_file)["versions"]) == ["inc-1"]
+
+    await add_logs(LOGS[:2])
+    third = await train_incremental(session_factory, version="inc-3", **paths)
+    assert third["rows_trained"] == 7
+    assert third["last_log_id"] == 8
+    # Every batch after the very first is scored before it is trained on
+    assert third["rows_evaluated"] == first["rows_evaluated"] + 2
+
+
+async def test_published_version_is_servable(session_factory, add_logs, paths):
+    await add_logs(LOGS * 5)
+    await train_incremental(session_factory, version="inc-1", **paths)
+
+    with open(paths["registry_file_path"]) as manifest_file:
+        manifest = json.load(manifest_file)
+    assert manifest["routing"] == {"inc-1": 1.0}
+
+    model = load_model_artifact(manifest["versions"]["inc-1"])
+    prediction = model.predict_one("Deadlift", "barbell", "high", 45, 10.0)
+    assert prediction in GOAL_CLASSES
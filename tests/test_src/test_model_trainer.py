@@ -0,0 +1,73 @@
+import glob
+import json
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import ParameterGrid
+
+from src import model_trainer
+
+
+@pytest.fixture
+def training_data():
+    rng = np.random.default_rng(0)
+    rows = 200
+    features = pd.DataFrame({
+        'workout_type': rng.choice(['Deadlift', 'Yoga Flow', 'Plank'], rows),
+        'equipment': rng.choice(['barbell', 'yoga_mat'], rows),
+        'duration_min': rng.integers(10, 90, rows),
+        'calories_burned': rng.uniform(1, 12, rows),
+        'intensity_numeric': rng.integers(1, 5, rows),
+    })
+    target = pd.Series(np.where(features['intensity_numeric'] > 2, 'gain_muscle',
+                                'rehabilitation'))
+    return features, target
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    calls = []
+    monkeypatch.setattr(model_trainer, 'save_and_register_model',
+                        lambda *args, **kwargs: calls.append(args))
+    return calls
+
+
+@pytest.mark.parametrize("mode", ["grid", "random"])
+def test_search_reports_every_candidate(training_data, saved, mode):
+    features, target = training_data
+
+    pipeline, accuracy, candidates = model_trainer.search_and_save_model(
+        features, target, mode=mode, n_iter=4, folds=3, n_jobs=1)
+
+    expected = 4 if mode == 'random' else len(
+        ParameterGrid(model_trainer.PARAMETER_GRID))
+    assert len(candidates) == expected
+    assert candidates[0]['rank'] == 1
+    assert all(candidate['wall_seconds'] > 0 for candidate in candidates)
+    # Parameters must be plain JSON for the registry manifest
+    json.dumps(candidates)
+
+    # The best pipeline is the one that gets saved
+    saved_pipeline, saved_accuracy, training_rows, *_, hyperparameters = saved[0]
+    assert saved_pipeline is pipeline
+    assert saved_accuracy == accuracy
+    assert training_rows == 160
+    assert hyperparameters['best_params'] == candidates[0]['params']
+
+
+def test_search_removes_preprocessing_cache(training_data, saved):
+    features, target = training_data
+    pattern = f"{tempfile.gettempdir()}/fitnessbud-preprocessing-*"
+    before = set(glob.glob(pattern))
+
+    model_trainer.search_and_save_model(features, target, mode='random', n_iter=2, folds=2,
+                                        n_jobs=1)
+
+    assert set(glob.glob(pattern)) == before
+
+
+def test_unknown_search_mode(training_data, saved):
+    with pytest.raises(ValueError):
+        model_trainer.search_and_save_model(*training_data, mode='bayesian')
@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+import pytest
+
+from infrastructure.ml_adapter import load_model_artifact
+from infrastructure.segmented_model import SegmentedGoalModel
+from src import model_registry
+from src.data_generator import generate_chunks, to_training_frame
+from src.data_loader import INTENSITY_MAP
+from src.segmented_trainer import read_rows, share_columns, train_segmented_model
+
+
+@pytest.fixture
+def training_data():
+    training = to_training_frame(*next(generate_chunks(80, logs_per_user=40, seed=3)))
+    features = training[['workout_type', 'equipment', 'duration_min', 'calories_burned']].copy()
+    features['intensity_numeric'] = training['intensity'].map(INTENSITY_MAP).astype('int8')
+    return features, training['goal']
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "MODEL_VERSIONS_DIR", str(tmp_path / "versions"))
+    file_path = str(tmp_path / "registry.json")
+    original = model_registry.register_model_version
+    monkeypatch.setattr("src.segmented_trainer.register_model_version",
+                        lambda *args, **kwargs: original(*args, file_path=file_path, **kwargs))
+    return file_path
+
+
+def test_shared_columns_round_trip(training_data, tmp_path):
+    features, _ = training_data
+    layout = share_columns(features, str(tmp_path))
+
+    rows = read_rows(str(tmp_path), layout, 10, 20)
+
+    assert rows['workout_type'].tolist() == features['workout_type'].iloc[10:20].tolist()
+    assert rows['duration_min'].tolist() == features['duration_min'].iloc[10:20].tolist()
+
+
+def test_segmented_bundle_is_registered_and_served(training_data, registry):
+    features, target = training_data
+
+    bundle, accuracy, report = train_segmented_model(
+        features, target, segment_feature='equipment', min_segment_rows=150, max_workers=2,
+        version="seg-1")
+
+    with open(registry) as manifest_file:
+        metadata = json.load(manifest_file)["versions"]["seg-1"]
+    assert metadata["segment_feature"] == "equipment"
+    assert set(metadata["segments"]) == set(bundle.models)
+
+    # Every segment model is smaller than the all-rows fallback
+    node_counts = bundle.node_counts()
+    assert all(node_counts[segment] < node_counts['fallback'] for segment in bundle.models)
+
+    served = load_model_artifact(metadata)
+    assert isinstance(served, SegmentedGoalModel)
+    workouts = [{'workout_type': 'Deadlift', 'equipment': equipment, 'intensity': 'high',
+                 'duration_min': 45, 'calories_burned': 6.0}
+                for equipment in list(bundle.models) + ['unknown_equipment']]
+    assert served.predict_batch(workouts) == bundle.predict_batch(workouts)
+    assert [served.predict_one(**workout) for workout in workouts] == \
+        served.predict_batch(workouts)
+    assert 0 <= accuracy <= 1
+
+
+def test_small_segments_use_the_fallback(training_data, registry):
+    features, target = training_data
+
+    bundle, _, _ = train_segmented_model(features, target, min_segment_rows=10 ** 6,
+                                         max_workers=1, version="seg-2")
+
+    assert bundle.models == {}
+    workout = {'workout_type': 'Plank', 'equipment': 'barbell', 'intensity': 'low',
+               'duration_min': 20, 'calories_burned': 1.5}
+    assert bundle.bucket_key(**workout)[0] is None
+    assert np.array_equal(bundle.predict_batch([workout]),
+                          bundle.fallback.predict_batch([workout]))
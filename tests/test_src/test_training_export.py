@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from src.data_loader import load_exported_data, read_frame
+from src.incremental_trainer import prepare_batch, stream_new_logs
+from src.training_export import export_training_data, read_watermark
+
+LOGS = [
+    (0, "Deadlift", "high", 45, 10.0),
+    (1, "Yoga Flow", "very_low", 30, 2.5),
+    (0, "Bench Press", "high", 50, None),
+    (1, "Plank", "low", 10, 1.2),
+    (0, "Barbell Squat", "Medium", 40, 8.0),  # alias of moderate
+]
+
+
+async def test_export_writes_partitions_and_resumes(session_factory, add_logs, tmp_path):
+    directory = str(tmp_path / "export")
+    await add_logs(LOGS)
+
+    written = await export_training_data(session_factory, directory, rows_per_file=2)
+    assert [os.path.basename(path).split('.')[0] for path in written] == [
+        "part-000000000001-000000000002",
+        "part-000000000003-000000000004",
+        "part-000000000005-000000000005",
+    ]
+    assert read_watermark(directory) == 5
+
+    # Nothing new: nothing written
+    assert await export_training_data(session_factory, directory, rows_per_file=2) == []
+
+    await add_logs(LOGS[:1])
+    written = await export_training_data(session_factory, directory, rows_per_file=2)
+    assert len(written) == 1
+    assert read_watermark(directory) == 6
+
+
+async def test_partitions_carry_the_user_profile(session_factory, add_logs, tmp_path):
+    directory = str(tmp_path / "export")
+    await add_logs(LOGS)
+
+    written = await export_training_data(session_factory, directory, rows_per_file=10)
+    partition = read_frame(written[0])
+
+    assert partition['goal'].tolist()[:2] == ["gain_muscle", "rehabilitation"]
+    assert partition['equipment'].tolist()[:2] == ["barbell", "yoga_mat"]
+    assert partition['calories_burned'].tolist()[2] == 0.0
+    assert partition['duration_min'].dtype == 'int16'
+
+
+async def test_exported_data_loads_for_training(session_factory, add_logs, tmp_path):
+    directory = str(tmp_path / "export")
+    await add_logs(LOGS)
+    await export_training_data(session_factory, directory, rows_per_file=2)
+
+    data_frame = load_exported_data(directory)
+
+    assert len(data_frame) == 5
+    assert data_frame['intensity_numeric'].tolist() == [4, 1, 4, 2, 3]
+    assert data_frame['workout_type'].tolist() == ["Deadlift", "Yoga Flow", "Bench Press",
+                                                   "Plank", "Barbell Squat"]
+
+
+async def test_exported_and_incremental_training_see_the_same_rows(session_factory, add_logs,
+                                                                   tmp_path, capsys):
+    directory = str(tmp_path / "export")
+    await add_logs(LOGS + [(1, "Foam Rolling", "Extreme", 15, 1.0),
+                           (1, "Yoga Flow", " Very Low ", 30, 2.5)])
+    await export_training_data(session_factory, directory, rows_per_file=3)
+
+    data_frame = load_exported_data(directory)
+    async with session_factory() as session:
+        rows = [row async for batch in stream_new_logs(session, 0) for row in batch]
+    features, _, skipped = prepare_batch(rows)
+
+    assert data_frame['intensity_numeric'].tolist() == \
+        features['intensity_numeric'].astype(int).tolist() == [4, 1, 4, 2, 3, 1]
+    assert skipped == 1
+    assert "Dropped 1 exported rows" in capsys.readouterr().out
+
+
+def test_load_exported_data_without_partitions(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_exported_data(str(tmp_path))